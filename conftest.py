@@ -0,0 +1,475 @@
+"""
+⚙️ CONFIGURACIÓN COMPARTIDA DE PYTEST - MOVIEVERSE
+==================================================
+
+Fixtures comunes para test_movieverse_ejercicios.py y ejemplos_rapidos.py.
+
+Los fixtures browser/context/page vienen del plugin pytest-playwright;
+aquí solo los extendemos.
+
+Opciones propias:
+    --tmdb=live                 Usa la API real de TMDB (por defecto)
+    --tmdb=replay               Responde con fixtures/tmdb/ (recorded.json.gz + replay.json), sin red
+    --tmdb=record               Usa la API real y graba las respuestas en fixtures/tmdb/recorded.json.gz
+    --tmdb-images=live          Descarga posters/backdrops reales (por defecto)
+    --tmdb-images=placeholder   PNG diminutos del tamaño de cada bucket
+    --tmdb-images=disk          Bytes reales cacheados en .cache/tmdb-images/
+    --tmdb-images=block         Aborta las peticiones de imágenes
+    --app-server=external       Usa el servidor que ya está corriendo (por defecto)
+    --app-server=dev            Arranca Vite una vez y lo comparte con todos los workers
+    --app-server=dist           Construye la app si cambió src/ y sirve dist/ con rewrites de SPA
+    --app-server=preview        La misma build servida con `vite preview`
+    --app-server-reuse          Deja el servidor corriendo y lo reutiliza en la siguiente ejecución
+    --warm-pool=N               Reutiliza N contextos con la app ya cargada (0 = apagado)
+    --screenshot-policy=always  Guarda todas las capturas (on-failure: solo al fallar; sampled: una fracción)
+    --screenshot-format=png     png, jpeg o webp (--screenshot-quality=80)
+    --visual=check              Compara cada captura con visual_baselines/ (update = aprobarlas)
+    --device-profile=NOMBRE     Viewport + red + CPU de un dispositivo (movil-3g, movil-4g,
+                                tablet-wifi, desktop-cable); throttling solo en Chromium
+    --impact-record             Guarda qué archivos de src/, rutas y endpoints usa cada test
+    --impacted-by=REF           Ejecuta solo los tests afectados por los cambios frente a REF
+    --leaks                     Activa test_fugas_memoria.py (lento; --leak-cycles=5 ciclos medidos)
+    --typeahead=N               Activa test_rendimiento_busqueda.py con N búsquedas por cadencia
+    --scaling                   Activa test_rendimiento_escala.py (catálogos sintéticos de miles de elementos)
+    --chrome-trace=test         Traza de Chrome de cada test en traces/ (steps: solo los trace_step)
+
+Paralelo (requiere pytest-xdist):
+    pytest -n 4 --app-server=dist
+
+Cada ejecución guarda la duración de los tests en .cache/test-durations.json;
+con -n los workers reciben primero los más largos (ver scheduling.py).
+"""
+
+import os
+
+import pytest
+
+from movieverse_testing import (
+    IMAGE_MODES,
+    METRICS_SCRIPT,
+    READINESS_SCRIPT,
+    SERVER_MODES,
+    AppServer,
+    ContextPool,
+    ImageStubber,
+    RunTimer,
+    base_url,
+)
+from movieverse_testing import screenshots, tracing, visual
+from movieverse_testing.fixture_store import DEFAULT_MISSES, FixtureStore, TMDBRecorder, replay_index
+from movieverse_testing.impact import ChangeSet, ImpactMap, ImpactTracker
+from movieverse_testing.parallel import is_xdist_worker
+from movieverse_testing.profiles import DEVICE_PROFILES, supports_throttling
+from movieverse_testing.scheduling import DurationHistory, LongestFirstScheduling
+from movieverse_testing.screenshots import SCREENSHOT_FORMATS, SCREENSHOT_POLICIES
+from movieverse_testing.server import BASE_URL_ENV
+from movieverse_testing.tracing import TRACE_MODES
+from movieverse_testing.visual import VISUAL_MODES
+
+_app_server_key = pytest.StashKey()
+_run_timer_key = pytest.StashKey()
+_phase_report_key = pytest.StashKey()
+_impact_map_key = pytest.StashKey()
+_impact_summary_key = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("movieverse", "MovieVerse testing")
+    group.addoption(
+        "--tmdb",
+        action="store",
+        default="live",
+        choices=("live", "replay", "record"),
+        help="Origen de las respuestas de TMDB: live (API real), replay (fixtures locales) o record (API real y grabar)",
+    )
+    group.addoption(
+        "--tmdb-images",
+        action="store",
+        default="live",
+        choices=IMAGE_MODES,
+        help="Qué hacer con las imágenes de image.tmdb.org: live, placeholder, disk o block",
+    )
+    group.addoption(
+        "--app-server",
+        action="store",
+        default="external",
+        choices=SERVER_MODES,
+        help="Servidor de la app: external (ya corriendo), dev (Vite), dist o preview (build de producción)",
+    )
+    group.addoption(
+        "--app-server-reuse",
+        action="store_true",
+        default=False,
+        help="No parar el servidor al terminar y reutilizarlo en la siguiente ejecución",
+    )
+    group.addoption(
+        "--app-port",
+        action="store",
+        type=int,
+        default=None,
+        help="Puerto para --app-server=dev/dist/preview (por defecto uno libre)",
+    )
+    group.addoption(
+        "--warm-pool",
+        action="store",
+        type=int,
+        default=0,
+        help="Número de contextos pre-calentados que se reutilizan entre tests (0 = uno nuevo por test)",
+    )
+    group.addoption(
+        "--screenshot-policy",
+        action="store",
+        default="always",
+        choices=SCREENSHOT_POLICIES,
+        help="Qué capturas de take_screenshot se guardan: always, on-failure o sampled",
+    )
+    group.addoption(
+        "--screenshot-sample",
+        action="store",
+        type=float,
+        default=0.25,
+        help="Fracción de capturas que se guardan con --screenshot-policy=sampled",
+    )
+    group.addoption(
+        "--screenshot-format",
+        action="store",
+        default="png",
+        choices=SCREENSHOT_FORMATS,
+        help="Formato de las capturas: png, jpeg o webp (webp necesita Pillow)",
+    )
+    group.addoption(
+        "--screenshot-quality",
+        action="store",
+        type=int,
+        default=80,
+        help="Calidad (0-100) de las capturas jpeg/webp",
+    )
+    group.addoption(
+        "--visual",
+        action="store",
+        default="off",
+        choices=VISUAL_MODES,
+        help="Regresión visual de las capturas: off, check (comparar con la baseline) o update (aprobar)",
+    )
+    group.addoption(
+        "--device-profile",
+        action="store",
+        default=None,
+        choices=sorted(DEVICE_PROFILES),
+        help="Emula un dispositivo completo: viewport, red y CPU lentas (ver movieverse_testing/profiles.py)",
+    )
+    group.addoption(
+        "--leaks",
+        action="store_true",
+        default=False,
+        help="Ejecuta los tests de fugas de memoria (test_fugas_memoria.py, solo Chromium)",
+    )
+    group.addoption(
+        "--leak-cycles",
+        action="store",
+        type=int,
+        default=5,
+        help="Ciclos de navegación medidos por test de fugas (además del de calentamiento)",
+    )
+    group.addoption(
+        "--typeahead",
+        action="store",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Ejecuta test_rendimiento_busqueda.py escribiendo N búsquedas por cadencia (0 = desactivado)",
+    )
+    group.addoption(
+        "--scaling",
+        action="store_true",
+        default=False,
+        help="Ejecuta test_rendimiento_escala.py: render, nodos DOM y heap frente al tamaño de la entrada",
+    )
+    group.addoption(
+        "--impact-record",
+        action="store_true",
+        default=False,
+        help="Graba la cobertura JS, las rutas y los endpoints de TMDB de cada test en .cache/impact-map.json",
+    )
+    group.addoption(
+        "--impacted-by",
+        action="store",
+        default=None,
+        metavar="REF",
+        help="Ejecuta solo los tests afectados por los cambios frente a REF (git diff) según el mapa de impacto",
+    )
+    group.addoption(
+        "--chrome-trace",
+        action="store",
+        default="off",
+        choices=TRACE_MODES,
+        help="Trazas de rendimiento de Chromium en traces/: off, test (una por test) o steps (bloques trace_step)",
+    )
+
+
+def pytest_configure(config):
+    visual.set_mode(config.getoption("visual"))
+    tracing.set_mode(config.getoption("chrome_trace"))
+    screenshots.configure(
+        policy=config.getoption("screenshot_policy"),
+        sample_rate=config.getoption("screenshot_sample"),
+        format=config.getoption("screenshot_format"),
+        quality=config.getoption("screenshot_quality"),
+    )
+    if config.getoption("impact_record"):
+        config.stash[_impact_map_key] = ImpactMap()
+    # Solo el proceso principal arranca el servidor; los workers de xdist
+    # heredan MOVIEVERSE_BASE_URL y se conectan al mismo.
+    if is_xdist_worker(config):
+        return
+    server = AppServer(
+        config.getoption("app_server"),
+        port=config.getoption("app_port"),
+        reuse=config.getoption("app_server_reuse"),
+    )
+    os.environ[BASE_URL_ENV] = server.start()
+    config.stash[_app_server_key] = server
+    timer = RunTimer()
+    config.stash[_run_timer_key] = timer
+    config.pluginmanager.register(timer, "movieverse-run-timer")
+
+
+def pytest_report_header(config):
+    server = config.stash.get(_app_server_key, None)
+    return server.describe() if server is not None else None
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    # Con -n (dist=load) los tests más largos según el historial salen primero
+    if config.getoption("dist", "load") != "load":
+        return None
+    return LongestFirstScheduling(config, log)
+
+
+def pytest_collection_modifyitems(config, items):
+    ref = config.getoption("impacted_by")
+    if not ref:
+        return
+    impact_map = ImpactMap.load()
+    if not impact_map:
+        config.stash[_impact_summary_key] = "no hay mapa de impacto (pytest --impact-record): se ejecuta todo"
+        return
+    changes = ChangeSet.from_git(ref)
+    selected, reasons = impact_map.select([item.nodeid for item in items], changes)
+    selected = set(selected)
+    deselected = [item for item in items if item.nodeid not in selected]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in selected]
+    config.stash[_impact_summary_key] = (
+        f"{len(items)} de {len(items) + len(deselected)} tests afectados por "
+        f"{len(changes.files)} archivos cambiados frente a {ref}"
+    )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    # Guarda el resultado de cada fase para que el fixture page sepa si el test falló
+    outcome = yield
+    report = outcome.get_result()
+    item.stash[_phase_report_key] = {**item.stash.get(_phase_report_key, {}), report.when: report}
+
+
+def pytest_sessionfinish(session):
+    # Las capturas se escriben en segundo plano: esperar a que terminen
+    errors = screenshots.writer.flush()
+    impact_map = session.config.stash.get(_impact_map_key, None)
+    if impact_map:
+        impact_map.save()
+    timer = session.config.stash.get(_run_timer_key, None)
+    if timer is not None and timer.test_durations:
+        DurationHistory.load().update(timer.test_durations).save()
+    reporter = session.config.pluginmanager.get_plugin("terminalreporter")
+    if errors and reporter is not None:
+        reporter.write_line(f"⚠️ {len(errors)} capturas no se pudieron guardar:")
+        for error in errors:
+            reporter.write_line(f"   {error}")
+
+
+def pytest_unconfigure(config):
+    server = config.stash.get(_app_server_key, None)
+    if server is not None:
+        server.stop()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    impact_summary = config.stash.get(_impact_summary_key, None)
+    if impact_summary is not None:
+        terminalreporter.write_line(f"🎯 Impacto: {impact_summary}")
+    timer = config.stash.get(_run_timer_key, None)
+    if timer is None or not timer.test_durations:
+        return
+    timer.stop()
+    workers = getattr(config.option, "numprocesses", None) or 1
+    terminalreporter.section("⚡ Tiempo de ejecución")
+    for line in timer.summary_lines(workers):
+        terminalreporter.write_line(line)
+
+
+@pytest.fixture(scope="session")
+def tmdb_replay(pytestconfig):
+    """
+    Handler de TMDB de la sesión (None si se usa la API real).
+
+    - replay: índice de replay.json con las grabaciones superpuestas. Las
+      peticiones sin respuesta se apuntan en .cache/tmdb-misses.txt para
+      que `fixture_store refresh` las grabe.
+    - record: grabadora; al terminar guarda lo grabado en recorded.json.gz.
+    """
+    mode = pytestconfig.getoption("tmdb")
+    if mode == "record":
+        recorder = TMDBRecorder(FixtureStore())
+        yield recorder
+        recorder.store.save()
+        return
+    if mode != "replay":
+        yield None
+        return
+    index = replay_index()
+    yield index
+    if index.misses:
+        DEFAULT_MISSES.parent.mkdir(parents=True, exist_ok=True)
+        with open(DEFAULT_MISSES, "a", encoding="utf-8") as misses_file:
+            misses_file.writelines(f"{url}\n" for url in index.misses)
+
+
+@pytest.fixture(scope="session")
+def tmdb_images(pytestconfig):
+    """Stub de imágenes compartido (los placeholders se generan una vez)"""
+    return ImageStubber(pytestconfig.getoption("tmdb_images"))
+
+
+@pytest.fixture(scope="session")
+def device_profile(pytestconfig):
+    """Perfil elegido con --device-profile (None = sin emulación)"""
+    name = pytestconfig.getoption("device_profile")
+    return DEVICE_PROFILES[name] if name else None
+
+
+@pytest.fixture(scope="session")
+def browser_context_args(browser_context_args, device_profile):
+    """Añade viewport, densidad y modo móvil del perfil a los contextos"""
+    if device_profile is None:
+        return browser_context_args
+    return {**browser_context_args, **device_profile.context_args()}
+
+
+@pytest.fixture(autouse=True)
+def impact_tracker(request):
+    """Con --impact-record, apunta lo que usa el test (None si no se graba)"""
+    impact_map = request.config.stash.get(_impact_map_key, None)
+    if impact_map is None:
+        yield None
+        return
+    tracker = ImpactTracker()
+    yield tracker
+    impact_map.record(request.node.nodeid, tracker.entry())
+
+
+def _prepare_context(context, tmdb_replay, tmdb_images):
+    """Instala la instrumentación de esperas y métricas y las rutas de TMDB en un contexto"""
+    context.add_init_script(READINESS_SCRIPT)
+    context.add_init_script(METRICS_SCRIPT)
+    if tmdb_replay is not None:
+        tmdb_replay.install(context)
+    tmdb_images.install(context)
+
+
+@pytest.fixture
+def context(context, tmdb_replay, tmdb_images):
+    """Contexto de navegador con la instrumentación de esperas instalada"""
+    _prepare_context(context, tmdb_replay, tmdb_images)
+    yield context
+
+
+@pytest.fixture(scope="session")
+def context_pool(pytestconfig, browser, browser_context_args, tmdb_replay, tmdb_images):
+    """Pool de contextos calientes (None si --warm-pool=0)"""
+    size = pytestconfig.getoption("warm_pool")
+    if size <= 0:
+        yield None
+        return
+    pool = ContextPool(
+        browser,
+        size,
+        prepare=lambda context: _prepare_context(context, tmdb_replay, tmdb_images),
+        warm_url=base_url(),
+        context_args=browser_context_args,
+    )
+    pool.warm_up()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def page(request, context_pool, device_profile, impact_tracker):
+    """
+    Página para cada test.
+
+    Sin pool es lo mismo que pytest-playwright (contexto nuevo por test).
+    Con --warm-pool la página se abre en un contexto que ya tiene la app
+    en caché y el estado se limpia al terminar.
+    Con --device-profile la red y la CPU de la página van ralentizadas.
+    Con --chrome-trace=test se graba una traza de Chrome de todo el test.
+    """
+    if context_pool is None:
+        context = request.getfixturevalue("context")
+        page = context.new_page()
+    else:
+        context, page = context_pool.acquire()
+    # La sesión CDP mantiene la emulación mientras dura el test
+    cdp_session = device_profile.throttle(page) if device_profile is not None else None
+    if impact_tracker is not None:
+        impact_tracker.attach(page)
+    recorder = None
+    if tracing.current_mode() == "test" and supports_throttling(page):
+        recorder = tracing.TraceRecorder(page, tracing.TRACE_CATEGORIES)
+        recorder.start()
+    yield page
+    if recorder is not None and recorder.active:
+        recorder.stop()
+        tracing.save_trace(tracing.trace_name(nodeid=request.node.nodeid), recorder.data)
+    if impact_tracker is not None:
+        impact_tracker.finish()
+    call_report = request.node.stash.get(_phase_report_key, {}).get("call")
+    if screenshots.settings.policy == "on-failure" and call_report is not None and call_report.failed:
+        screenshots.capture_failure(page, request.node.name)
+    if cdp_session is not None and not page.is_closed():
+        cdp_session.detach()
+    if context_pool is None:
+        page.close()
+    else:
+        context_pool.release(context, page)
+
+
+@pytest.fixture
+def device_page(browser, browser_context_args, tmdb_replay, tmdb_images, impact_tracker):
+    """
+    Abre páginas emulando un DeviceProfile, cada una en su propio contexto.
+
+        movil = device_page(DEVICE_PROFILES["movil-3g"])
+    """
+    contexts = []
+    sessions = []  # referencias a las sesiones CDP que mantienen la emulación
+
+    def open_page(profile):
+        context = browser.new_context(**{**browser_context_args, **profile.context_args()})
+        contexts.append(context)
+        _prepare_context(context, tmdb_replay, tmdb_images)
+        page = context.new_page()
+        sessions.append(profile.throttle(page))
+        if impact_tracker is not None:
+            impact_tracker.attach(page)
+        return page
+
+    yield open_page
+    if impact_tracker is not None:
+        impact_tracker.finish()
+    for context in contexts:
+        context.close()
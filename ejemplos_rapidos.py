@@ -12,7 +12,9 @@ import pytest
 from playwright.sync_api import Page, expect
 import re
 
-BASE_URL = "http://localhost:5173"
+from movieverse_testing import base_url, take_screenshot, wait_for_app_ready
+
+BASE_URL = base_url()
 
 def test_ejemplo_01_abrir_pagina(page: Page):
     """
@@ -24,7 +26,7 @@ def test_ejemplo_01_abrir_pagina(page: Page):
     3. Toma una foto
     """
     page.goto(BASE_URL)
-    page.screenshot(path="screenshots/ejemplo_01.png")
+    take_screenshot(page, "ejemplo_01.png")
     print("✅ ¡Página abierta y capturada!")
 
 
@@ -41,7 +43,7 @@ def test_ejemplo_02_buscar_texto(page: Page):
     expect(logo).to_be_visible()
     
     print("✅ ¡Encontré el logo MovIA!")
-    page.screenshot(path="screenshots/ejemplo_02.png")
+    take_screenshot(page, "ejemplo_02.png")
 
 
 def test_ejemplo_03_click_simple(page: Page):
@@ -52,8 +54,8 @@ def test_ejemplo_03_click_simple(page: Page):
     """
     page.goto(BASE_URL)
     
-    # Esperar un momento para que cargue
-    page.wait_for_timeout(2000)
+    # Esperar a que la app termine de cargar (sin tiempos fijos)
+    wait_for_app_ready(page)
     
     # Buscar enlace "Tendencias" y hacer click
     tendencias = page.get_by_text("Tendencias")
@@ -64,7 +66,7 @@ def test_ejemplo_03_click_simple(page: Page):
     else:
         print("⚠️ No encontré el enlace Tendencias")
     
-    page.screenshot(path="screenshots/ejemplo_03.png")
+    take_screenshot(page, "ejemplo_03.png")
 
 
 def test_ejemplo_04_esperar_elementos(page: Page):
@@ -78,8 +80,10 @@ def test_ejemplo_04_esperar_elementos(page: Page):
     
     print("Esperando que carguen las películas...")
     
-    # Esperar 3 segundos (tiempo fijo)
-    page.wait_for_timeout(3000)
+    # Esperar a que TMDB responda y las imágenes visibles carguen.
+    # Antes esperábamos 3 segundos fijos: lento si la app es rápida
+    # y frágil si TMDB tarda. Ahora vuelve en cuanto la app está lista.
+    wait_for_app_ready(page)
     
     # Buscar si hay imágenes (que serían posters de películas)
     imagenes = page.locator("img")
@@ -89,7 +93,7 @@ def test_ejemplo_04_esperar_elementos(page: Page):
     else:
         print("⚠️ No encontré imágenes aún")
     
-    page.screenshot(path="screenshots/ejemplo_04.png")
+    take_screenshot(page, "ejemplo_04.png")
 
 
 def test_ejemplo_05_llenar_formulario(page: Page):
@@ -99,7 +103,7 @@ def test_ejemplo_05_llenar_formulario(page: Page):
     Muestra cómo escribir texto en campos de entrada
     """
     page.goto(BASE_URL)
-    page.wait_for_timeout(2000)
+    wait_for_app_ready(page)
     
     # Buscar campo de búsqueda (puede tener placeholder "Buscar...")
     campo_busqueda = page.locator('input[placeholder*="Buscar"]')
@@ -114,11 +118,12 @@ def test_ejemplo_05_llenar_formulario(page: Page):
         print("✅ Presioné Enter")
         
         # Esperar resultados
-        page.wait_for_timeout(2000)
+        expect(page).to_have_url(re.compile(".*search.*"))
+        wait_for_app_ready(page)
     else:
         print("⚠️ No encontré campo de búsqueda")
     
-    page.screenshot(path="screenshots/ejemplo_05.png")
+    take_screenshot(page, "ejemplo_05.png")
 
 
 def test_ejemplo_06_verificar_url(page: Page):
@@ -128,14 +133,14 @@ def test_ejemplo_06_verificar_url(page: Page):
     Muestra cómo verificar URLs después de navegar
     """
     page.goto(BASE_URL)
-    page.wait_for_timeout(2000)
+    wait_for_app_ready(page)
     
     # Click en Tendencias
     tendencias = page.get_by_text("Tendencias")
     
     if tendencias.is_visible():
         tendencias.click()
-        page.wait_for_load_state("networkidle")
+        wait_for_app_ready(page)
         
         # Verificar que la URL cambió
         url_actual = page.url
@@ -146,7 +151,7 @@ def test_ejemplo_06_verificar_url(page: Page):
         else:
             print("⚠️ No estoy en la página esperada")
     
-    page.screenshot(path="screenshots/ejemplo_06.png")
+    take_screenshot(page, "ejemplo_06.png")
 
 
 def test_ejemplo_07_contar_elementos(page: Page):
@@ -156,7 +161,7 @@ def test_ejemplo_07_contar_elementos(page: Page):
     Útil para verificar que se cargó contenido
     """
     page.goto(BASE_URL)
-    page.wait_for_timeout(3000)
+    wait_for_app_ready(page)
     
     # Contar todas las imágenes
     imagenes = page.locator("img")
@@ -168,7 +173,7 @@ def test_ejemplo_07_contar_elementos(page: Page):
     assert cantidad > 0, "Debería haber al menos una imagen"
     
     print("✅ ¡Hay imágenes cargadas!")
-    page.screenshot(path="screenshots/ejemplo_07.png")
+    take_screenshot(page, "ejemplo_07.png")
 
 
 def test_ejemplo_08_multiples_formas_buscar(page: Page):
@@ -178,7 +183,7 @@ def test_ejemplo_08_multiples_formas_buscar(page: Page):
     Playwright ofrece muchas maneras de encontrar elementos
     """
     page.goto(BASE_URL)
-    page.wait_for_timeout(2000)
+    wait_for_app_ready(page)
     
     # Forma 1: Por texto exacto
     logo1 = page.get_by_text("MovIA")
@@ -199,7 +204,7 @@ def test_ejemplo_08_multiples_formas_buscar(page: Page):
     else:
         print("⚠️ No encontré el logo con ningún método")
     
-    page.screenshot(path="screenshots/ejemplo_08.png")
+    take_screenshot(page, "ejemplo_08.png")
 
 
 def test_ejemplo_09_manejo_errores_simple(page: Page):
@@ -209,7 +214,7 @@ def test_ejemplo_09_manejo_errores_simple(page: Page):
     No todos los elementos siempre están presentes
     """
     page.goto(BASE_URL)
-    page.wait_for_timeout(2000)
+    wait_for_app_ready(page)
     
     # Intentar buscar algo que puede no existir
     boton_inexistente = page.get_by_text("Botón Que No Existe")
@@ -229,7 +234,7 @@ def test_ejemplo_09_manejo_errores_simple(page: Page):
     else:
         print("⚠️ No encontré ningún título h1")
     
-    page.screenshot(path="screenshots/ejemplo_09.png")
+    take_screenshot(page, "ejemplo_09.png")
 
 
 def test_ejemplo_10_flujo_basico_completo(page: Page):
@@ -245,7 +250,7 @@ def test_ejemplo_10_flujo_basico_completo(page: Page):
     print("1. ✅ Página cargada")
     
     # 2. Esperar contenido
-    page.wait_for_timeout(3000)
+    wait_for_app_ready(page)
     print("2. ✅ Esperé que cargue el contenido")
     
     # 3. Verificar que hay un título
@@ -264,13 +269,13 @@ def test_ejemplo_10_flujo_basico_completo(page: Page):
     tendencias = page.get_by_text("Tendencias")
     if tendencias.is_visible():
         tendencias.click()
-        page.wait_for_load_state("networkidle")
+        wait_for_app_ready(page)
         print("5. ✅ Navegué a Tendencias")
     else:
         print("5. ⚠️ No encontré enlace Tendencias")
     
     # 6. Captura final
-    page.screenshot(path="screenshots/ejemplo_10_flujo_completo.png")
+    take_screenshot(page, "ejemplo_10_flujo_completo.png")
     print("6. ✅ Captura tomada")
     
     print("🎉 ¡Flujo completo exitoso!")
@@ -295,6 +300,7 @@ CÓMO USAR ESTOS EJEMPLOS:
 
 5. VER LAS CAPTURAS:
    - Se guardan en screenshots/ejemplo_XX.png
+     (en paralelo, en screenshots/gw0/, screenshots/gw1/...)
    - Ábrelas para ver qué capturó cada test
 
 PROGRESIÓN RECOMENDADA:
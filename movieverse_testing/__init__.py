@@ -0,0 +1,72 @@
+"""
+🎬 HERRAMIENTAS DE TESTING - MOVIEVERSE
+=======================================
+
+Utilidades compartidas por los tests de Playwright (ejercicios y ejemplos).
+
+Uso:
+    from movieverse_testing import wait_for_app_ready
+"""
+
+from movieverse_testing.images import IMAGE_MODES, ImageStubber, png_placeholder
+from movieverse_testing.metrics import (
+    METRICS_SCRIPT,
+    PageMetrics,
+    collect_metrics,
+    measure_navigation,
+    measure_route,
+    measure_routes,
+)
+from movieverse_testing.parallel import RunTimer, worker_id
+from movieverse_testing.pool import ContextPool
+from movieverse_testing.routes import APP_ROUTES, sample_url
+from movieverse_testing.screenshots import screenshot_path, take_screenshot
+from movieverse_testing.server import SERVER_MODES, AppServer, base_url
+from movieverse_testing.tmdb_replay import (
+    TMDB_URL_PATTERN,
+    TMDBReplayIndex,
+    normalize_request,
+)
+from movieverse_testing.waits import (
+    DEFAULT_TIMEOUT,
+    READINESS_SCRIPT,
+    READY_CONDITION,
+    ready_condition_arg,
+    wait_for_app_ready,
+    wait_for_scroll_settled,
+    wait_for_tmdb_idle,
+    wait_for_url_change,
+)
+
+__all__ = [
+    "APP_ROUTES",
+    "AppServer",
+    "ContextPool",
+    "DEFAULT_TIMEOUT",
+    "IMAGE_MODES",
+    "ImageStubber",
+    "METRICS_SCRIPT",
+    "PageMetrics",
+    "READINESS_SCRIPT",
+    "READY_CONDITION",
+    "RunTimer",
+    "SERVER_MODES",
+    "TMDBReplayIndex",
+    "TMDB_URL_PATTERN",
+    "base_url",
+    "collect_metrics",
+    "measure_navigation",
+    "measure_route",
+    "measure_routes",
+    "normalize_request",
+    "png_placeholder",
+    "ready_condition_arg",
+    "sample_url",
+    "screenshot_path",
+    "take_screenshot",
+    "wait_for_app_ready",
+    "wait_for_scroll_settled",
+    "wait_for_tmdb_idle",
+    "wait_for_url_change",
+    "worker_id",
+]
@@ -0,0 +1,261 @@
+"""
+✅ EXPECTATIVAS EN LOTE - MOVIEVERSE TESTING
+============================================
+
+Cada expect(locator) es una ida y vuelta a Chromium, y un test que
+comprueba el estado de una vista encadena varios: h1 visible, h1 con
+texto, p visible, botón "Más información", botón "Ver tráiler"...
+
+expect_all() declara esas comprobaciones una vez y las evalúa todas en un
+solo page.evaluate. El bucle de reintentos corre dentro del navegador
+(en cada frame) hasta que pasan todas o se acaba el timeout:
+
+    expect_all(page, [
+        visible("h1"),
+        not_empty("h1"),
+        visible("p"),
+        visible(text="Más información"),
+        any_of(visible(text="Ver tráiler"), visible('button[title*="trailer"]')),
+        url_matches(re.compile(r"/movie/\\d+")),
+    ])
+
+Como con locator.first, cada comprobación mira el primer elemento que
+coincide. text= busca como page.get_by_text: el elemento más interno cuyo
+texto (sin distinguir mayúsculas ni espacios) contiene el texto.
+
+Si algo falla lanza AssertionError con una línea por comprobación fallida:
+qué se esperaba, cuántos elementos coincidían, qué se encontró (texto,
+display/visibility, tamaño) y el HTML del elemento, como expect().
+Las expresiones regulares se evalúan con RegExp de JavaScript.
+"""
+
+import re
+from dataclasses import dataclass
+
+# Timeout por defecto (milisegundos), el mismo que expect() de Playwright
+DEFAULT_EXPECT_TIMEOUT = 5000
+
+# Evalúa las comprobaciones en cada frame hasta que pasan todas o vence el
+# timeout; devuelve el resultado del último intento con el diagnóstico.
+EXPECT_ALL_SCRIPT = """
+async ({ checks, timeout }) => {
+  const normalize = (text) => (text || '').replace(/\\s+/g, ' ').trim();
+
+  const byText = (text) => {
+    const needle = normalize(text).toLowerCase();
+    const matches = [];
+    for (const el of document.body.querySelectorAll('*')) {
+      if (['SCRIPT', 'STYLE', 'NOSCRIPT'].includes(el.tagName)) continue;
+      if (!normalize(el.textContent).toLowerCase().includes(needle)) continue;
+      // Solo el más interno: si un hijo también lo contiene, se queda el hijo
+      const child = Array.from(el.children).some(
+        (c) => normalize(c.textContent).toLowerCase().includes(needle));
+      if (!child) matches.push(el);
+    }
+    return matches;
+  };
+
+  const target = (check) => check.text != null
+    ? byText(check.text)
+    : Array.from(document.querySelectorAll(check.selector));
+
+  const describe = (el) => {
+    if (!el) return null;
+    const style = getComputedStyle(el);
+    const rect = el.getBoundingClientRect();
+    const html = el.outerHTML;
+    return {
+      text: normalize(el.textContent).slice(0, 120),
+      display: style.display,
+      visibility: style.visibility,
+      width: Math.round(rect.width),
+      height: Math.round(rect.height),
+      html: html.length > 200 ? html.slice(0, 200) + '…' : html,
+    };
+  };
+
+  // Misma definición que Playwright: caja no vacía y sin visibility:hidden
+  const isVisible = (el) => {
+    if (!el || !el.isConnected) return false;
+    const rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+  };
+
+  const matchesText = (actual, expected) => expected.regex
+    ? new RegExp(expected.regex, expected.flags).test(actual)
+    : actual.includes(expected.value);
+
+  const evaluate = (check) => {
+    if (check.kind === 'any_of') {
+      const results = check.alternatives.map(evaluate);
+      return { pass: results.some((r) => r.pass), alternatives: results };
+    }
+    if (check.kind === 'url') {
+      return { pass: matchesText(location.href, check.expected), actual: location.href };
+    }
+    const elements = target(check);
+    const first = elements[0];
+    let pass;
+    switch (check.kind) {
+      case 'visible': pass = isVisible(first); break;
+      case 'hidden': pass = !isVisible(first); break;
+      case 'not_empty': pass = !!first && normalize(first.textContent) !== ''; break;
+      case 'text': pass = !!first && matchesText(normalize(first.textContent), check.expected); break;
+      case 'count': pass = elements.length >= check.expected; break;
+      default: throw new Error(`Comprobación desconocida: ${check.kind}`);
+    }
+    return { pass, count: elements.length, element: describe(first) };
+  };
+
+  const started = performance.now();
+  let attempts = 0;
+  while (true) {
+    attempts += 1;
+    const results = checks.map(evaluate);
+    const elapsed = performance.now() - started;
+    if (results.every((r) => r.pass) || elapsed >= timeout) {
+      return { results, attempts, elapsed };
+    }
+    // Siguiente frame (o 50ms si la pestaña no pinta)
+    await new Promise((resolve) => {
+      requestAnimationFrame(resolve);
+      setTimeout(resolve, 50);
+    });
+  }
+}
+"""
+
+
+def _pattern(expected):
+    """Texto o re.Pattern → lo que entiende matchesText en el navegador"""
+    if isinstance(expected, re.Pattern):
+        flags = "i" if expected.flags & re.IGNORECASE else ""
+        return {"regex": expected.pattern, "flags": flags}
+    return {"value": expected}
+
+
+@dataclass(frozen=True)
+class Expectation:
+    """Una comprobación sobre el primer elemento de selector (o de text=)"""
+
+    kind: str
+    selector: str = None
+    text: str = None
+    expected: object = None
+    alternatives: tuple = ()
+
+    def target(self):
+        return f"text={self.text!r}" if self.text is not None else self.selector
+
+    def describe(self):
+        if self.kind == "any_of":
+            return " o ".join(alternative.describe() for alternative in self.alternatives)
+        if self.kind == "url":
+            return f"URL coincide con {self.expected!r}"
+        expected = {
+            "visible": "visible",
+            "hidden": "oculto",
+            "not_empty": "con texto",
+            "text": f"con texto {self.expected!r}",
+            "count": f"al menos {self.expected} elementos",
+        }[self.kind]
+        return f"{self.target()} {expected}"
+
+    def to_js(self):
+        return {
+            "kind": self.kind,
+            "selector": self.selector,
+            "text": self.text,
+            "expected": _pattern(self.expected) if self.kind in ("text", "url") else self.expected,
+            "alternatives": [alternative.to_js() for alternative in self.alternatives],
+        }
+
+
+def _target(selector, text):
+    if (selector is None) == (text is None):
+        raise ValueError("Indica un selector CSS o text=, no los dos")
+    return {"selector": selector, "text": text}
+
+
+def visible(selector=None, *, text=None):
+    return Expectation("visible", **_target(selector, text))
+
+
+def hidden(selector=None, *, text=None):
+    """Oculto o inexistente (como to_be_hidden)"""
+    return Expectation("hidden", **_target(selector, text))
+
+
+def not_empty(selector=None, *, text=None):
+    return Expectation("not_empty", **_target(selector, text))
+
+
+def has_text(selector, expected):
+    """El texto (con espacios normalizados) contiene expected o casa con el re.Pattern"""
+    return Expectation("text", selector=selector, expected=expected)
+
+
+def count_at_least(selector, minimum):
+    return Expectation("count", selector=selector, expected=minimum)
+
+
+def url_matches(expected):
+    """La URL contiene expected o casa con el re.Pattern"""
+    return Expectation("url", expected=expected)
+
+
+def any_of(*alternatives):
+    """Pasa si pasa alguna (como locator.or_())"""
+    return Expectation("any_of", alternatives=tuple(alternatives))
+
+
+def _failure_lines(expectation, result, indent="  "):
+    if result["pass"]:
+        return []
+    lines = [f"{indent}✗ {expectation.describe()}"]
+    if expectation.kind == "any_of":
+        for alternative, alternative_result in zip(expectation.alternatives, result["alternatives"]):
+            lines += _failure_lines(alternative, alternative_result, indent + "    ")
+        return lines
+    if expectation.kind == "url":
+        lines.append(f"{indent}    URL actual: {result['actual']}")
+        return lines
+    element = result["element"]
+    if element is None:
+        lines.append(f"{indent}    <no se encontró ningún elemento>")
+        return lines
+    lines.append(
+        f"{indent}    {result['count']} coincidencias; la primera: texto {element['text']!r}, "
+        f"display={element['display']}, visibility={element['visibility']}, "
+        f"{element['width']}x{element['height']}px"
+    )
+    lines.append(f"{indent}    {element['html']}")
+    return lines
+
+
+def format_failures(expectations, outcome, timeout):
+    """Mensaje de error a partir del resultado de EXPECT_ALL_SCRIPT"""
+    failed = [(expectation, result) for expectation, result in zip(expectations, outcome["results"])
+              if not result["pass"]]
+    lines = [f"expect_all: fallaron {len(failed)} de {len(expectations)} comprobaciones "
+             f"tras {timeout}ms ({outcome['attempts']} intentos)"]
+    for expectation, result in failed:
+        lines += _failure_lines(expectation, result)
+    return "\n".join(lines)
+
+
+def expect_all(page, expectations, timeout=DEFAULT_EXPECT_TIMEOUT):
+    """
+    Espera a que pasen todas las comprobaciones en un solo page.evaluate.
+
+    Devuelve los milisegundos que tardaron en pasar; si vence el timeout
+    lanza AssertionError con el diagnóstico de las que fallaron.
+    """
+    expectations = list(expectations)
+    outcome = page.evaluate(
+        EXPECT_ALL_SCRIPT,
+        {"checks": [expectation.to_js() for expectation in expectations], "timeout": timeout},
+    )
+    if not all(result["pass"] for result in outcome["results"]):
+        raise AssertionError(format_failures(expectations, outcome, timeout))
+    return outcome["elapsed"]
@@ -0,0 +1,220 @@
+"""
+💰 PRESUPUESTOS DE RENDIMIENTO - MOVIEVERSE TESTING
+===================================================
+
+Límites declarativos por ruta en performance_budgets.json y un historial
+de mediciones para detectar regresiones entre commits.
+
+- load_budgets(): lee el archivo y mezcla "default" con cada ruta
+- check_budget(): compara unas PageMetrics con su presupuesto
+- BaselineHistory: guarda las últimas mediciones de cada ruta en
+  .cache/perf-history/<perfil>-<tmdb>-<servidor>/ y avisa si una métrica
+  empeora frente a la mediana
+
+Uso:
+    budgets = load_budgets()
+    violations = check_budget(metricas, budgets.for_route("/trending"))
+    assert not violations, format_violations(violations)
+"""
+
+import json
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_BUDGETS = PROJECT_ROOT / "performance_budgets.json"
+DEFAULT_HISTORY_DIR = PROJECT_ROOT / ".cache" / "perf-history"
+
+# Mediciones que se guardan por ruta
+HISTORY_SIZE = 10
+
+# Empeoramiento relativo frente a la mediana que cuenta como regresión
+REGRESSION_TOLERANCE = 0.2
+
+# Diferencias absolutas por debajo de las cuales no hay regresión (ruido)
+NOISE_FLOOR = {
+    "app_ready": 150,
+    "lcp": 150,
+    "cls": 0.02,
+    "tbt": 50,
+    "request_count": 3,
+    "tmdb_requests": 0,
+    "transfer_bytes": 50_000,
+    "js_heap_bytes": 2_000_000,
+}
+
+_UNITS = {
+    "app_ready": "ms",
+    "lcp": "ms",
+    "tbt": "ms",
+    "transfer_bytes": "B",
+    "js_heap_bytes": "B",
+    "heap_growth_bytes": "B",
+    "retained_growth_bytes": "B",
+    "wasted_image_bytes": "B",
+}
+
+
+@dataclass
+class BudgetViolation:
+    """Una métrica fuera de su límite (presupuesto o baseline)"""
+
+    route: str
+    metric: str
+    limit: float
+    actual: float
+    kind: str = "budget"
+
+    def describe(self):
+        unit = _UNITS.get(self.metric, "")
+        delta = self.actual - self.limit
+        percent = f" ({delta / self.limit:+.0%})" if self.limit else ""
+        reference = "presupuesto" if self.kind == "budget" else "baseline"
+        return (
+            f"{self.route:<16} {self.metric:<15} {_format(self.actual, unit)} > "
+            f"{_format(self.limit, unit)} {reference}, +{_format(delta, unit)}{percent}"
+        )
+
+
+class Budgets:
+    """Presupuestos ya mezclados con los valores por defecto"""
+
+    def __init__(self, default, routes):
+        self.default = dict(default)
+        self.routes = {route: dict(limits) for route, limits in routes.items()}
+
+    def for_route(self, route):
+        """Límites de una ruta: exacta, luego patrón (/tv/*) y siempre sobre default"""
+        limits = dict(self.default)
+        if route in self.routes:
+            limits.update(self.routes[route])
+            return limits
+        for pattern, overrides in self.routes.items():
+            if "*" in pattern and fnmatchcase(route, pattern):
+                limits.update(overrides)
+                break
+        return limits
+
+
+def load_budgets(path=DEFAULT_BUDGETS):
+    """Lee performance_budgets.json"""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    return Budgets(data.get("default", {}), data.get("routes", {}))
+
+
+def check_budget(metrics, limits):
+    """Lista de BudgetViolation de unas PageMetrics (las métricas sin dato se ignoran)"""
+    violations = []
+    for metric, limit in limits.items():
+        actual = getattr(metrics, metric)
+        if actual is not None and actual > limit:
+            violations.append(BudgetViolation(metrics.route, metric, limit, actual))
+    return violations
+
+
+def format_violations(violations):
+    """Texto con una línea por métrica fuera de límite (para el mensaje del assert)"""
+    return "\n".join(["Métricas fuera de límite:"] + [f"  {v.describe()}" for v in violations])
+
+
+def current_commit():
+    """Commit actual (corto) o "unknown" si no hay git"""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return result.stdout.strip()
+
+
+class BaselineHistory:
+    """
+    Historial de mediciones por ruta (un JSON por ruta).
+
+    Un archivo por ruta evita que dos workers de xdist escriban el mismo.
+    La baseline es la mediana de las mediciones de otros commits, así una
+    medición rara no mueve la referencia.
+    """
+
+    def __init__(self, directory=DEFAULT_HISTORY_DIR, size=HISTORY_SIZE):
+        self.directory = Path(directory)
+        self.size = size
+
+    @classmethod
+    def for_run(cls, profile=None, tmdb_mode="live", server_mode="external",
+                directory=DEFAULT_HISTORY_DIR, size=HISTORY_SIZE):
+        """
+        Historial propio de una configuración de ejecución: perfil de
+        dispositivo, origen de TMDB (--tmdb) y servidor (--app-server).
+
+        Una medición con replay y dist no es comparable con otra contra la
+        API real y Vite dev, así que cada combinación tiene su directorio.
+        """
+        key = f"{profile or 'sin-perfil'}-{tmdb_mode}-{server_mode}"
+        return cls(Path(directory) / key, size=size)
+
+    def path_for(self, route):
+        slug = route.strip("/").replace("/", "_").replace(":", "").replace("*", "all") or "home"
+        return self.directory / f"{slug}.json"
+
+    def entries(self, route):
+        path = self.path_for(route)
+        if not path.exists():
+            return []
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def baseline(self, route, exclude_commit=None):
+        """Mediana por métrica de las mediciones guardadas ({} si no hay historial)"""
+        values = {}
+        for entry in self.entries(route):
+            if entry["commit"] == exclude_commit:
+                continue
+            for metric, value in entry["metrics"].items():
+                if value is not None:
+                    values.setdefault(metric, []).append(value)
+        return {metric: statistics.median(series) for metric, series in values.items()}
+
+    def regressions(self, metrics, commit=None, tolerance=REGRESSION_TOLERANCE):
+        """Métricas que empeoran más de tolerance (y del ruido) frente a la baseline"""
+        baseline = self.baseline(metrics.route, exclude_commit=commit)
+        found = []
+        for metric, reference in baseline.items():
+            actual = getattr(metrics, metric, None)
+            if actual is None:
+                continue
+            limit = reference * (1 + tolerance)
+            if actual > limit and actual - reference > NOISE_FLOOR.get(metric, 0):
+                found.append(BudgetViolation(metrics.route, metric, limit, actual, kind="baseline"))
+        return found
+
+    def record(self, metrics, commit):
+        """Guarda la medición (sustituye la anterior del mismo commit)"""
+        entries = [entry for entry in self.entries(metrics.route) if entry["commit"] != commit]
+        entries.append({
+            "commit": commit,
+            "timestamp": time.time(),
+            "metrics": {metric: getattr(metrics, metric) for metric in NOISE_FLOOR},
+        })
+        path = self.path_for(metrics.route)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(entries[-self.size:], indent=2), encoding="utf-8")
+
+
+def _format(value, unit):
+    if unit == "B":
+        return f"{value / 1024:.0f}KB"
+    if unit == "ms":
+        return f"{value:.0f}ms"
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value)
@@ -0,0 +1,444 @@
+"""
+💥 LATENCIA Y FALLOS DE TMDB - MOVIEVERSE TESTING
+=================================================
+
+Inyecta latencia y fallos en las peticiones a TMDB con políticas por
+endpoint (plantillas como en tmdb_replay: movie/{id}, trending/movie/week,
+tv/* o * para todo):
+
+    latencia     fixed (siempre igual), normal (media ± desviación) o
+                 long-tail (lognormal: casi todas rápidas, unas pocas muy lentas)
+    errores      una fracción de respuestas con HTTP 500/503
+    rate limit   HTTP 429 con Retry-After, como cuando se pasa del límite de TMDB
+    goteo        el cuerpo llega a trozos durante drip_ms
+    timeouts     la petición se cuelga timeout_ms y falla como un error de red
+
+Escenarios listos en FAULT_SCENARIOS. Cómo funciona:
+
+- Python sortea de antemano, con semilla, la latencia y el fallo de cada
+  petición (FaultPolicy.plan): mismo escenario + semilla = misma ejecución.
+- Un init script envuelve window.fetch y aplica la latencia y el goteo en
+  el navegador. Un handler de route síncrono no puede esperar sin frenar
+  todas las demás peticiones de la página.
+- Las peticiones que tienen que fallar salen marcadas (?movieverse_fault=)
+  y el page.route de FaultInjector responde con el 429/500 o las aborta.
+  El resto sigue su camino (replay o red) con route.fallback().
+
+measure_faults() carga una ruta con un escenario y mide:
+- cuándo aparece contenido (h1 con texto o una imagen de TMDB)
+- cuándo aparece un ErrorDisplay ("¡Ops! Algo salió mal")
+- las peticiones por endpoint: intentos por petición (React Query reintenta
+  una vez), pico de peticiones por segundo y reintentos que no respetan
+  Retry-After
+
+Uso:
+    result = measure_faults(page, BASE_URL, "rate-limit", seed=1)
+    print("\\n".join(result.lines()))
+    assert not result.requests.storm
+"""
+
+import json
+import math
+import random
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from urllib.parse import parse_qsl, urlsplit
+
+from movieverse_testing.tmdb_replay import TMDB_URL_PATTERN, normalize_request
+from movieverse_testing.waits import wait_for_tmdb_idle
+
+LATENCY_KINDS = ("fixed", "normal", "long-tail")
+
+# Parámetro con el que el fetch del navegador marca las peticiones que deben fallar
+FAULT_PARAM = "movieverse_fault"
+
+# Peticiones sorteadas por política (después se repite el plan)
+PLAN_SIZE = 256
+
+# App.tsx: retry: 1 → como mucho dos intentos por petición
+QUERY_RETRIES = 1
+
+# Más peticiones que estas en un segundo es una tormenta
+STORM_REQUESTS_PER_SECOND = 30
+
+# Calma de TMDB necesaria para dar por terminados los reintentos
+# (React Query espera 1s antes del primer reintento)
+RETRY_QUIET_MS = 1500
+
+ERROR_DISPLAY_TEXT = "Algo salió mal"
+
+# Cuerpos de error como los de TMDB
+_ERROR_BODIES = {
+    429: {"status_code": 25, "status_message": "Your request count (#) is over the allowed limit of (40).",
+          "success": False},
+    500: {"status_code": 11, "status_message": "Internal error: Something went wrong, contact TMDB.",
+          "success": False},
+    503: {"status_code": 9, "status_message": "Service offline: This service is temporarily offline.",
+          "success": False},
+}
+
+
+@dataclass(frozen=True)
+class Latency:
+    """Distribución de la latencia añadida (ms)"""
+
+    kind: str = "fixed"
+    ms: float = 0.0      # fixed: el valor; normal: la media; long-tail: la mediana
+    spread: float = 0.0  # normal: desviación típica en ms; long-tail: sigma del lognormal
+
+    def __post_init__(self):
+        if self.kind not in LATENCY_KINDS:
+            raise ValueError(f"Latencia desconocida: {self.kind} (usa una de {LATENCY_KINDS})")
+
+    def sample(self, rng):
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(self.ms, self.spread))
+        if self.kind == "long-tail":
+            return rng.lognormvariate(math.log(self.ms), self.spread) if self.ms > 0 else 0.0
+        return self.ms
+
+
+@dataclass(frozen=True)
+class FaultPolicy:
+    """Qué les pasa a las peticiones de los endpoints que casan con endpoint"""
+
+    endpoint: str = "*"
+    latency: Latency = Latency()
+    error_rate: float = 0.0
+    error_status: int = 500
+    rate_limit_rate: float = 0.0
+    retry_after: int = 1            # segundos
+    timeout_rate: float = 0.0
+    timeout_ms: float = 8000
+    drip_ms: float = 0.0            # el cuerpo tarda esto en llegar entero
+    drip_chunks: int = 10
+
+    def pattern(self):
+        """Expresión regular (válida en Python y en JS) de la plantilla"""
+        return "^" + ".*".join(re.escape(part) for part in self.endpoint.split("*")) + "$"
+
+    def matches(self, endpoint):
+        return re.match(self.pattern(), endpoint) is not None
+
+    def decide(self, rng):
+        """(latencia ms, fallo) de una petición; fallo es None, "timeout", "429:<s>" o "error:<status>" """
+        latency = self.latency.sample(rng)
+        roll = rng.random()
+        if roll < self.timeout_rate:
+            return self.timeout_ms, "timeout"
+        roll -= self.timeout_rate
+        if roll < self.rate_limit_rate:
+            return latency, f"429:{self.retry_after}"
+        roll -= self.rate_limit_rate
+        if roll < self.error_rate:
+            return latency, f"error:{self.error_status}"
+        return latency, None
+
+    def plan(self, rng, size=PLAN_SIZE):
+        return [{"latency": round(latency, 1), "fault": fault}
+                for latency, fault in (self.decide(rng) for _ in range(size))]
+
+
+FAULT_SCENARIOS = {
+    "lenta": [FaultPolicy(latency=Latency("normal", 800, 200))],
+    "cola-larga": [FaultPolicy(latency=Latency("long-tail", 150, 1.2))],
+    "errores-50": [FaultPolicy(error_rate=0.5)],
+    "rate-limit": [FaultPolicy(latency=Latency("fixed", 50), rate_limit_rate=0.3, retry_after=2)],
+    "goteo": [FaultPolicy(endpoint="trending/*", drip_ms=4000)],
+    "hero-caido": [FaultPolicy(endpoint="movie/popular", error_rate=1.0, error_status=503)],
+    "timeout-detalle": [FaultPolicy(endpoint="movie/{id}", timeout_rate=1.0, timeout_ms=5000)],
+}
+
+
+# Se inyecta con la configuración: (FAULTS_SCRIPT)({policies, param, errorText})
+FAULTS_SCRIPT = """
+(config) => {
+  if (window.__movieverseFaults) return;
+  const faults = { log: [], firstContent: null, firstError: null };
+  window.__movieverseFaults = faults;
+
+  const counters = config.policies.map(() => 0);
+  const patterns = config.policies.map((policy) => new RegExp(policy.pattern));
+  const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+  // Igual que tmdb_replay.path_template
+  const template = (path) => {
+    const segments = path.split('/');
+    return segments.map((segment, i) => /^\\d+$/.test(segment)
+      ? (segments[i - 1] === 'season' ? '{n}' : '{id}') : segment).join('/');
+  };
+
+  const innerFetch = window.fetch.bind(window);
+  window.fetch = async (input, init) => {
+    const url = typeof input === 'string' ? input : (input && input.url) || String(input);
+    if (!url.includes('api.themoviedb.org')) return innerFetch(input, init);
+    const parsed = new URL(url);
+    const endpoint = template(parsed.pathname.replace(/^\\/(3\\/)?/, '').replace(/\\/$/, ''));
+    const index = patterns.findIndex((pattern) => pattern.test(endpoint));
+    if (index < 0) return innerFetch(input, init);
+
+    const policy = config.policies[index];
+    const step = policy.plan[counters[index]++ % policy.plan.length];
+    const entry = { url, endpoint, fault: step.fault, latency: step.latency,
+                    start: performance.now(), end: null, status: null, cancelled: false };
+    faults.log.push(entry);
+
+    // La espera y el goteo también cuentan como TMDB en curso para wait_for_app_ready
+    const state = window.__movieverse;
+    if (state) state.pendingTmdb += 1;
+    let settled = false;
+    const settle = () => {
+      if (settled) return;
+      settled = true;
+      entry.end = performance.now();
+      if (state) {
+        state.pendingTmdb -= 1;
+        state.lastTmdbActivity = performance.now();
+      }
+    };
+
+    let dripping = false;
+    try {
+      await sleep(step.latency);
+      if (step.fault) parsed.searchParams.set(config.param, step.fault);
+      const response = await innerFetch(step.fault ? parsed.toString() : input, init);
+      entry.status = response.status;
+      if (!(policy.drip_ms > 0 && response.ok)) return response;
+
+      const bytes = new Uint8Array(await response.arrayBuffer());
+      const size = Math.ceil(bytes.length / policy.drip_chunks);
+      let chunk = 0;
+      dripping = true;
+      // Si la app deja el cuerpo a medias (reader.cancel() o abort del signal,
+      // p. ej. React Query al desmontar) la petición también termina
+      const signal = (init && init.signal) || (input instanceof Request ? input.signal : null);
+      const body = new ReadableStream({
+        start(controller) {
+          if (!signal) return;
+          signal.addEventListener('abort', () => {
+            entry.cancelled = true;
+            settle();
+            try { controller.error(signal.reason); } catch (error) { /* ya cerrado */ }
+          }, { once: true });
+        },
+        async pull(controller) {
+          await sleep(policy.drip_ms / policy.drip_chunks);
+          if (settled) return;
+          controller.enqueue(bytes.slice(chunk * size, (chunk + 1) * size));
+          chunk += 1;
+          if (chunk >= policy.drip_chunks) {
+            controller.close();
+            settle();
+          }
+        },
+        cancel() {
+          entry.cancelled = true;
+          settle();
+        },
+      });
+      return new Response(body, {
+        status: response.status, statusText: response.statusText, headers: response.headers,
+      });
+    } catch (error) {
+      entry.status = 'failed';
+      throw error;
+    } finally {
+      if (!dripping) settle();
+    }
+  };
+
+  // Primer contenido y primer ErrorDisplay, en ms desde el inicio de la navegación
+  const check = () => {
+    if (faults.firstContent === null) {
+      const h1 = document.querySelector('h1');
+      if ((h1 && h1.textContent.trim()) || document.querySelector('img[src*="image.tmdb.org"]')) {
+        faults.firstContent = performance.now();
+      }
+    }
+    if (faults.firstError === null) {
+      for (const heading of document.querySelectorAll('h3')) {
+        if (heading.textContent.includes(config.errorText)) {
+          faults.firstError = performance.now();
+          break;
+        }
+      }
+    }
+  };
+  new MutationObserver(check).observe(document, { childList: true, subtree: true, characterData: true });
+}
+"""
+
+
+def fault_script(policies, seed=0, plan_size=PLAN_SIZE):
+    """Init script con los planes sorteados de cada política"""
+    rng = random.Random(seed)
+    config = {
+        "param": FAULT_PARAM,
+        "errorText": ERROR_DISPLAY_TEXT,
+        "policies": [
+            {"pattern": policy.pattern(), "plan": policy.plan(rng, plan_size),
+             "drip_ms": policy.drip_ms, "drip_chunks": policy.drip_chunks}
+            for policy in policies
+        ],
+    }
+    return f"({FAULTS_SCRIPT})({json.dumps(config)})"
+
+
+@dataclass
+class RequestStats:
+    """Peticiones a TMDB de un escenario, a partir del log del navegador"""
+
+    log: list = field(default_factory=list)
+    retries: int = QUERY_RETRIES
+
+    def _keys(self):
+        return ["?".join(normalize_request(entry["url"])) for entry in self.log]
+
+    @property
+    def total(self):
+        return len(self.log)
+
+    @property
+    def attempts(self):
+        """Intentos por petición (ruta + query sin api_key)"""
+        return Counter(self._keys())
+
+    @property
+    def max_attempts(self):
+        return max(self.attempts.values(), default=0)
+
+    @property
+    def peak_per_second(self):
+        """Máximo de peticiones empezadas en una ventana de 1s"""
+        starts = sorted(entry["start"] for entry in self.log)
+        peak, first = 0, 0
+        for last, start in enumerate(starts):
+            while start - starts[first] >= 1000:
+                first += 1
+            peak = max(peak, last - first + 1)
+        return peak
+
+    @property
+    def retry_after_violations(self):
+        """Reintentos lanzados antes de lo que pedía el Retry-After de un 429"""
+        violations = 0
+        previous = {}
+        for key, entry in sorted(zip(self._keys(), self.log), key=lambda item: item[1]["start"]):
+            earlier = previous.get(key)
+            fault = (earlier or {}).get("fault") or ""
+            if fault.startswith("429:") and earlier["end"] is not None:
+                if entry["start"] - earlier["end"] < int(fault.split(":")[1]) * 1000:
+                    violations += 1
+            previous[key] = entry
+        return violations
+
+    @property
+    def storm(self):
+        """Más intentos de los que permite retry o demasiadas peticiones por segundo"""
+        return self.max_attempts > self.retries + 1 or self.peak_per_second > STORM_REQUESTS_PER_SECOND
+
+    def by_endpoint(self):
+        """endpoint → (peticiones, fallidas)"""
+        counts = defaultdict(lambda: [0, 0])
+        for entry in self.log:
+            counts[entry["endpoint"]][0] += 1
+            if entry["fault"] or entry["status"] == "failed":
+                counts[entry["endpoint"]][1] += 1
+        return {endpoint: tuple(values) for endpoint, values in counts.items()}
+
+
+class FaultInjector:
+    """Instala un escenario (lista de FaultPolicy) en una página"""
+
+    def __init__(self, policies, seed=0):
+        self.policies = list(FAULT_SCENARIOS[policies] if isinstance(policies, str) else policies)
+        self.seed = seed
+        self.injected = Counter()
+
+    def route_handler(self, route):
+        """Responde con el fallo marcado por el navegador o deja pasar la petición"""
+        url = route.request.url
+        parts = urlsplit(url)
+        params = parse_qsl(parts.query, keep_blank_values=True)
+        fault = dict(params).get(FAULT_PARAM)
+        if fault is None:
+            return route.fallback()
+        self.injected[fault.split(":")[0]] += 1
+        if fault == "timeout":
+            return route.abort("timedout")
+        kind, value = fault.split(":")
+        status = 429 if kind == "429" else int(value)
+        headers = {"content-type": "application/json;charset=utf-8", "access-control-allow-origin": "*"}
+        if kind == "429":
+            headers["retry-after"] = value
+            headers["access-control-expose-headers"] = "Retry-After"
+        return route.fulfill(status=status, headers=headers,
+                             body=json.dumps(_ERROR_BODIES.get(status, _ERROR_BODIES[500])))
+
+    def install(self, page):
+        """Activo desde la siguiente navegación de la página"""
+        page.add_init_script(script=fault_script(self.policies, self.seed))
+        page.route(TMDB_URL_PATTERN, self.route_handler)
+
+    def log(self, page):
+        return page.evaluate("() => window.__movieverseFaults ? window.__movieverseFaults.log : []")
+
+
+@dataclass
+class FaultResult:
+    """Qué vio el usuario y qué pidió la app con un escenario"""
+
+    scenario: str
+    path: str
+    time_to_content_ms: float = None
+    time_to_error_ms: float = None
+    error_displays: int = 0
+    requests: RequestStats = field(default_factory=RequestStats)
+
+    def lines(self):
+        def ms(value):
+            return f"{value:.0f}ms" if value is not None else "-"
+
+        requests = self.requests
+        lines = [
+            f"{self.scenario} en {self.path}: contenido {ms(self.time_to_content_ms)}, "
+            f"error {ms(self.time_to_error_ms)} ({self.error_displays} ErrorDisplay)",
+            f"  {requests.total} peticiones, máx. {requests.max_attempts} intentos por petición, "
+            f"pico {requests.peak_per_second}/s, {requests.retry_after_violations} reintentos antes de Retry-After"
+            + (" ⚠️ tormenta de reintentos" if requests.storm else ""),
+        ]
+        for endpoint, (total, failed) in sorted(self.requests.by_endpoint().items()):
+            lines.append(f"  {endpoint:<32}{total:>4} peticiones{failed:>4} con fallo")
+        return lines
+
+
+def measure_faults(page, base_url, scenario, path="/", seed=0, timeout=30000):
+    """
+    Carga path con el escenario y espera a que la app deje de reintentar.
+
+    scenario es un nombre de FAULT_SCENARIOS o una lista de FaultPolicy.
+    """
+    injector = FaultInjector(scenario, seed=seed)
+    injector.install(page)
+    page.goto(f"{base_url}{path}", timeout=timeout)
+    page.wait_for_function(
+        "() => { const f = window.__movieverseFaults; return f && (f.firstContent !== null || f.firstError !== null); }",
+        timeout=timeout,
+    )
+    wait_for_tmdb_idle(page, quiet_ms=RETRY_QUIET_MS, timeout=timeout)
+    state = page.evaluate(
+        """(text) => ({
+            firstContent: window.__movieverseFaults.firstContent,
+            firstError: window.__movieverseFaults.firstError,
+            errors: Array.from(document.querySelectorAll('h3')).filter((h) => h.textContent.includes(text)).length,
+        })""",
+        ERROR_DISPLAY_TEXT,
+    )
+    return FaultResult(
+        scenario=scenario if isinstance(scenario, str) else "personalizado",
+        path=path,
+        time_to_content_ms=state["firstContent"],
+        time_to_error_ms=state["firstError"],
+        error_displays=state["errors"],
+        requests=RequestStats(injector.log(page)),
+    )
@@ -0,0 +1,333 @@
+"""
+🗄️ ALMACÉN DE RESPUESTAS GRABADAS DE TMDB - MOVIEVERSE TESTING
+==============================================================
+
+Con --tmdb=record la suite habla con la API real y guarda cada respuesta
+en fixtures/tmdb/recorded.json.gz. Después, --tmdb=replay responde con
+esas grabaciones (y con replay.json para lo que no se haya grabado).
+
+El almacén es direccionado por contenido:
+
+- Cada documento se guarda una sola vez bajo el sha256 de su JSON
+  canónico: dos endpoints con la misma respuesta (las listas de géneros,
+  por ejemplo) comparten objeto.
+- Los sub-documentos de append_to_response (credits, images, videos,
+  recommendations, similar) y las listas repetidas (genres...) se separan
+  en objetos propios y el documento guarda {"$ref": hash}. El reparto de
+  una película se guarda una vez aunque aparezca en varias respuestas.
+
+El índice (clave normalizada → hash, fecha de grabación y URL) va en el
+mismo archivo gzip. Cargarlo es un json.load; las referencias se
+resuelven solo al pedir una respuesta.
+
+Refresco incremental (solo lo viejo o lo que faltó en replay):
+    python -m movieverse_testing.fixture_store refresh --max-age-days 30
+    python -m movieverse_testing.fixture_store stats
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+import urllib.request
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from movieverse_testing.locks import file_lock
+from movieverse_testing.tmdb_replay import (
+    DEFAULT_FIXTURES,
+    IGNORED_PARAMS,
+    TMDB_URL_PATTERN,
+    TMDBReplayIndex,
+    normalize_request,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_STORE = PROJECT_ROOT / "fixtures" / "tmdb" / "recorded.json.gz"
+
+# Peticiones que replay no encontró (las escribe conftest.py, las lee refresh)
+DEFAULT_MISSES = PROJECT_ROOT / ".cache" / "tmdb-misses.txt"
+
+# Claves de primer nivel que se guardan como objetos aparte
+SHARED_KEYS = (
+    "credits",
+    "images",
+    "videos",
+    "recommendations",
+    "similar",
+    "genres",
+    "production_companies",
+    "production_countries",
+    "spoken_languages",
+)
+
+API_BASE_URL = "https://api.themoviedb.org/3"
+API_KEY_ENV = "TMDB_API_KEY"
+APP_CONSTANTS = PROJECT_ROOT / "src" / "constants" / "api.constants.ts"
+
+
+def content_hash(document):
+    """sha256 del JSON canónico (claves ordenadas, sin espacios)"""
+    canonical = json.dumps(document, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def request_key(url):
+    """Clave "ruta?query" normalizada (la misma que usa el índice de replay)"""
+    path, query = normalize_request(url)
+    return f"{path}?{query}"
+
+
+def strip_credentials(url):
+    """URL sin api_key ni language, para guardarla en el índice"""
+    parts = urlsplit(url)
+    params = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+              if key not in IGNORED_PARAMS]
+    return f"{parts.scheme}://{parts.netloc}{parts.path}" + (f"?{urlencode(params)}" if params else "")
+
+
+class FixtureStore:
+    """Índice + objetos direccionados por contenido"""
+
+    def __init__(self, index=None, objects=None):
+        self.index = dict(index or {})
+        self.objects = dict(objects or {})
+        self._resolved = {}
+
+    @classmethod
+    def load(cls, path=DEFAULT_STORE):
+        """Lee el almacén (vacío si el archivo no existe)"""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        with gzip.open(path, "rt", encoding="utf-8") as store_file:
+            data = json.load(store_file)
+        return cls(data["index"], data["objects"])
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def _put_object(self, document):
+        digest = content_hash(document)
+        self.objects.setdefault(digest, document)
+        return digest
+
+    def put(self, url, payload, recorded_at=None):
+        """Guarda la respuesta de una URL separando los sub-documentos compartidos"""
+        document = payload
+        if isinstance(payload, dict):
+            document = dict(payload)
+            for key in SHARED_KEYS:
+                value = document.get(key)
+                if isinstance(value, (dict, list)) and value:
+                    document[key] = {"$ref": self._put_object(value)}
+        key = request_key(url)
+        self.index[key] = {
+            "hash": self._put_object(document),
+            "recorded_at": time.time() if recorded_at is None else recorded_at,
+            "url": strip_credentials(url),
+        }
+        self._resolved.pop(key, None)
+        return key
+
+    def get(self, key):
+        """Respuesta completa para una clave "ruta?query" (None si no está grabada)"""
+        if key in self._resolved:
+            return self._resolved[key]
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        document = self.objects[entry["hash"]]
+        if isinstance(document, dict):
+            document = {
+                field: self.objects[value["$ref"]] if _is_ref(value) else value
+                for field, value in document.items()
+            }
+        self._resolved[key] = document
+        return document
+
+    def lookup(self, url):
+        """Como get() pero a partir de la URL completa"""
+        return self.get(request_key(url))
+
+    def stale(self, max_age_seconds, now=None):
+        """Claves grabadas hace más de max_age_seconds"""
+        limit = (time.time() if now is None else now) - max_age_seconds
+        return sorted(key for key, entry in self.index.items() if entry["recorded_at"] < limit)
+
+    def merge(self, other):
+        """Añade las entradas de otro almacén (gana la grabación más reciente)"""
+        for key, entry in other.index.items():
+            current = self.index.get(key)
+            if current is None or current["recorded_at"] < entry["recorded_at"]:
+                self.index[key] = entry
+                self._resolved.pop(key, None)
+        for digest, document in other.objects.items():
+            self.objects.setdefault(digest, document)
+
+    def compact(self):
+        """Borra objetos que ya no referencia ninguna entrada"""
+        alive = set()
+        for entry in self.index.values():
+            alive.add(entry["hash"])
+            document = self.objects[entry["hash"]]
+            if isinstance(document, dict):
+                alive.update(value["$ref"] for value in document.values() if _is_ref(value))
+        self.objects = {digest: doc for digest, doc in self.objects.items() if digest in alive}
+
+    def save(self, path=DEFAULT_STORE):
+        """
+        Escribe el almacén mezclándolo con lo que ya haya en disco.
+
+        Con un lock de archivo para que los workers de xdist que graban a
+        la vez no se pisen. gzip con mtime=0: mismo contenido, mismos bytes.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(path.with_name(path.name + ".lock")):
+            merged = FixtureStore.load(path)
+            merged.merge(self)
+            merged.compact()
+            data = {"version": 1, "index": merged.index, "objects": merged.objects}
+            temporary = path.with_name(path.name + ".tmp")
+            with open(temporary, "wb") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as store_file:
+                    store_file.write(json.dumps(data, sort_keys=True, separators=(",", ":"),
+                                                ensure_ascii=False).encode("utf-8"))
+            os.replace(temporary, path)
+        self.index, self.objects = merged.index, merged.objects
+
+    def stats(self):
+        """Entradas, objetos y tamaño que ocuparían sin deduplicar"""
+        expanded = sum(len(json.dumps(self.get(key), ensure_ascii=False)) for key in self.index)
+        stored = sum(len(json.dumps(doc, ensure_ascii=False)) for doc in self.objects.values())
+        return {"entries": len(self.index), "objects": len(self.objects),
+                "expanded_bytes": expanded, "stored_bytes": stored}
+
+
+def replay_index(fixtures=DEFAULT_FIXTURES, store=DEFAULT_STORE):
+    """
+    Índice de --tmdb=replay: replay.json con las grabaciones del almacén
+    (--tmdb=record, refresh) por encima. Lo usan conftest.py y load.py,
+    así la suite y la prueba de carga responden con los mismos datos.
+    """
+    index = TMDBReplayIndex.from_file(fixtures)
+    index.add_store(FixtureStore.load(store))
+    return index
+
+
+def _is_ref(value):
+    return isinstance(value, dict) and len(value) == 1 and "$ref" in value
+
+
+class TMDBRecorder:
+    """Handler de route para --tmdb=record: pide a TMDB, guarda y responde"""
+
+    def __init__(self, store):
+        self.store = store
+        self.recorded = 0
+
+    def route_handler(self, route):
+        response = route.fetch()
+        body = response.body()
+        if response.ok and "json" in response.headers.get("content-type", ""):
+            self.store.put(route.request.url, json.loads(body))
+            self.recorded += 1
+        route.fulfill(response=response, body=body)
+
+    def install(self, target):
+        """Instala el handler en un BrowserContext o Page"""
+        target.route(TMDB_URL_PATTERN, self.route_handler)
+
+
+# ============================================================================
+# Refresco incremental
+# ============================================================================
+
+def api_key():
+    """API key de TMDB: variable TMDB_API_KEY o la de src/constants/api.constants.ts"""
+    if os.environ.get(API_KEY_ENV):
+        return os.environ[API_KEY_ENV]
+    match = re.search(r"API_KEY\s*=\s*'([^']+)'", APP_CONSTANTS.read_text(encoding="utf-8"))
+    if match is None:
+        raise RuntimeError(f"No hay API key: define {API_KEY_ENV}")
+    return match.group(1)
+
+
+def fetch_tmdb(url, key=None):
+    """Descarga una URL de TMDB con api_key y language=es-ES (como TMDBService)"""
+    separator = "&" if "?" in url else "?"
+    full_url = f"{url}{separator}{urlencode({'api_key': key or api_key(), 'language': 'es-ES'})}"
+    with urllib.request.urlopen(full_url, timeout=30) as response:
+        return json.load(response)
+
+
+def refresh(store, max_age_seconds, missing_urls=(), fetch=fetch_tmdb):
+    """
+    Vuelve a descargar solo las entradas viejas y las que faltan.
+
+    Devuelve (actualizadas, nuevas, fallidas) como listas de claves/URLs.
+    """
+    updated, added, failed = [], [], []
+    for key in store.stale(max_age_seconds):
+        url = store.index[key]["url"]
+        try:
+            store.put(url, fetch(url))
+            updated.append(key)
+        except Exception:
+            failed.append(url)
+    for url in missing_urls:
+        url = strip_credentials(url)
+        if request_key(url) in store:
+            continue
+        try:
+            store.put(url, fetch(url))
+            added.append(request_key(url))
+        except Exception:
+            failed.append(url)
+    return updated, added, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Almacén de respuestas grabadas de TMDB")
+    parser.add_argument("command", choices=("stats", "refresh"))
+    parser.add_argument("--store", type=Path, default=DEFAULT_STORE)
+    parser.add_argument("--max-age-days", type=float, default=30)
+    parser.add_argument("--misses", type=Path, default=DEFAULT_MISSES,
+                        help="Archivo con las URLs que replay no encontró")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    store = FixtureStore.load(args.store)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    if args.command == "stats":
+        stats = store.stats()
+        size = args.store.stat().st_size if args.store.exists() else 0
+        print(f"{stats['entries']} respuestas en {stats['objects']} objetos, cargadas en {load_ms:.0f}ms")
+        print(f"JSON expandido {stats['expanded_bytes'] / 1024:.0f}KB → deduplicado "
+              f"{stats['stored_bytes'] / 1024:.0f}KB → en disco {size / 1024:.0f}KB")
+        return 0
+
+    missing = []
+    if args.misses.exists():
+        missing = [line.strip() for line in args.misses.read_text(encoding="utf-8").splitlines() if line.strip()]
+    updated, added, failed = refresh(store, args.max_age_days * 86400, missing)
+    store.save(args.store)
+    if args.misses.exists() and not failed:
+        args.misses.unlink()
+    print(f"{len(updated)} actualizadas, {len(added)} nuevas, {len(failed)} fallidas")
+    for url in failed:
+        print(f"  ✗ {url}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,338 @@
+"""
+🔍 AUDITORÍA DE IMÁGENES SOBREDIMENSIONADAS - MOVIEVERSE TESTING
+================================================================
+
+getImageUrl elige entre w185 y original según el tipo y el "size" que pasa
+cada componente, sin mirar el viewport: un móvil de 390px puede acabar
+bajando backdrops w1280. Este módulo carga una ruta con un DeviceProfile y,
+por cada imagen descargada, compara su tamaño natural con el que ocupa en
+pantalla × devicePixelRatio:
+
+    bytes desperdiciados = bytes × (1 - píxeles necesarios / píxeles naturales)
+
+como la auditoría "Properly size images" de Lighthouse (con object-fit:
+cover cuenta la escala real, no la caja). Entran los <img> y los fondos
+CSS (el placeholderSrc borroso de LazyLoadImage es un background-image).
+
+También marca las imágenes cargadas fuera de pantalla sin haber hecho
+scroll: OptimizedImage usa LazyLoadImage (threshold de 100px), así que
+cualquier <img> cargado más allá es una descarga que se pudo aplazar.
+
+El reporte agrupa por componente de React (MovieCard, OptimizedHeroSection,
+MovieDetailPage...) y los ordena por bytes desperdiciados:
+
+    movil-4g: 2.8MB de 3.6MB en imágenes sobran (78%), 6 cargadas fuera de pantalla
+      componente                 imgs   bytes   sobran  tamaños      fuera
+      OptimizedHeroSection          3   1.2MB    1.1MB  original        0
+      MovieCard                    24   980KB    640KB  w342             6
+
+Si la respuesta de la imagen no trae su tamaño (placeholders de
+--tmdb-images=placeholder, CDNs sin Timing-Allow-Origin) se estima con
+BYTES_PER_PIXEL.
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from movieverse_testing.budgets import DEFAULT_BUDGETS, Budgets
+from movieverse_testing.images import size_bucket
+from movieverse_testing.waits import wait_for_app_ready
+
+# Bytes por píxel aproximados de un JPEG de TMDB (para estimar cuando no hay medida)
+BYTES_PER_PIXEL = 0.2
+
+# threshold de LazyLoadImage en OptimizedImage (px)
+LAZY_THRESHOLD_PX = 100
+
+# Componentes que envuelven la imagen sin decidir su tamaño
+WRAPPER_COMPONENTS = {
+    "OptimizedImage", "LazyLoadImage", "LazyLoadComponent", "PlaceholderWithTracking",
+    "PlaceholderWithoutTracking", "LazyLoadImageWithTracking", "LazyLoadComponentWithTracking",
+    "ScrollAwareComponent",
+}
+
+# Recoge <img> cargados y fondos CSS con url(...). El componente sale de la
+# fibra de React del elemento (nombres de función: con una build minificada
+# quedan letras sueltas, y se usa el título de la sección como pista).
+COLLECT_IMAGES_SCRIPT = """
+async () => {
+  const components = (el) => {
+    const key = Object.keys(el).find((k) => k.startsWith('__reactFiber$'));
+    const names = [];
+    for (let fiber = key ? el[key] : null; fiber && names.length < 6; fiber = fiber.return) {
+      const type = fiber.type;
+      if (!type || typeof type === 'string') continue;
+      const inner = type.render || type.type || type;
+      const name = type.displayName || inner.displayName || inner.name;
+      if (name) names.push(name);
+    }
+    return names;
+  };
+  const section = (el) => {
+    const container = el.closest('section, header, main > div');
+    const heading = container && container.querySelector('h1, h2, h3');
+    return heading ? heading.textContent.trim().slice(0, 40) : null;
+  };
+  const resourceBytes = (url) => {
+    const entry = performance.getEntriesByName(url)[0];
+    return entry ? entry.encodedBodySize || 0 : 0;
+  };
+  const describe = (el, url, kind, natural) => {
+    const rect = el.getBoundingClientRect();
+    const style = getComputedStyle(el);
+    const shown = style.display !== 'none' && style.visibility !== 'hidden';
+    return {
+      url, kind,
+      naturalWidth: natural.width, naturalHeight: natural.height,
+      width: shown ? rect.width : 0, height: shown ? rect.height : 0,
+      top: rect.top, left: rect.left,
+      fit: kind === 'css' ? (style.backgroundSize === 'contain' ? 'contain' : 'cover') : style.objectFit,
+      bytes: resourceBytes(url),
+      components: components(el),
+      section: section(el),
+    };
+  };
+
+  const records = [];
+  for (const img of document.images) {
+    if (!img.currentSrc || !img.complete || img.naturalWidth === 0) continue;
+    records.push(describe(img, img.currentSrc, 'img', { width: img.naturalWidth, height: img.naturalHeight }));
+  }
+
+  const backgrounds = document.querySelectorAll('[style*="background-image"], .lazy-load-image-background');
+  const sizes = new Map();
+  const naturalSize = (url) => {
+    if (!sizes.has(url)) {
+      sizes.set(url, new Promise((resolve) => {
+        const probe = new Image();
+        probe.onload = () => resolve({ width: probe.naturalWidth, height: probe.naturalHeight });
+        probe.onerror = () => resolve(null);
+        probe.src = url;
+      }));
+    }
+    return sizes.get(url);
+  };
+  for (const el of backgrounds) {
+    const match = getComputedStyle(el).backgroundImage.match(/url\\(["']?([^"')]+)["']?\\)/);
+    if (!match || match[1].startsWith('data:')) continue;
+    // Solo lo que ya se descargó: el probe no debe provocar descargas nuevas
+    if (!performance.getEntriesByName(match[1]).length) continue;
+    const natural = await naturalSize(match[1]);
+    if (natural) records.push(describe(el, match[1], 'css', natural));
+  }
+
+  return { dpr: window.devicePixelRatio || 1, viewport: [innerWidth, innerHeight], records };
+}
+"""
+
+
+@dataclass
+class ImageRecord:
+    """Una imagen descargada por una ruta con un perfil de dispositivo"""
+
+    url: str
+    route: str
+    profile: str
+    component: str
+    kind: str                  # "img" o "css" (background-image)
+    natural_width: int
+    natural_height: int
+    width: float               # tamaño en pantalla (CSS px); 0 si está oculta
+    height: float
+    dpr: float
+    viewport: tuple
+    top: float = 0
+    left: float = 0
+    fit: str = "fill"
+    measured_bytes: int = 0
+
+    @property
+    def bucket(self):
+        """Tamaño de TMDB (w342, original...) o None si no es de TMDB"""
+        return size_bucket(self.url)
+
+    @property
+    def natural_pixels(self):
+        return self.natural_width * self.natural_height
+
+    @property
+    def bytes(self):
+        """Bytes medidos, o estimados si la medida no es creíble (placeholders, sin Timing-Allow-Origin)"""
+        estimated = round(self.natural_pixels * BYTES_PER_PIXEL)
+        if self.measured_bytes and self.measured_bytes >= estimated * 0.05:
+            return self.measured_bytes
+        return estimated
+
+    @property
+    def needed_ratio(self):
+        """Fracción de los píxeles naturales que llegan a la pantalla (0-1)"""
+        if not self.natural_pixels or self.width <= 0 or self.height <= 0:
+            return 0.0
+        scale_x = self.width / self.natural_width
+        scale_y = self.height / self.natural_height
+        if self.fit == "cover":
+            scale_x = scale_y = max(scale_x, scale_y)
+        elif self.fit in ("contain", "scale-down"):
+            scale_x = scale_y = min(scale_x, scale_y)
+        return min(1.0, scale_x * self.dpr) * min(1.0, scale_y * self.dpr)
+
+    @property
+    def wasted_bytes(self):
+        return round(self.bytes * (1 - self.needed_ratio))
+
+    @property
+    def offscreen(self):
+        """Un <img> cargado más allá del threshold de LazyLoadImage sin haber hecho scroll"""
+        if self.kind != "img" or self.width <= 0 or self.height <= 0:
+            return False
+        viewport_width, viewport_height = self.viewport
+        return (self.top > viewport_height + LAZY_THRESHOLD_PX
+                or self.left > viewport_width + LAZY_THRESHOLD_PX
+                or self.top + self.height < -LAZY_THRESHOLD_PX
+                or self.left + self.width < -LAZY_THRESHOLD_PX)
+
+
+def component_label(components, section=None):
+    """
+    Nombre del componente que decide el tamaño: el primero de la cadena de
+    fibras que no es un envoltorio (OptimizedImage, LazyLoadImage...).
+    """
+    for name in components:
+        if name not in WRAPPER_COMPONENTS and len(name) > 2:
+            return name
+    if section:
+        return f"sección «{section}»"
+    return components[0] if components else "desconocido"
+
+
+@dataclass
+class RouteImageSummary:
+    """Totales de una ruta, con los nombres que usa performance_budgets.json ("images")"""
+
+    route: str
+    images: int
+    image_bytes: int
+    wasted_image_bytes: int
+    offscreen_eager_images: int
+
+
+@dataclass
+class ComponentWaste:
+    component: str
+    images: int = 0
+    bytes: int = 0
+    wasted_bytes: int = 0
+    offscreen: int = 0
+    buckets: set = field(default_factory=set)
+
+
+@dataclass
+class ImageAuditReport:
+    profile: str
+    records: list = field(default_factory=list)
+
+    @property
+    def bytes(self):
+        return sum(record.bytes for record in self.records)
+
+    @property
+    def wasted_bytes(self):
+        return sum(record.wasted_bytes for record in self.records)
+
+    @property
+    def offscreen(self):
+        return [record for record in self.records if record.offscreen]
+
+    def summary(self, route):
+        records = [record for record in self.records if record.route == route]
+        return RouteImageSummary(
+            route=route,
+            images=len(records),
+            image_bytes=sum(record.bytes for record in records),
+            wasted_image_bytes=sum(record.wasted_bytes for record in records),
+            offscreen_eager_images=sum(1 for record in records if record.offscreen),
+        )
+
+    def routes(self):
+        return list(dict.fromkeys(record.route for record in self.records))
+
+    def by_component(self):
+        """ComponentWaste por componente, de más a menos bytes desperdiciados"""
+        groups = {}
+        for record in self.records:
+            group = groups.setdefault(record.component, ComponentWaste(record.component))
+            group.images += 1
+            group.bytes += record.bytes
+            group.wasted_bytes += record.wasted_bytes
+            group.offscreen += record.offscreen
+            group.buckets.add(record.bucket or "externa")
+        return sorted(groups.values(), key=lambda group: (-group.wasted_bytes, group.component))
+
+    def lines(self, top=10):
+        def size(value):
+            return f"{value / 1_048_576:.1f}MB" if value >= 1_048_576 else f"{value / 1024:.0f}KB"
+
+        share = f" ({self.wasted_bytes / self.bytes:.0%})" if self.bytes else ""
+        lines = [f"{self.profile}: {size(self.wasted_bytes)} de {size(self.bytes)} en imágenes sobran{share}, "
+                 f"{len(self.offscreen)} cargadas fuera de pantalla"]
+        for route in self.routes():
+            summary = self.summary(route)
+            lines.append(f"  {route:<14} {summary.images:>4} imágenes {size(summary.image_bytes):>8}, "
+                         f"sobran {size(summary.wasted_image_bytes):>8}, fuera de pantalla {summary.offscreen_eager_images}")
+        lines.append(f"  {'componente':<28} {'imgs':>5} {'bytes':>8} {'sobran':>8}  {'tamaños':<18} {'fuera':>5}")
+        for group in self.by_component()[:top]:
+            buckets = ",".join(sorted(group.buckets))
+            lines.append(f"  {group.component[:28]:<28} {group.images:>5} {size(group.bytes):>8} "
+                         f"{size(group.wasted_bytes):>8}  {buckets[:18]:<18} {group.offscreen:>5}")
+        worst = sorted(self.records, key=lambda record: -record.wasted_bytes)[:3]
+        for record in worst:
+            if record.wasted_bytes:
+                lines.append(
+                    f"  ⚠️ {record.component}: {record.natural_width}x{record.natural_height} "
+                    f"({record.bucket or 'externa'}) pintada a {record.width:.0f}x{record.height:.0f} "
+                    f"@{record.dpr:g}x en {record.route}, sobran {size(record.wasted_bytes)}"
+                )
+        return lines
+
+
+def collect_images(page, route, profile):
+    """ImageRecord de las imágenes ya descargadas por la página actual"""
+    data = page.evaluate(COLLECT_IMAGES_SCRIPT)
+    return [
+        ImageRecord(
+            url=item["url"],
+            route=route,
+            profile=profile,
+            component=component_label(item["components"], item["section"]),
+            kind=item["kind"],
+            natural_width=item["naturalWidth"],
+            natural_height=item["naturalHeight"],
+            width=item["width"],
+            height=item["height"],
+            dpr=data["dpr"],
+            viewport=tuple(data["viewport"]),
+            top=item["top"],
+            left=item["left"],
+            fit=item["fit"],
+            measured_bytes=item["bytes"],
+        )
+        for item in data["records"]
+    ]
+
+
+def audit_route(page, base_url, path, profile, route=None, **ready_kwargs):
+    """
+    Carga path desde cero (sin scroll), espera a que las imágenes visibles
+    estén cargadas y devuelve sus ImageRecord.
+    """
+    page.goto(base_url + path, timeout=ready_kwargs.get("timeout"))
+    wait_for_app_ready(page, **ready_kwargs)
+    return collect_images(page, route or path, profile)
+
+
+def load_image_budgets(path=DEFAULT_BUDGETS):
+    """Límites por ruta (sección "images" de performance_budgets.json)"""
+    data = json.loads(Path(path).read_text(encoding="utf-8")).get("images", {})
+    return Budgets(data.get("default", {}), data.get("routes", {}))
+
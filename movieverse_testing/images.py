@@ -0,0 +1,186 @@
+"""
+🖼️ IMÁGENES DE TMDB EN LOS TESTS - MOVIEVERSE TESTING
+======================================================
+
+OptimizedImage y el hero descargan posters y backdrops (algunos en tamaño
+`original`) desde IMAGE_BASE_URL. Ningún test mira sus píxeles, así que
+casi todos esos bytes sobran. Este módulo intercepta image.tmdb.org con
+context.route y ofrece tres modos:
+
+    placeholder   PNG diminuto generado en memoria, con las dimensiones
+                  del tamaño pedido (w185, w780, original...)
+    disk          Bytes reales guardados en .cache/tmdb-images/ (se
+                  descargan la primera vez; sin red se usa placeholder)
+    block         Aborta la petición (los <img> siguen en el DOM)
+
+Con `live` (por defecto) no se intercepta nada.
+
+Activación: pytest --tmdb-images=placeholder
+"""
+
+import os
+import struct
+import tempfile
+import zlib
+from pathlib import Path
+
+IMAGE_MODES = ("live", "placeholder", "disk", "block")
+
+# Patrones de imágenes a interceptar (TMDB y los placeholders de helpers.ts)
+IMAGE_URL_PATTERNS = ("https://image.tmdb.org/t/p/**", "https://placehold.co/**")
+
+# Carpeta para el modo disk
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "tmdb-images"
+
+# Dimensiones de cada tamaño de IMAGE_SIZES (src/constants/api.constants.ts).
+# w780 se usa para posters xlarge y backdrops small; tomamos la forma de backdrop.
+SIZE_DIMENSIONS = {
+    "w45": (45, 68),
+    "w185": (185, 278),
+    "w342": (342, 513),
+    "w500": (500, 750),
+    "w780": (780, 439),
+    "w1280": (1280, 720),
+    "h632": (421, 632),
+    "original": (1920, 1080),
+}
+
+# Tamaño usado si la URL no trae un bucket conocido (p. ej. placehold.co)
+FALLBACK_DIMENSIONS = (500, 750)
+
+# Gris oscuro similar al fondo de la app (#0f0f23)
+PLACEHOLDER_GRAY = 0x1a
+
+
+def png_placeholder(width, height, gray=PLACEHOLDER_GRAY):
+    """
+    Genera un PNG en escala de grises de un solo color.
+
+    Al ser un color plano, zlib lo deja en unos cientos de bytes incluso
+    para 1920x1080, y no hace falta Pillow.
+    """
+    row = b"\x00" + bytes([gray]) * width
+    raw = row * height
+
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(raw, 9))
+        + chunk(b"IEND", b"")
+    )
+
+
+def size_bucket(url):
+    """Devuelve el tamaño de TMDB de una URL (w185, original...) o None"""
+    marker = "/t/p/"
+    if marker not in url:
+        return None
+    return url.split(marker, 1)[1].split("/", 1)[0]
+
+
+class ImageStubber:
+    """
+    Handler de route para imágenes según el modo elegido.
+
+    Los placeholders se generan una vez por tamaño y se reutilizan.
+    """
+
+    def __init__(self, mode="placeholder", cache_dir=DEFAULT_CACHE_DIR):
+        if mode not in IMAGE_MODES:
+            raise ValueError(f"Modo de imágenes desconocido: {mode} (usa uno de {IMAGE_MODES})")
+        self.mode = mode
+        self.cache_dir = Path(cache_dir)
+        self._placeholders = {}
+        self.served = {"placeholder": 0, "disk": 0, "network": 0, "blocked": 0}
+
+    def placeholder_for(self, url):
+        """PNG con las dimensiones del bucket de la URL (cacheado)"""
+        dimensions = SIZE_DIMENSIONS.get(size_bucket(url), FALLBACK_DIMENSIONS)
+        if dimensions not in self._placeholders:
+            self._placeholders[dimensions] = png_placeholder(*dimensions)
+        return self._placeholders[dimensions]
+
+    def cache_path(self, url):
+        """Ruta en disco para una imagen de TMDB (None si no es de TMDB)"""
+        bucket = size_bucket(url)
+        if bucket is None:
+            return None
+        filename = url.split("?", 1)[0].rsplit("/", 1)[-1]
+        return self.cache_dir / bucket / filename
+
+    def route_handler(self, route):
+        """
+        Handler para context.route / page.route.
+
+        En modos placeholder y block también sirve con la API async de
+        Playwright (se devuelve la corutina de fulfill/abort). El modo disk
+        descarga con route.fetch() y solo funciona con la API sync.
+        """
+        url = route.request.url
+        if self.mode == "block":
+            self.served["blocked"] += 1
+            return route.abort("blockedbyclient")
+
+        if self.mode == "disk":
+            cached = self.cache_path(url)
+            if cached is not None and cached.exists():
+                self.served["disk"] += 1
+                return route.fulfill(status=200, body=cached.read_bytes(), content_type=_content_type(cached))
+            if cached is not None and self._download(route, cached):
+                return None
+
+        self.served["placeholder"] += 1
+        return route.fulfill(status=200, body=self.placeholder_for(url), content_type="image/png")
+
+    def _download(self, route, destination):
+        """Descarga la imagen real, la guarda en disco y la sirve"""
+        try:
+            response = route.fetch()
+        except Exception:
+            return False
+        if not response.ok:
+            return False
+        body = response.body()
+        _write_atomic(destination, body)
+        self.served["network"] += 1
+        route.fulfill(response=response, body=body)
+        return True
+
+    def install(self, target):
+        """Instala el handler en un BrowserContext o Page (no hace nada en modo live)"""
+        if self.mode == "live":
+            return
+        for pattern in IMAGE_URL_PATTERNS:
+            target.route(pattern, self.route_handler)
+
+
+def _write_atomic(destination, body):
+    """
+    Escribe en un temporal de la misma carpeta y lo renombra: otro worker
+    de xdist nunca lee un archivo a medias.
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=destination.parent, prefix=f".{destination.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as temporary_file:
+            temporary_file.write(body)
+        os.replace(temporary, destination)
+    except BaseException:
+        Path(temporary).unlink(missing_ok=True)
+        raise
+
+
+def _content_type(path):
+    suffix = path.suffix.lower()
+    if suffix == ".png":
+        return "image/png"
+    if suffix == ".svg":
+        return "image/svg+xml"
+    if suffix == ".webp":
+        return "image/webp"
+    return "image/jpeg"
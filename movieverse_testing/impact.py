@@ -0,0 +1,354 @@
+"""
+🎯 ANÁLISIS DE IMPACTO - MOVIEVERSE TESTING
+===========================================
+
+Si solo cambió src/pages/TVSeriesDetailPage.tsx no hace falta correr los
+tests de la home. Con --impact-record cada test guarda en
+.cache/impact-map.json:
+
+- files       módulos de src/ que ejecutó (cobertura precisa de V8 por CDP)
+- routes      rutas de App.tsx que visitó (framenavigated, también las de la SPA)
+- endpoints   endpoints de TMDB que pidió (movie/{id}/videos...)
+- opaque      cargó JavaScript que no se pudo atribuir a un archivo de src/
+
+Después, --impacted-by=REF compara el árbol con REF (git diff) y
+deselecciona los tests a los que no afecta ningún cambio:
+
+- un test de un archivo test_*.py cambiado → se ejecuta
+- un módulo de src/ cambiado → los tests que lo ejecutaron
+- una página (src/pages/) → además, los que visitaron su ruta
+- una respuesta de fixtures/tmdb/ cambiada → los que piden ese endpoint
+- package.json, vite.config.ts, conftest.py, movieverse_testing/... → todos
+- un archivo de src/ que no aparece en el mapa → todos (mejor de más)
+- los tests que no están en el mapa (nuevos) → siempre
+
+La cobertura sale archivo a archivo con el servidor de Vite (--app-server=dev
+o external), que sirve cada módulo por separado. Con la build de dist/ solo
+se reconocen los chunks de las páginas (HomePage-abc123.js); el resto del
+bundle marca el test como opaque y cualquier cambio fuera de src/pages/ lo
+selecciona. En Firefox/WebKit no hay CDP: cuentan las rutas y los endpoints.
+
+Uso:
+    pytest --impact-record --app-server=dev        # de vez en cuando (o en CI)
+    pytest --impacted-by=main                      # solo lo afectado
+    python -m movieverse_testing.impact main       # qué se ejecutaría y por qué
+"""
+
+import argparse
+import fnmatch
+import gzip
+import json
+import re
+import subprocess
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from movieverse_testing.budgets import current_commit
+from movieverse_testing.locks import file_lock
+from movieverse_testing.profiles import supports_throttling
+from movieverse_testing.routes import route_for_path
+from movieverse_testing.tmdb_audit import TMDB_API_PREFIX
+from movieverse_testing.tmdb_replay import normalize_request, path_template
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_IMPACT_MAP = PROJECT_ROOT / ".cache" / "impact-map.json"
+
+APP_FILE = PROJECT_ROOT / "src" / "App.tsx"
+
+# Cambios que afectan a todos los tests
+GLOBAL_PATTERNS = (
+    "index.html",
+    "package.json",
+    "package-lock.json",
+    "vite.config.ts",
+    "tsconfig*.json",
+    "public/*",
+    "conftest.py",
+    "pytest.ini",
+    "performance_budgets.json",
+    "movieverse_testing/*",
+)
+
+# Archivos solo de tipos: TypeScript los borra y no llegan al navegador
+TYPE_ONLY_SUFFIXES = (".types.ts", ".d.ts")
+
+# Respuestas grabadas de TMDB: un cambio afecta a quien pida ese endpoint
+FIXTURE_FILES = ("fixtures/tmdb/replay.json", "fixtures/tmdb/recorded.json.gz")
+
+_LAZY_PAGE = re.compile(r"const (\w+) = React\.lazy\(\(\) => import\('\./([\w/]+)'\)\)")
+_ROUTE = re.compile(r'<Route path="([^"]+)" element=\{<(\w+) />\}')
+
+
+@lru_cache(maxsize=None)
+def route_pages(app_file=APP_FILE):
+    """Ruta de App.tsx → archivo de su página ("/tv/:id" → "src/pages/TVSeriesDetailPage.tsx")"""
+    source = Path(app_file).read_text(encoding="utf-8")
+    modules = {}
+    for component, module in _LAZY_PAGE.findall(source):
+        for suffix in (".tsx", ".ts"):
+            candidate = Path(app_file).parent / f"{module}{suffix}"
+            if candidate.exists():
+                modules[component] = candidate.relative_to(PROJECT_ROOT).as_posix()
+                break
+    return {route: modules[component] for route, component in _ROUTE.findall(source) if component in modules}
+
+
+def source_file(url):
+    """
+    Archivo de src/ que sirve una URL de script, o None.
+
+    Vite dev:  http://localhost:5173/src/pages/HomePage.tsx?t=123 → src/pages/HomePage.tsx
+    dist/:     http://localhost:4173/assets/HomePage-abc123.js    → src/pages/HomePage.tsx
+    """
+    path = unquote(urlsplit(url).path).lstrip("/")
+    if path.startswith("src/"):
+        return path
+    if path.startswith("assets/"):
+        chunk = Path(path).stem.rsplit("-", 1)[0]
+        for page in route_pages().values():
+            if Path(page).stem == chunk:
+                return page
+    return None
+
+
+def is_app_chunk(url):
+    """True si la URL es un chunk de la build (dist/assets/*.js)"""
+    path = urlsplit(url).path
+    return path.startswith("/assets/") and path.endswith(".js")
+
+
+class ImpactTracker:
+    """
+    Lo que toca un test: módulos ejecutados, rutas y endpoints de TMDB.
+
+    attach() en cada página del test y finish() antes de cerrarlas. La
+    cobertura precisa de V8 se acumula entre navegaciones de la misma página.
+    """
+
+    def __init__(self):
+        self.files = set()
+        self.routes = set()
+        self.endpoints = set()
+        self.opaque = False
+        self._sessions = []
+
+    def attach(self, page):
+        page.on("framenavigated", lambda frame: self._on_navigated(page, frame))
+        page.on("request", lambda request: self.record_request(request.url))
+        if not supports_throttling(page):
+            # Sin cobertura no se sabe qué ejecutó: solo rutas y endpoints
+            self.opaque = True
+            return
+        session = page.context.new_cdp_session(page)
+        session.send("Profiler.enable")
+        session.send("Profiler.startPreciseCoverage", {"callCount": False, "detailed": False})
+        self._sessions.append((page, session))
+
+    def _on_navigated(self, page, frame):
+        if frame == page.main_frame:
+            self.record_navigation(frame.url)
+
+    def record_navigation(self, url):
+        route = route_for_path(urlsplit(url).path or "/")
+        if route is not None:
+            self.routes.add(route)
+
+    def record_request(self, url):
+        if url.startswith(TMDB_API_PREFIX):
+            self.endpoints.add(path_template(normalize_request(url)[0]))
+
+    def add_coverage(self, scripts):
+        """Añade el resultado de Profiler.takePreciseCoverage"""
+        for script in scripts:
+            if not any(function["ranges"][0]["count"] > 0 for function in script["functions"]):
+                continue
+            path = source_file(script["url"])
+            if path is not None:
+                self.files.add(path)
+            elif is_app_chunk(script["url"]):
+                self.opaque = True
+
+    def finish(self):
+        """Recoge la cobertura de las páginas que siguen abiertas"""
+        for page, session in self._sessions:
+            if page.is_closed():
+                continue
+            self.add_coverage(session.send("Profiler.takePreciseCoverage")["result"])
+            session.detach()
+        self._sessions.clear()
+
+    def entry(self):
+        """Entrada del mapa para este test"""
+        pages = route_pages()
+        files = self.files | {pages[route] for route in self.routes if route in pages}
+        return {
+            "files": sorted(files),
+            "routes": sorted(self.routes),
+            "endpoints": sorted(self.endpoints),
+            "opaque": self.opaque,
+        }
+
+
+@dataclass
+class ChangeSet:
+    """Archivos cambiados frente a una referencia y endpoints de TMDB afectados"""
+
+    ref: str
+    files: list
+    endpoints: set = field(default_factory=set)
+
+    @classmethod
+    def from_git(cls, ref):
+        files = sorted(set(_git("diff", "--name-only", "--relative", ref).splitlines())
+                       | set(_git("ls-files", "--others", "--exclude-standard").splitlines()))
+        endpoints = set()
+        for path in FIXTURE_FILES:
+            if path in files:
+                endpoints |= changed_endpoints(_fixture_entries(path, _git_show(ref, path)),
+                                               _fixture_entries(path, _read(path)))
+        return cls(ref, files, endpoints)
+
+
+def _git(*args):
+    result = subprocess.run(["git", *args], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} falló: {result.stderr.strip()}")
+    return result.stdout
+
+
+def _git_show(ref, path):
+    result = subprocess.run(["git", "show", f"{ref}:{path}"], cwd=PROJECT_ROOT, capture_output=True)
+    return result.stdout if result.returncode == 0 else None
+
+
+def _read(path):
+    full_path = PROJECT_ROOT / path
+    return full_path.read_bytes() if full_path.exists() else None
+
+
+def _fixture_entries(path, data):
+    """Clave → contenido (o hash) de un archivo de respuestas grabadas"""
+    if data is None:
+        return {}
+    if path.endswith(".gz"):
+        return {key: entry["hash"] for key, entry in json.loads(gzip.decompress(data))["index"].items()}
+    return json.loads(data)["entries"]
+
+
+def changed_endpoints(old_entries, new_entries):
+    """Endpoints (con comodines) cuyas respuestas grabadas cambiaron, aparecieron o desaparecieron"""
+    keys = {key for key in old_entries.keys() | new_entries.keys()
+            if old_entries.get(key) != new_entries.get(key)}
+    return {path_template(key.split("?", 1)[0]) for key in keys}
+
+
+class ImpactMap:
+    """nodeid → archivos, rutas y endpoints que usó el test"""
+
+    def __init__(self, tests=None, commit=None):
+        self.tests = dict(tests or {})
+        self.commit = commit
+
+    @classmethod
+    def load(cls, path=DEFAULT_IMPACT_MAP):
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(data["tests"], data.get("commit"))
+
+    def __len__(self):
+        return len(self.tests)
+
+    def record(self, nodeid, entry):
+        self.tests[nodeid] = entry
+
+    def save(self, path=DEFAULT_IMPACT_MAP):
+        """Mezcla con el mapa de disco (los workers de xdist guardan cada uno lo suyo)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(path.with_name(path.name + ".lock")):
+            merged = ImpactMap.load(path)
+            merged.tests.update(self.tests)
+            data = {"commit": current_commit(), "recorded_at": time.time(), "tests": merged.tests}
+            path.write_text(json.dumps(data, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+
+    def known_files(self):
+        files = set(route_pages().values())
+        for entry in self.tests.values():
+            files.update(entry["files"])
+        return files
+
+    def global_reason(self, changes):
+        """Motivo para ejecutar todo, o None si se puede seleccionar"""
+        known = self.known_files()
+        for path in changes.files:
+            if any(fnmatch.fnmatchcase(path, pattern) for pattern in GLOBAL_PATTERNS):
+                return f"{path} afecta a todos los tests"
+            if path.startswith("src/") and path not in known and not path.endswith(TYPE_ONLY_SUFFIXES):
+                return f"{path} no aparece en el mapa de impacto"
+        return None
+
+    def reason(self, nodeid, changes):
+        """Por qué el cambio afecta al test (None si no le afecta)"""
+        entry = self.tests.get(nodeid)
+        if entry is None:
+            return "test nuevo (no está en el mapa)"
+        test_file = nodeid.split("::", 1)[0]
+        pages = set(route_pages().values())
+        for path in changes.files:
+            if path == test_file:
+                return f"cambió {path}"
+            if not path.startswith("src/") or path.endswith(TYPE_ONLY_SUFFIXES):
+                continue
+            if path in entry["files"]:
+                return f"usa {path}"
+            if entry["opaque"] and path not in pages:
+                return f"{path} puede estar en el bundle que cargó"
+        endpoints = changes.endpoints.intersection(entry["endpoints"])
+        if endpoints:
+            return f"pide {', '.join(sorted(endpoints))}"
+        return None
+
+    def select(self, nodeids, changes):
+        """
+        Devuelve (seleccionados, motivos) para una lista de nodeids.
+
+        motivos: nodeid → por qué se ejecuta.
+        """
+        everything = self.global_reason(changes)
+        if everything is not None:
+            return list(nodeids), {nodeid: everything for nodeid in nodeids}
+        reasons = {}
+        for nodeid in nodeids:
+            reason = self.reason(nodeid, changes)
+            if reason is not None:
+                reasons[nodeid] = reason
+        return [nodeid for nodeid in nodeids if nodeid in reasons], reasons
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tests afectados por los cambios frente a una referencia de git")
+    parser.add_argument("ref", nargs="?", default="HEAD", help="Commit o rama con la que comparar")
+    parser.add_argument("--map", type=Path, default=DEFAULT_IMPACT_MAP)
+    args = parser.parse_args(argv)
+
+    impact_map = ImpactMap.load(args.map)
+    if not impact_map:
+        print(f"No hay mapa de impacto en {args.map}: ejecuta antes pytest --impact-record")
+        return 1
+    changes = ChangeSet.from_git(args.ref)
+    print(f"{len(changes.files)} archivos cambiados frente a {args.ref} (mapa grabado en {impact_map.commit})")
+    selected, reasons = impact_map.select(sorted(impact_map.tests), changes)
+    for nodeid in selected:
+        print(f"  {nodeid}  ← {reasons[nodeid]}")
+    print(f"{len(selected)} de {len(impact_map)} tests afectados")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,275 @@
+"""
+🧠 FUGAS DE MEMORIA - MOVIEVERSE TESTING
+========================================
+
+Tras un rato navegando, la pestaña de MovieVerse pesa cada vez más:
+timelines de GSAP sin kill(), instancias de Swiper sin destroy(), iframes
+del BackgroundTrailer o listeners que nadie quita. Una carga limpia por
+test (page.goto) nunca lo ve: la fuga solo aparece al moverse por la SPA.
+
+detect_leaks() recorre varias veces un ciclo de rutas sin recargar
+(history.pushState + popstate, como un <Link> del router) y al final de
+cada ciclo, tras forzar el GC (HeapProfiler.collectGarbage):
+
+- heap usado y retenido (Performance.getMetrics, heap snapshot)
+- nodos DOM, documentos (iframes) y listeners vivos
+- nodos DOM desconectados (detached) y constructores que más crecen,
+  comparando el snapshot del primer ciclo medido con el del último
+
+El primer ciclo es de calentamiento (cachés de React Query, chunks lazy) y
+no cuenta. Lo que importa es el crecimiento por ciclo: en una SPA sin
+fugas, volver al mismo sitio deja la memoria igual.
+
+Los límites por ruta están en performance_budgets.json, sección "leaks".
+Solo Chromium (CDP). Uso:
+    pytest test_fugas_memoria.py --leaks --leak-cycles=8
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from movieverse_testing.budgets import DEFAULT_BUDGETS, Budgets
+from movieverse_testing.profiles import supports_throttling
+from movieverse_testing.routes import sample_url
+from movieverse_testing.waits import wait_for_app_ready
+
+# Ciclos medidos (sin contar el de calentamiento)
+DEFAULT_CYCLES = 5
+WARMUP_CYCLES = 1
+
+# home → película → serie → búsqueda → home
+JOURNEY = ["/", sample_url("/movie/:id"), sample_url("/tv/:id"), sample_url("/search"), "/"]
+
+# Navegación de la SPA sin recarga: lo mismo que hace el router al pulsar un <Link>
+SPA_NAVIGATE_SCRIPT = """
+async (path) => {
+  history.pushState({}, '', path);
+  dispatchEvent(new PopStateEvent('popstate', { state: history.state }));
+  // Dejar que React pinte la ruta nueva antes de esperar a que esté lista
+  await new Promise((resolve) => requestAnimationFrame(() => setTimeout(resolve)));
+}
+"""
+
+# Métricas de Performance.getMetrics que se guardan en cada muestra
+_PERFORMANCE_METRICS = {
+    "JSHeapUsedSize": "heap_used",
+    "JSEventListeners": "listeners",
+    "Nodes": "dom_nodes",
+    "Documents": "documents",
+}
+
+
+def spa_navigate(page, path, **ready_kwargs):
+    """Cambia de ruta dentro de la SPA (sin recargar) y espera a que esté lista"""
+    page.evaluate(SPA_NAVIGATE_SCRIPT, path)
+    wait_for_app_ready(page, **ready_kwargs)
+
+
+@dataclass
+class HeapSummary:
+    """Resumen de un heap snapshot de V8"""
+
+    total_size: int
+    objects: int
+    detached_nodes: int
+    constructors: dict = field(default_factory=dict)  # nombre → [instancias, bytes]
+
+
+def summarize_snapshot(snapshot):
+    """
+    Resume el JSON de HeapProfiler.takeHeapSnapshot.
+
+    Los nodos DOM desconectados se reconocen por el campo "detachedness"
+    (2 = detached, V8 reciente) o por el prefijo "Detached " del nombre.
+    """
+    meta = snapshot["snapshot"]["meta"]
+    fields = meta["node_fields"]
+    type_names = meta["node_types"][0]
+    strings = snapshot["strings"]
+    nodes = snapshot["nodes"]
+    stride = len(fields)
+
+    types = nodes[fields.index("type")::stride]
+    names = nodes[fields.index("name")::stride]
+    sizes = nodes[fields.index("self_size")::stride]
+    if "detachedness" in fields:
+        detachedness = nodes[fields.index("detachedness")::stride]
+    else:
+        detachedness = [2 if strings[name].startswith("Detached ") else 0 for name in names]
+
+    constructors = {}
+    detached = 0
+    for node_type, name, size, state in zip(types, names, sizes, detachedness):
+        if type_names[node_type] not in ("object", "closure", "native"):
+            continue
+        if state == 2:
+            detached += 1
+        entry = constructors.setdefault(strings[name], [0, 0])
+        entry[0] += 1
+        entry[1] += size
+    return HeapSummary(sum(sizes), len(types), detached, constructors)
+
+
+def take_heap_snapshot(session):
+    """Heap snapshot completo (los trozos llegan como eventos antes de la respuesta)"""
+    chunks = []
+
+    def on_chunk(params):
+        chunks.append(params["chunk"])
+
+    session.on("HeapProfiler.addHeapSnapshotChunk", on_chunk)
+    try:
+        session.send("HeapProfiler.takeHeapSnapshot", {"reportProgress": False})
+    finally:
+        session.remove_listener("HeapProfiler.addHeapSnapshotChunk", on_chunk)
+    return json.loads("".join(chunks))
+
+
+@dataclass
+class LeakSample:
+    """Estado de la página al final de un ciclo, después del GC"""
+
+    cycle: int
+    heap_used: float
+    listeners: float
+    dom_nodes: float
+    documents: float
+    heap: HeapSummary = None
+
+
+def _slope(values):
+    """Pendiente por mínimos cuadrados (crecimiento por ciclo)"""
+    count = len(values)
+    if count < 2:
+        return 0.0
+    mean_x = (count - 1) / 2
+    mean_y = sum(values) / count
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+    denominator = sum((x - mean_x) ** 2 for x in range(count))
+    return numerator / denominator
+
+
+@dataclass
+class LeakReport:
+    """Muestras de los ciclos medidos y crecimiento por ciclo"""
+
+    route: str
+    paths: list
+    samples: list = field(default_factory=list)
+
+    @property
+    def heap_growth_bytes(self):
+        return _slope([sample.heap_used for sample in self.samples])
+
+    @property
+    def listener_growth(self):
+        return _slope([sample.listeners for sample in self.samples])
+
+    @property
+    def dom_node_growth(self):
+        return _slope([sample.dom_nodes for sample in self.samples])
+
+    @property
+    def document_growth(self):
+        return _slope([sample.documents for sample in self.samples])
+
+    def _snapshots(self):
+        snapshots = [sample for sample in self.samples if sample.heap is not None]
+        if len(snapshots) < 2:
+            return None
+        return snapshots[0], snapshots[-1]
+
+    @property
+    def retained_growth_bytes(self):
+        """Crecimiento por ciclo del tamaño total del heap snapshot (None sin snapshots)"""
+        pair = self._snapshots()
+        if pair is None:
+            return None
+        first, last = pair
+        return (last.heap.total_size - first.heap.total_size) / (last.cycle - first.cycle)
+
+    @property
+    def detached_node_growth(self):
+        pair = self._snapshots()
+        if pair is None:
+            return None
+        first, last = pair
+        return (last.heap.detached_nodes - first.heap.detached_nodes) / (last.cycle - first.cycle)
+
+    def top_constructors(self, count=5):
+        """Constructores que más crecen: [(nombre, instancias/ciclo, bytes/ciclo)]"""
+        pair = self._snapshots()
+        if pair is None:
+            return []
+        first, last = pair
+        cycles = last.cycle - first.cycle
+        growth = []
+        for name, (instances, size) in last.heap.constructors.items():
+            before_instances, before_size = first.heap.constructors.get(name, (0, 0))
+            if instances > before_instances:
+                growth.append((name, (instances - before_instances) / cycles, (size - before_size) / cycles))
+        return sorted(growth, key=lambda item: item[2], reverse=True)[:count]
+
+    def lines(self):
+        """Tabla de texto: un ciclo por línea, crecimiento y constructores sospechosos"""
+        lines = [f"{self.route}: {' → '.join(self.paths)}",
+                 f"{'ciclo':>6}{'heap':>10}{'listeners':>11}{'nodos':>8}{'docs':>6}{'detached':>10}"]
+        for sample in self.samples:
+            detached = sample.heap.detached_nodes if sample.heap is not None else "-"
+            lines.append(f"{sample.cycle:>6}{sample.heap_used / 1e6:>8.1f}MB{sample.listeners:>11.0f}"
+                         f"{sample.dom_nodes:>8.0f}{sample.documents:>6.0f}{detached:>10}")
+        lines.append(
+            f"Por ciclo: heap {self.heap_growth_bytes / 1024:+.0f}KB, listeners {self.listener_growth:+.1f}, "
+            f"nodos {self.dom_node_growth:+.1f}, documentos {self.document_growth:+.1f}"
+            + (f", detached {self.detached_node_growth:+.1f}" if self.detached_node_growth is not None else "")
+        )
+        for name, instances, size in self.top_constructors():
+            lines.append(f"  {name:<40} {instances:+.1f}/ciclo {size / 1024:+.1f}KB/ciclo")
+        return lines
+
+
+def _measure(session, cycle, snapshot):
+    # Dos pasadas: la primera puede dejar objetos con finalizadores pendientes
+    session.send("HeapProfiler.collectGarbage")
+    session.send("HeapProfiler.collectGarbage")
+    metrics = {item["name"]: item["value"] for item in session.send("Performance.getMetrics")["metrics"]}
+    values = {field_name: metrics.get(name, 0) for name, field_name in _PERFORMANCE_METRICS.items()}
+    heap = summarize_snapshot(take_heap_snapshot(session)) if snapshot else None
+    return LeakSample(cycle, heap=heap, **values)
+
+
+def detect_leaks(page, base_url, paths, route=None, cycles=DEFAULT_CYCLES, warmup=WARMUP_CYCLES,
+                 snapshots=True, **ready_kwargs):
+    """
+    Recorre paths (el primero es el punto de partida) warmup + cycles veces.
+
+    Cada ciclo navega por paths[1:] dentro de la SPA; conviene que acabe
+    donde empezó. Con snapshots=True se toma un heap snapshot en el primer
+    y el último ciclo medido (nodos detached y constructores que crecen).
+    """
+    if not supports_throttling(page):
+        raise RuntimeError("La detección de fugas necesita Chromium (CDP)")
+    report = LeakReport(route or paths[0], list(paths))
+    session = page.context.new_cdp_session(page)
+    try:
+        session.send("Performance.enable")
+        session.send("HeapProfiler.enable")
+        page.goto(f"{base_url}{paths[0]}", timeout=ready_kwargs.get("timeout"))
+        wait_for_app_ready(page, **ready_kwargs)
+        for cycle in range(warmup + cycles):
+            for path in paths[1:]:
+                spa_navigate(page, path, **ready_kwargs)
+            if cycle < warmup:
+                continue
+            snapshot = snapshots and cycle in (warmup, warmup + cycles - 1)
+            report.samples.append(_measure(session, cycle, snapshot))
+    finally:
+        session.detach()
+    return report
+
+
+def load_leak_budgets(path=DEFAULT_BUDGETS):
+    """Límites de crecimiento por ciclo (sección "leaks" de performance_budgets.json)"""
+    data = json.loads(Path(path).read_text(encoding="utf-8")).get("leaks", {})
+    return Budgets(data.get("default", {}), data.get("routes", {}))
@@ -0,0 +1,273 @@
+"""
+👥 CARGA CON VARIOS USUARIOS - MOVIEVERSE TESTING
+=================================================
+
+Lanza N usuarios a la vez, cada uno en su propio BrowserContext, repitiendo
+el recorrido del ejercicio 10 (test_flujo_completo_descubrimiento_pelicula):
+
+    home → tendencias → detalle → tráiler → búsqueda
+
+Usa la API async de Playwright: un solo proceso de Python y uno o varios
+navegadores (--browsers) con muchos contextos, así escala a decenas de
+usuarios en una máquina. Mide cada paso como lo percibe el usuario (desde
+la acción hasta que la app está lista) y reporta p50/p95/p99 por paso y el
+throughput.
+
+Uso:
+    python -m movieverse_testing.load --users 20 --iterations 3
+    python -m movieverse_testing.load --users 40 --app-server dist --tmdb replay --tmdb-images placeholder
+
+Con la API real de TMDB, muchos usuarios chocan con su rate limit: para
+medir la app y no a TMDB usa --tmdb replay.
+"""
+
+import argparse
+import asyncio
+import math
+import re
+import time
+from dataclasses import dataclass, field
+
+from movieverse_testing.fixture_store import replay_index
+from movieverse_testing.images import IMAGE_URL_PATTERNS, ImageStubber
+from movieverse_testing.server import SERVER_MODES, AppServer
+from movieverse_testing.tmdb_replay import TMDB_URL_PATTERN
+from movieverse_testing.waits import (
+    DEFAULT_TIMEOUT,
+    READINESS_SCRIPT,
+    READY_CONDITION,
+    ready_condition_arg,
+)
+
+# Pasos del recorrido en orden (también el orden del reporte)
+JOURNEY_STEPS = ("home", "tendencias", "detalle", "trailer", "busqueda")
+
+# Percentiles del reporte
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values, p):
+    """
+    Percentil p (0-100) con interpolación lineal entre posiciones,
+    igual que numpy.percentile por defecto. None si no hay valores.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * p / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return ordered[lower]
+    weight = position - lower
+    return ordered[lower] * (1 - weight) + ordered[upper] * weight
+
+
+@dataclass
+class LoadReport:
+    """Duraciones por paso (ms), errores y tiempo total de una ejecución"""
+
+    users: int
+    samples: dict = field(default_factory=dict)
+    errors: dict = field(default_factory=dict)
+    journeys: int = 0
+    wall_clock: float = 0.0
+
+    def add(self, step, duration_ms):
+        self.samples.setdefault(step, []).append(duration_ms)
+
+    def add_error(self, step, error):
+        self.errors.setdefault(step, []).append(f"{type(error).__name__}: {error}".splitlines()[0])
+
+    @property
+    def steps(self):
+        return sum(len(durations) for durations in self.samples.values())
+
+    def throughput(self):
+        """(recorridos/s, pasos/s) completados"""
+        if self.wall_clock <= 0:
+            return 0.0, 0.0
+        return self.journeys / self.wall_clock, self.steps / self.wall_clock
+
+    def lines(self):
+        """Tabla de texto: un paso por línea con percentiles y errores"""
+        header = f"{'paso':<12}{'n':>6}" + "".join(f"{'p' + str(p):>10}" for p in PERCENTILES) + f"{'errores':>10}"
+        lines = [header]
+        for step in JOURNEY_STEPS:
+            durations = self.samples.get(step, [])
+            cells = "".join(_format_ms(percentile(durations, p)) for p in PERCENTILES)
+            lines.append(f"{step:<12}{len(durations):>6}{cells}{len(self.errors.get(step, [])):>10}")
+        journeys_per_s, steps_per_s = self.throughput()
+        lines.append(
+            f"{self.users} usuarios, {self.journeys} recorridos completos en {self.wall_clock:.1f}s: "
+            f"{journeys_per_s:.2f} recorridos/s, {steps_per_s:.2f} pasos/s"
+        )
+        for step, messages in self.errors.items():
+            lines.append(f"Primer error en {step}: {messages[0]}")
+        return lines
+
+
+def _format_ms(value):
+    return f"{'-':>10}" if value is None else f"{value:>8.0f}ms"
+
+
+# ============================================================================
+# Recorrido (API async)
+# ============================================================================
+
+async def _wait_ready(page, heading="h1", timeout=DEFAULT_TIMEOUT):
+    await page.wait_for_function(
+        READY_CONDITION,
+        arg=ready_condition_arg(heading=heading),
+        timeout=timeout,
+    )
+
+
+async def _step_home(page, base_url):
+    await page.goto(base_url)
+    await _wait_ready(page)
+
+
+async def _step_trending(page, base_url):
+    previous = page.url
+    await page.get_by_text("Tendencias").first.click()
+    await page.wait_for_function("previous => location.href !== previous", arg=previous)
+    await _wait_ready(page)
+
+
+async def _step_detail(page, base_url):
+    await page.locator("img").first.click()
+    await page.wait_for_url(re.compile(r".*/movie/\d+"))
+    await _wait_ready(page)
+
+
+async def _step_trailer(page, base_url):
+    button = page.get_by_text("Ver tráiler").first
+    if not await button.is_visible():
+        return
+    await button.click()
+    await page.locator('iframe[src*="youtube"]').first.wait_for(state="visible")
+    await page.keyboard.press("Escape")
+
+
+async def _step_search(page, base_url):
+    search = page.locator('input[placeholder*="Buscar"]').first
+    await search.fill("Avengers")
+    await search.press("Enter")
+    await page.wait_for_url(re.compile(r".*/search.*"))
+    await _wait_ready(page)
+
+
+_STEP_FUNCTIONS = {
+    "home": _step_home,
+    "tendencias": _step_trending,
+    "detalle": _step_detail,
+    "trailer": _step_trailer,
+    "busqueda": _step_search,
+}
+
+
+async def _prepare_context(context, tmdb_replay, tmdb_images):
+    await context.add_init_script(READINESS_SCRIPT)
+    if tmdb_replay is not None:
+        await context.route(TMDB_URL_PATTERN, tmdb_replay.route_handler)
+    if tmdb_images is not None and tmdb_images.mode != "live":
+        for pattern in IMAGE_URL_PATTERNS:
+            await context.route(pattern, tmdb_images.route_handler)
+
+
+async def _user(browser, base_url, report, iterations, start_delay, tmdb_replay, tmdb_images):
+    """Un usuario: su contexto, iterations recorridos completos"""
+    await asyncio.sleep(start_delay)
+    context = await browser.new_context()
+    await _prepare_context(context, tmdb_replay, tmdb_images)
+    try:
+        for _ in range(iterations):
+            page = await context.new_page()
+            try:
+                for step in JOURNEY_STEPS:
+                    started = time.perf_counter()
+                    try:
+                        await _STEP_FUNCTIONS[step](page, base_url)
+                    except Exception as error:
+                        # Un paso roto invalida el resto del recorrido
+                        report.add_error(step, error)
+                        break
+                    report.add(step, (time.perf_counter() - started) * 1000)
+                else:
+                    report.journeys += 1
+            finally:
+                await page.close()
+    finally:
+        await context.close()
+
+
+async def run_load(base_url, users, iterations=1, ramp_up=0.0, browsers=1, headless=True,
+                   tmdb_replay=None, tmdb_images=None):
+    """
+    Ejecuta la carga y devuelve un LoadReport.
+
+    - users: contextos concurrentes (un usuario cada uno)
+    - iterations: recorridos completos por usuario
+    - ramp_up: segundos para repartir el arranque de los usuarios
+    - browsers: procesos de navegador entre los que se reparten los contextos
+    """
+    from playwright.async_api import async_playwright
+
+    report = LoadReport(users=users)
+    async with async_playwright() as playwright:
+        launched = [await playwright.chromium.launch(headless=headless) for _ in range(browsers)]
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(
+                _user(
+                    launched[index % browsers],
+                    base_url,
+                    report,
+                    iterations,
+                    ramp_up * index / users,
+                    tmdb_replay,
+                    tmdb_images,
+                )
+                for index in range(users)
+            ))
+        finally:
+            report.wall_clock = time.perf_counter() - started
+            for browser in launched:
+                await browser.close()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Carga con varios usuarios simultáneos sobre MovieVerse")
+    parser.add_argument("--users", type=int, default=10, help="Usuarios (contextos) simultáneos")
+    parser.add_argument("--iterations", type=int, default=1, help="Recorridos por usuario")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Segundos para arrancar a todos los usuarios")
+    parser.add_argument("--browsers", type=int, default=1, help="Procesos de navegador")
+    parser.add_argument("--headed", action="store_true", help="Mostrar los navegadores")
+    parser.add_argument("--app-server", default="external", choices=SERVER_MODES)
+    parser.add_argument("--tmdb", default="live", choices=("live", "replay"))
+    parser.add_argument("--tmdb-images", default="live", choices=("live", "placeholder", "block"))
+    args = parser.parse_args(argv)
+
+    server = AppServer(args.app_server)
+    url = server.start()
+    try:
+        report = asyncio.run(run_load(
+            url,
+            args.users,
+            iterations=args.iterations,
+            ramp_up=args.ramp_up,
+            browsers=args.browsers,
+            headless=not args.headed,
+            tmdb_replay=replay_index() if args.tmdb == "replay" else None,
+            tmdb_images=ImageStubber(args.tmdb_images),
+        ))
+    finally:
+        server.stop()
+    print("\n".join(report.lines()))
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+"""
+🔒 BLOQUEOS ENTRE PROCESOS - MOVIEVERSE TESTING
+===============================================
+
+Los workers de xdist (y varias ejecuciones a la vez) comparten archivos
+en .cache/ y fixtures/: el almacén de TMDB, el índice de baselines
+visuales, el mapa de impacto o la build de dist/. file_lock() serializa
+quién escribe, sin dependencias y en cualquier sistema de archivos local.
+
+Uso:
+    with file_lock(path.with_name(path.name + ".lock")):
+        ...leer, mezclar y escribir path...
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+@contextmanager
+def file_lock(lock_path, timeout=30, stale_after=None):
+    """
+    Bloqueo entre procesos con un archivo creado con O_EXCL.
+
+    El archivo guarda "pid timestamp" del dueño: si ese proceso ya no
+    existe o el bloqueo tiene más de stale_after segundos (por defecto
+    timeout; un worker que murió con SIGKILL no llega a borrarlo), se
+    rompe en lugar de esperar para siempre.
+    """
+    lock_path = Path(lock_path)
+    stale_after = timeout if stale_after is None else stale_after
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            descriptor = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            if _break_stale_lock(lock_path, stale_after):
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"No se pudo bloquear {lock_path}") from None
+            time.sleep(0.05)
+    owner = (os.getpid(), time.time())
+    try:
+        os.write(descriptor, f"{owner[0]} {owner[1]!r}".encode("ascii"))
+        yield
+    finally:
+        os.close(descriptor)
+        # Si otro lo rompió por caducado, el archivo ya no es nuestro
+        if _lock_owner(lock_path) == owner:
+            lock_path.unlink(missing_ok=True)
+
+
+def _lock_owner(lock_path):
+    """(pid, timestamp) escritos en el bloqueo; (None, mtime) si aún está vacío"""
+    try:
+        content = lock_path.read_text(encoding="ascii").split()
+        if len(content) == 2:
+            return int(content[0]), float(content[1])
+        return None, lock_path.stat().st_mtime
+    except (FileNotFoundError, ValueError):
+        return None, None
+
+
+def _pid_alive(pid):
+    if os.name != "posix":
+        return True        # os.kill(pid, 0) no es una consulta en Windows
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _break_stale_lock(lock_path, stale_after):
+    """
+    Rompe el bloqueo si su dueño murió o caducó. True si lo rompió.
+
+    Se renombra antes de borrarlo; si entre la lectura y el rename otro
+    proceso lo rompió y tomó uno nuevo, el contenido no coincide y se
+    devuelve a su sitio.
+    """
+    pid, created = _lock_owner(lock_path)
+    if created is None:
+        return False
+    expired = time.time() - created > stale_after
+    if not expired and (pid is None or _pid_alive(pid)):
+        return False
+    stale = lock_path.with_name(f"{lock_path.name}.stale-{os.getpid()}")
+    try:
+        os.replace(lock_path, stale)
+    except FileNotFoundError:
+        return True
+    if _lock_owner(stale) != (pid, created):
+        try:
+            os.link(stale, lock_path)
+        except OSError:
+            pass
+    stale.unlink(missing_ok=True)
+    return True
@@ -0,0 +1,213 @@
+"""
+📊 MÉTRICAS DE RENDIMIENTO - MOVIEVERSE TESTING
+===============================================
+
+Medir con time.time() alrededor de page.goto() mezcla la latencia de TMDB,
+la de Playwright y la de la app. Este módulo lee las métricas que el propio
+navegador calcula:
+
+- Navigation Timing: TTFB, DOMContentLoaded, load
+- Paint Timing: FCP
+- LCP (Largest Contentful Paint)
+- CLS (Cumulative Layout Shift, ventana de sesión como Web Vitals)
+- INP (peor interacción) y TBT (tiempo bloqueado por long tasks)
+- Long tasks, peticiones, bytes transferidos y heap de JS
+
+METRICS_SCRIPT se instala con context.add_init_script (conftest.py) para
+que los observers existan desde el primer byte de la página.
+
+Uso:
+    metricas = measure_route(page, BASE_URL, "/trending")
+    assert metricas.lcp < 2500
+"""
+
+from dataclasses import asdict, dataclass, field
+
+from movieverse_testing.waits import wait_for_app_ready, wait_for_url_change
+
+METRICS_SCRIPT = """
+(() => {
+  if (window.__movieverseMetrics) return;
+  const metrics = {
+    lcp: null,
+    cls: 0,
+    longTasks: [],
+    interactions: {},
+  };
+  window.__movieverseMetrics = metrics;
+
+  const observe = (type, callback, options = {}) => {
+    try {
+      new PerformanceObserver((list) => list.getEntries().forEach(callback))
+        .observe({ type, buffered: true, ...options });
+    } catch (error) {
+      // Tipo no soportado por este navegador
+    }
+  };
+
+  observe('largest-contentful-paint', (entry) => {
+    metrics.lcp = entry.renderTime || entry.loadTime || entry.startTime;
+  });
+
+  // CLS: la peor ventana de sesión (huecos < 1s, ventana máxima 5s)
+  let sessionValue = 0;
+  let sessionStart = 0;
+  let sessionLast = 0;
+  observe('layout-shift', (entry) => {
+    if (entry.hadRecentInput) return;
+    const gap = entry.startTime - sessionLast;
+    const length = entry.startTime - sessionStart;
+    if (sessionValue && gap < 1000 && length < 5000) {
+      sessionValue += entry.value;
+    } else {
+      sessionValue = entry.value;
+      sessionStart = entry.startTime;
+    }
+    sessionLast = entry.startTime;
+    metrics.cls = Math.max(metrics.cls, sessionValue);
+  });
+
+  observe('longtask', (entry) => {
+    metrics.longTasks.push({ start: entry.startTime, duration: entry.duration });
+  });
+
+  observe('event', (entry) => {
+    if (!entry.interactionId) return;
+    const previous = metrics.interactions[entry.interactionId] || 0;
+    metrics.interactions[entry.interactionId] = Math.max(previous, entry.duration);
+  }, { durationThreshold: 16 });
+})();
+"""
+
+_COLLECT = """
+() => {
+  const metrics = window.__movieverseMetrics || { lcp: null, cls: 0, longTasks: [], interactions: {} };
+  const navigation = performance.getEntriesByType('navigation')[0];
+  const paints = performance.getEntriesByType('paint');
+  const fcp = paints.find((entry) => entry.name === 'first-contentful-paint');
+  const resources = performance.getEntriesByType('resource');
+
+  const blocking = metrics.longTasks
+    .filter((task) => !fcp || task.start >= fcp.startTime)
+    .reduce((total, task) => total + Math.max(0, task.duration - 50), 0);
+  const interactions = Object.values(metrics.interactions);
+
+  let transfer = navigation ? navigation.transferSize || 0 : 0;
+  for (const resource of resources) transfer += resource.transferSize || 0;
+
+  return {
+    url: location.pathname + location.search,
+    ttfb: navigation ? navigation.responseStart : null,
+    dom_content_loaded: navigation ? navigation.domContentLoadedEventEnd : null,
+    load_event: navigation ? navigation.loadEventEnd : null,
+    fcp: fcp ? fcp.startTime : null,
+    lcp: metrics.lcp,
+    cls: metrics.cls,
+    inp: interactions.length ? Math.max(...interactions) : null,
+    tbt: blocking,
+    long_tasks: metrics.longTasks.length,
+    request_count: resources.length + (navigation ? 1 : 0),
+    tmdb_requests: resources.filter((entry) => entry.name.includes('api.themoviedb.org')).length,
+    transfer_bytes: transfer,
+    js_heap_bytes: performance.memory ? performance.memory.usedJSHeapSize : null,
+    app_ready: window.__movieverseReady && window.__movieverseReady.at !== null
+      ? window.__movieverseReady.at
+      : performance.now(),
+  };
+}
+"""
+
+
+@dataclass
+class PageMetrics:
+    """Métricas de una carga de página (tiempos en ms desde el inicio de la navegación)"""
+
+    route: str
+    url: str
+    ttfb: float = None
+    dom_content_loaded: float = None
+    load_event: float = None
+    fcp: float = None
+    lcp: float = None
+    cls: float = 0.0
+    inp: float = None
+    tbt: float = 0.0
+    long_tasks: int = 0
+    request_count: int = 0
+    tmdb_requests: int = 0
+    transfer_bytes: int = 0
+    js_heap_bytes: int = None
+    app_ready: float = None
+    extra: dict = field(default_factory=dict)
+
+    def to_dict(self):
+        """Diccionario plano (para JSON o comparar con presupuestos)"""
+        return asdict(self)
+
+    def summary(self):
+        """Una línea legible para imprimir en el test"""
+        def ms(value):
+            return "n/a" if value is None else f"{value:.0f}ms"
+
+        heap = "n/a" if self.js_heap_bytes is None else f"{self.js_heap_bytes / 1_048_576:.1f}MB"
+        return (
+            f"{self.route}: listo {ms(self.app_ready)} | TTFB {ms(self.ttfb)} | FCP {ms(self.fcp)} | "
+            f"LCP {ms(self.lcp)} | CLS {self.cls:.3f} | TBT {ms(self.tbt)} | "
+            f"{self.request_count} requests ({self.transfer_bytes / 1024:.0f}KB) | heap {heap}"
+        )
+
+
+def collect_metrics(page, route=None):
+    """Lee las métricas de la página actual"""
+    data = page.evaluate(_COLLECT)
+    return PageMetrics(route=route or data["url"], **data)
+
+
+def measure_route(page, base_url, path, route=None, **ready_kwargs):
+    """
+    Carga path desde cero, espera a que la app esté lista y devuelve sus métricas.
+
+    ready_kwargs se pasan a wait_for_app_ready (heading=None, timeout=...).
+    """
+    page.goto(base_url + path, timeout=ready_kwargs.get("timeout"))
+    wait_for_app_ready(page, **ready_kwargs)
+    return collect_metrics(page, route=route or path)
+
+
+def measure_routes(page, base_url, routes, **ready_kwargs):
+    """Mide varias rutas [(patrón, url)] y devuelve {patrón: PageMetrics}"""
+    return {
+        pattern: measure_route(page, base_url, url, route=pattern, **ready_kwargs)
+        for pattern, url in routes
+    }
+
+
+def measure_navigation(page, action, route=None, **ready_kwargs):
+    """
+    Mide una navegación dentro de la SPA (clic en un enlace, tarjeta...).
+
+    Las métricas de carga (LCP, FCP, TTFB) siguen siendo las de la carga
+    inicial; lo propio de la navegación va en extra:
+    - navigation_ms: desde la acción hasta que la app está lista
+    - tmdb_requests: llamadas a TMDB hechas por la navegación
+    - long_tasks / tbt: long tasks ocurridas durante la navegación
+    """
+    previous_url = page.url
+    before = collect_metrics(page)
+    started = page.evaluate("() => performance.now()")
+    action()
+    wait_for_url_change(page, previous_url)
+    wait_for_app_ready(page, **ready_kwargs)
+    after = collect_metrics(page, route=route)
+    tasks = page.evaluate(
+        "(since) => (window.__movieverseMetrics ? window.__movieverseMetrics.longTasks : [])"
+        ".filter((task) => task.start >= since)",
+        started,
+    )
+    after.extra = {
+        "navigation_ms": after.app_ready - started,
+        "tmdb_requests": after.tmdb_requests - before.tmdb_requests,
+        "long_tasks": len(tasks),
+        "tbt": sum(max(0, task["duration"] - 50) for task in tasks),
+    }
+    return after
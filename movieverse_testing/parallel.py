@@ -0,0 +1,99 @@
+"""
+⚡ EJECUCIÓN EN PARALELO - MOVIEVERSE TESTING
+============================================
+
+Ayudas para correr la suite con pytest-xdist (pytest -n 4):
+
+- worker_id(): nombre del worker actual ("gw0", "gw1"...) o "main"
+- RunTimer: mide el tiempo real de la ejecución y la suma de duraciones
+  de los tests para estimar cuánto se ganó frente a correrlos en serie.
+  También promedia el setup de cada test (abrir navegador/contexto/página),
+  que es lo que ahorra --warm-pool. El ideal (suma/workers) dice cuánto
+  tiempo se pierde por repartir mal (ver scheduling.py).
+"""
+
+import os
+import time
+
+WORKER_ENV = "PYTEST_XDIST_WORKER"
+
+
+def worker_id():
+    """Worker de xdist que ejecuta este proceso ("main" si no hay paralelo)"""
+    return os.environ.get(WORKER_ENV, "main")
+
+
+def is_xdist_worker(config):
+    """True si config pertenece a un worker (no al proceso que coordina)"""
+    return hasattr(config, "workerinput")
+
+
+class RunTimer:
+    """
+    Acumula las duraciones de los tests (setup + call + teardown).
+
+    La suma de duraciones es lo que tardaría la suite en serie; dividida
+    por el tiempo real da el speedup del modo paralelo.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.test_durations = {}
+        self.setup_durations = {}
+
+    def add_report(self, report):
+        """Registra un TestReport de setup, call o teardown"""
+        self.test_durations[report.nodeid] = self.test_durations.get(report.nodeid, 0.0) + report.duration
+        if report.when == "setup":
+            self.setup_durations[report.nodeid] = report.duration
+
+    def pytest_runtest_logreport(self, report):
+        """Hook de pytest (RunTimer se registra como plugin en conftest.py)"""
+        self.add_report(report)
+
+    def stop(self):
+        self.finished = time.perf_counter()
+
+    @property
+    def wall_clock(self):
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+    @property
+    def serial_estimate(self):
+        return sum(self.test_durations.values())
+
+    @property
+    def mean_setup(self):
+        """Setup medio por test en segundos (coste fijo antes de cada test)"""
+        if not self.setup_durations:
+            return 0.0
+        return sum(self.setup_durations.values()) / len(self.setup_durations)
+
+    def ideal_wall_clock(self, workers):
+        """Suma/workers, o el test más largo si dura más: no se puede bajar de ahí"""
+        if not self.test_durations:
+            return 0.0
+        return max(self.serial_estimate / workers, max(self.test_durations.values()))
+
+    @property
+    def speedup(self):
+        wall = self.wall_clock
+        return self.serial_estimate / wall if wall > 0 else 0.0
+
+    def summary_lines(self, workers):
+        """Líneas para el resumen final de pytest"""
+        lines = [
+            f"Workers: {workers}",
+            f"Tests: {len(self.test_durations)}",
+            f"Tiempo real: {self.wall_clock:.1f}s",
+            f"Suma de tests (estimación en serie): {self.serial_estimate:.1f}s",
+            f"Setup medio por test: {self.mean_setup * 1000:.0f}ms",
+        ]
+        if workers != 1:
+            lines.append(f"Speedup frente a serie: x{self.speedup:.2f}")
+            ideal = self.ideal_wall_clock(workers)
+            efficiency = ideal / self.wall_clock if self.wall_clock > 0 else 0.0
+            lines.append(f"Ideal (suma/workers): {ideal:.1f}s, eficiencia del reparto {efficiency:.0%}")
+        return lines
@@ -0,0 +1,106 @@
+"""
+♨️ POOL DE CONTEXTOS CALIENTES - MOVIEVERSE TESTING
+===================================================
+
+Con pytest-playwright cada test crea un contexto nuevo y la primera visita
+descarga otra vez todo el bundle de la SPA, las fuentes y los chunks lazy.
+
+El pool mantiene unos pocos contextos vivos durante toda la sesión. Cada uno
+se "calienta" una vez cargando la app, así su caché HTTP ya tiene el bundle.
+Cada test recibe una página nueva dentro de un contexto caliente y, al
+terminar, el estado se limpia:
+
+- La página del test se cierra: con ella mueren la caché de React Query y
+  cualquier store en memoria, los listeners (page.on) y las rutas
+  (page.route) que haya añadido el test.
+- Se borran cookies, permisos, localStorage y sessionStorage del contexto.
+
+Activación: pytest --warm-pool=2
+
+Los contextos del pool no pasan por el fixture context de pytest-playwright,
+así que --tracing/--video/--screenshot de ese plugin solo aplican sin pool.
+Para medir la mejora, compara "Setup medio por test" del resumen final
+con y sin --warm-pool.
+"""
+
+from movieverse_testing.waits import wait_for_app_ready
+
+# Limpia el almacenamiento del origen de la app antes de cerrar la página
+_CLEAR_STORAGE = """() => {
+  try { window.localStorage.clear(); } catch (error) {}
+  try { window.sessionStorage.clear(); } catch (error) {}
+}"""
+
+
+class ContextPool:
+    """
+    Pool de BrowserContext pre-calentados.
+
+    - browser: navegador de la sesión (fixture browser)
+    - size: número máximo de contextos guardados
+    - prepare: función que instala scripts/rutas en cada contexto nuevo
+    - warm_url: URL que se carga una vez para llenar la caché
+    """
+
+    def __init__(self, browser, size, prepare=None, warm_url=None, context_args=None):
+        self.browser = browser
+        self.size = size
+        self.prepare = prepare
+        self.warm_url = warm_url
+        self.context_args = dict(context_args or {})
+        self._idle = []
+        self.created = 0
+
+    def _new_context(self):
+        context = self.browser.new_context(**self.context_args)
+        if self.prepare is not None:
+            self.prepare(context)
+        if self.warm_url:
+            page = context.new_page()
+            page.goto(self.warm_url)
+            wait_for_app_ready(page, heading=None)
+            page.close()
+        self.created += 1
+        return context
+
+    def warm_up(self):
+        """Crea y calienta todos los contextos del pool de una vez"""
+        while len(self._idle) < self.size:
+            self._idle.append(self._new_context())
+
+    def acquire(self):
+        """Devuelve (context, page): página nueva en un contexto caliente"""
+        context = self._idle.pop() if self._idle else self._new_context()
+        return context, context.new_page()
+
+    def release(self, context, page):
+        """Limpia el estado del test y devuelve el contexto al pool"""
+        try:
+            if not page.is_closed():
+                if self.warm_url and page.url.startswith(self.warm_url):
+                    page.evaluate(_CLEAR_STORAGE)
+                page.close()
+            for leftover in context.pages:
+                leftover.close()
+            context.clear_cookies()
+            context.clear_permissions()
+        except Exception:
+            # Si el contexto quedó roto (crash, navegador cerrado) no se reutiliza
+            self._discard(context)
+            return
+        if len(self._idle) < self.size:
+            self._idle.append(context)
+        else:
+            self._discard(context)
+
+    def close(self):
+        """Cierra todos los contextos guardados"""
+        while self._idle:
+            self._discard(self._idle.pop())
+
+    @staticmethod
+    def _discard(context):
+        try:
+            context.close()
+        except Exception:
+            pass
@@ -0,0 +1,96 @@
+"""
+📱 PERFILES DE DISPOSITIVO - MOVIEVERSE TESTING
+===============================================
+
+Cambiar solo el viewport no dice nada de cómo se comportan las animaciones
+de GSAP, los carruseles de Swiper o el BackgroundTrailer en un móvil
+barato. Cada perfil junta:
+
+- viewport, densidad de píxeles, táctil y móvil (al crear el contexto)
+- red lenta con Network.emulateNetworkConditions (CDP)
+- CPU más lenta con Emulation.setCPUThrottlingRate (CDP)
+
+Los valores siguen los presets de Lighthouse / Chrome DevTools.
+
+La emulación de red y CPU usa CDP, así que solo existe en Chromium; en
+Firefox/WebKit se aplica únicamente el viewport. Las respuestas servidas
+con route.fulfill (--tmdb=replay, --tmdb-images=placeholder) no pasan por
+la red y no se ralentizan.
+
+Uso:
+    pytest test_rendimiento_presupuestos.py --device-profile=movil-3g
+"""
+
+from dataclasses import dataclass
+
+# Espera para wait_for_app_ready con red/CPU lentas (la normal es 15s)
+THROTTLED_TIMEOUT = 60000
+
+
+@dataclass(frozen=True)
+class DeviceProfile:
+    """Dispositivo + red + CPU de un usuario tipo"""
+
+    name: str
+    width: int
+    height: int
+    device_scale_factor: float
+    is_mobile: bool
+    latency_ms: float
+    download_kbps: float
+    upload_kbps: float
+    cpu_slowdown: float
+
+    def context_args(self):
+        """Argumentos para browser.new_context (se fijan al crear el contexto)"""
+        return {
+            "viewport": {"width": self.width, "height": self.height},
+            "device_scale_factor": self.device_scale_factor,
+            "is_mobile": self.is_mobile,
+            "has_touch": self.is_mobile,
+        }
+
+    def network_conditions(self):
+        """Parámetros de Network.emulateNetworkConditions (throughput en bytes/s)"""
+        return {
+            "offline": False,
+            "latency": self.latency_ms,
+            "downloadThroughput": self.download_kbps * 1024 / 8,
+            "uploadThroughput": self.upload_kbps * 1024 / 8,
+        }
+
+    def throttle(self, page):
+        """
+        Aplica red y CPU lentas a la página (solo Chromium).
+
+        Devuelve la sesión CDP (hay que mantenerla viva mientras dure la
+        emulación) o None si el navegador no es Chromium.
+        """
+        if not supports_throttling(page):
+            return None
+        session = page.context.new_cdp_session(page)
+        session.send("Network.enable")
+        session.send("Network.emulateNetworkConditions", self.network_conditions())
+        session.send("Emulation.setCPUThrottlingRate", {"rate": self.cpu_slowdown})
+        return session
+
+
+def supports_throttling(page):
+    """True si la página corre en Chromium (CDP disponible)"""
+    browser = page.context.browser
+    return browser is not None and browser.browser_type.name == "chromium"
+
+
+DEVICE_PROFILES = {
+    profile.name: profile
+    for profile in (
+        # Android de gama baja en 3G (DevTools "3G", CPU 6x)
+        DeviceProfile("movil-3g", 360, 740, 2, True, 300, 750, 250, 6),
+        # Móvil de gama media en 4G lento (perfil móvil de Lighthouse, CPU 4x)
+        DeviceProfile("movil-4g", 390, 844, 3, True, 150, 1600, 750, 4),
+        # Tablet de 768px (iPad) en wifi, el ancho donde cambian los breakpoints md: de Tailwind
+        DeviceProfile("tablet-wifi", 768, 1024, 2, True, 40, 10240, 5120, 2),
+        # Escritorio con cable (perfil desktop de Lighthouse)
+        DeviceProfile("desktop-cable", 1920, 1080, 1, False, 40, 10240, 10240, 1),
+    )
+}
@@ -0,0 +1,300 @@
+"""
+🗃️ EFICACIA DE LA CACHÉ DE REACT QUERY - MOVIEVERSE TESTING
+============================================================
+
+useMovies.ts y OptimizedHeroSection ponen staleTime de 5, 10 y 15 minutos,
+pero nada dice si eso ahorra peticiones en recorridos reales. Este módulo
+observa la QueryCache de la app mientras se repite un recorrido
+(home → trending → atrás → detalle → atrás) y cuenta por queryKey:
+
+- hit: el componente se montó con datos en caché y no se volvió a pedir
+- viejo: un hit con datos más antiguos que su staleTime (con
+  refetchOnMount: false global, staleTime no provoca refetch al montar)
+- compartida: se montó mientras otro componente ya la estaba pidiendo
+- miss: sin datos, hubo que ir a TMDB
+- refetch: había datos pero se volvieron a pedir
+- redundantes: peticiones que trajeron lo mismo que ya había en caché,
+  con la misma queryKey o con otra (p. ej. ['movieDetails', id] del hero
+  y ['movie', 'detail', id] del detalle piden el mismo movie/{id})
+
+La app solo expone su QueryClient si window.__MOVIEVERSE_E2E__ existe antes
+de cargar (ver src/App.tsx); QUERY_CACHE_SCRIPT lo define como init script.
+
+Los recorridos son rutas ("/trending"), "back" (page.go_back()) y "+6m"
+(adelanta el reloj de la página con page.clock para que caduque staleTime).
+
+Uso:
+    report = replay_journey(page, BASE_URL, JOURNEYS["inicio-trending-detalle"])
+    print("\\n".join(report.lines()))
+"""
+
+import re
+from dataclasses import dataclass, field
+
+from movieverse_testing.leaks import spa_navigate
+from movieverse_testing.routes import sample_url
+from movieverse_testing.waits import wait_for_app_ready
+
+BACK = "back"
+
+_ADVANCE = re.compile(r"^\+(\d+)(ms|s|m)$")
+_UNIT_MS = {"ms": 1, "s": 1000, "m": 60_000}
+
+JOURNEYS = {
+    "inicio-trending-detalle": ["/", "/trending", BACK, sample_url("/movie/:id"), BACK],
+    "series": ["/tv", sample_url("/tv/:id"), BACK, "/tv/trending", BACK, sample_url("/tv/:id")],
+    # Vuelve a rutas cuyo staleTime (5 y 10 minutos) ya caducó
+    "vuelta-tras-11-minutos": ["/", "/upcoming", BACK, "+11m", "/upcoming", BACK, "/trending"],
+}
+
+# Se instala con page.add_init_script antes de cargar la app. Registra los
+# montajes de observers, los fetch y los éxitos (con una huella del dato)
+# de cada query; el paso del recorrido lo pone replay_journey.
+QUERY_CACHE_SCRIPT = """
+(() => {
+  if (window.__MOVIEVERSE_E2E__) return;
+  const state = { client: false, step: 0, events: [], fetches: {} };
+
+  // FNV-1a de 32 bits: igual dato → igual huella, para encontrar respuestas repetidas
+  const fingerprint = (data) => {
+    const text = JSON.stringify(data) ?? '';
+    let hash = 0x811c9dc5;
+    for (let i = 0; i < text.length; i++) {
+      hash ^= text.charCodeAt(i);
+      hash = Math.imul(hash, 0x01000193) >>> 0;
+    }
+    return `${hash.toString(16)}:${text.length}`;
+  };
+
+  const record = (type, query, extra = {}) => {
+    const event = { type, key: query.queryHash, step: state.step, t: performance.now(), ...extra };
+    state.events.push(event);
+    return event;
+  };
+
+  window.__MOVIEVERSE_E2E__ = {
+    state,
+    onQueryClient(client) {
+      state.client = true;
+      client.getQueryCache().subscribe((event) => {
+        const query = event.query;
+        const key = query.queryHash;
+        if (event.type === 'observerAdded') {
+          const before = state.fetches[key] || 0;
+          const staleTime = event.observer.options.staleTime;
+          const mount = record('mount', query, {
+            hadData: query.state.data !== undefined,
+            fetching: query.state.fetchStatus === 'fetching',
+            age: query.state.dataUpdatedAt ? Date.now() - query.state.dataUpdatedAt : null,
+            staleTime: typeof staleTime === 'number' ? staleTime : null,
+            fetched: false,
+          });
+          // El observer pide los datos (si toca) dentro del mismo subscribe
+          setTimeout(() => { mount.fetched = (state.fetches[key] || 0) > before; });
+        } else if (event.type === 'updated' && event.action.type === 'fetch') {
+          state.fetches[key] = (state.fetches[key] || 0) + 1;
+          record('fetch', query, { hadData: query.state.data !== undefined });
+        } else if (event.type === 'updated' && event.action.type === 'failed') {
+          record('retry', query);
+        } else if (event.type === 'updated' && event.action.type === 'success') {
+          record('success', query, { fingerprint: fingerprint(event.action.data) });
+        } else if (event.type === 'removed') {
+          record('removed', query);
+        }
+      });
+    },
+  };
+})();
+"""
+
+
+def parse_step(step):
+    """("goto", path), ("back",) o ("advance", ms)"""
+    if step == BACK:
+        return (BACK,)
+    match = _ADVANCE.match(step)
+    if match:
+        return ("advance", int(match.group(1)) * _UNIT_MS[match.group(2)])
+    if step.startswith("/"):
+        return ("goto", step)
+    raise ValueError(f"Paso de recorrido desconocido: {step!r} (usa una ruta, 'back' o '+6m')")
+
+
+@dataclass
+class QueryStats:
+    """Lo que pasó con una queryKey durante el recorrido"""
+
+    key: str
+    stale_time: int = None
+    mounts: int = 0
+    hits: int = 0
+    stale_hits: int = 0
+    shared: int = 0
+    misses: int = 0
+    refetches: int = 0
+    fetches: int = 0
+    retries: int = 0
+    redundant: int = 0
+    duplicate_of: set = field(default_factory=set)
+
+    @property
+    def lookups(self):
+        return self.hits + self.shared + self.misses + self.refetches
+
+    @property
+    def hit_ratio(self):
+        """Montajes servidos sin ir a TMDB (hits y compartidas) sobre el total"""
+        return (self.hits + self.shared) / self.lookups if self.lookups else None
+
+
+def analyze_cache_events(events):
+    """{queryHash: QueryStats} a partir de los eventos de QUERY_CACHE_SCRIPT"""
+    stats = {}
+    cached = {}        # fingerprint del dato en caché por key
+    for event in sorted(events, key=lambda event: event["t"]):
+        key = event["key"]
+        query = stats.setdefault(key, QueryStats(key))
+        kind = event["type"]
+        if kind == "mount":
+            query.mounts += 1
+            if event.get("staleTime") is not None:
+                query.stale_time = event["staleTime"]
+            if event["hadData"]:
+                if event["fetched"]:
+                    query.refetches += 1
+                else:
+                    query.hits += 1
+                    stale = event.get("staleTime") is not None and event.get("age") is not None \
+                        and event["age"] > event["staleTime"]
+                    query.stale_hits += stale
+            elif event["fetching"]:
+                query.shared += 1
+            elif event["fetched"]:
+                query.misses += 1
+            # Sin datos ni petición: query desactivada (enabled: false), no cuenta
+        elif kind == "fetch":
+            query.fetches += 1
+        elif kind == "retry":
+            query.retries += 1
+        elif kind == "success":
+            fingerprint = event["fingerprint"]
+            if cached.get(key) == fingerprint:
+                query.redundant += 1
+            else:
+                others = sorted(other for other, value in cached.items() if value == fingerprint and other != key)
+                if others:
+                    query.redundant += 1
+                    query.duplicate_of.update(others)
+            cached[key] = fingerprint
+        elif kind == "removed":
+            cached.pop(key, None)
+    return stats
+
+
+@dataclass
+class CacheReport:
+    """Eficacia de la caché en un recorrido"""
+
+    journey: list
+    queries: dict = field(default_factory=dict)
+    tmdb_requests: int = 0
+    # (paso, queryHash) de las peticiones hechas al volver atrás a algo ya cargado
+    refetched_on_back: list = field(default_factory=list)
+
+    @property
+    def hit_ratio(self):
+        lookups = sum(query.lookups for query in self.queries.values())
+        served = sum(query.hits + query.shared for query in self.queries.values())
+        return served / lookups if lookups else None
+
+    @property
+    def fetches(self):
+        return sum(query.fetches for query in self.queries.values())
+
+    @property
+    def redundant(self):
+        return sum(query.redundant for query in self.queries.values())
+
+    def lines(self):
+        def ratio(value):
+            return f"{value:.0%}" if value is not None else "-"
+
+        def minutes(value):
+            return f"{value / 60_000:g}min" if value is not None else "-"
+
+        lines = [
+            f"Recorrido: {' → '.join(self.journey)}",
+            f"  hit ratio {ratio(self.hit_ratio)}, {self.fetches} fetch de React Query "
+            f"({self.redundant} redundantes), {self.tmdb_requests} peticiones a TMDB",
+            f"  {'queryKey':<44} {'staleTime':>9} {'hits':>5} {'viejos':>6} {'compart.':>8} "
+            f"{'miss':>5} {'refetch':>7} {'fetch':>5} {'redund.':>7}",
+        ]
+        ordered = sorted(self.queries.values(), key=lambda query: (-query.redundant, -query.fetches, query.key))
+        for query in ordered:
+            if not query.mounts and not query.fetches:
+                continue
+            lines.append(
+                f"  {query.key[:44]:<44} {minutes(query.stale_time):>9} {query.hits:>5} {query.stale_hits:>6} "
+                f"{query.shared:>8} {query.misses:>5} {query.refetches:>7} {query.fetches:>5} {query.redundant:>7}"
+            )
+            for other in sorted(query.duplicate_of):
+                lines.append(f"    ↳ mismo dato que {other}")
+        for step, key in self.refetched_on_back:
+            lines.append(f"  ⚠️ paso {step} (atrás) volvió a pedir {key}")
+        return lines
+
+
+def _refetched_on_back(events, steps):
+    """Fetch hechos en un paso "back" de queries que ya se habían cargado antes"""
+    loaded = set()
+    refetched = []
+    for event in sorted(events, key=lambda event: event["t"]):
+        if event["type"] == "removed":
+            loaded.discard(event["key"])
+        elif event["type"] == "success":
+            loaded.add(event["key"])
+        elif event["type"] == "fetch" and steps[event["step"]] == (BACK,) and event["key"] in loaded:
+            refetched.append((event["step"], event["key"]))
+    return refetched
+
+
+def replay_journey(page, base_url, journey, **ready_kwargs):
+    """
+    Recorre journey (el primer paso es una ruta) y devuelve un CacheReport.
+
+    Las rutas se visitan dentro de la SPA, sin recargar, como un <Link>;
+    con una recarga la caché empezaría de cero.
+    """
+    steps = [parse_step(step) for step in journey]
+    if steps[0][0] != "goto":
+        raise ValueError("El recorrido tiene que empezar en una ruta")
+    page.add_init_script(script=QUERY_CACHE_SCRIPT)
+    if any(step[0] == "advance" for step in steps):
+        page.clock.install()
+
+    for index, step in enumerate(steps):
+        if index:
+            page.evaluate("(step) => { window.__MOVIEVERSE_E2E__.state.step = step; }", index)
+        if index == 0:
+            page.goto(base_url + step[1], timeout=ready_kwargs.get("timeout"))
+            wait_for_app_ready(page, **ready_kwargs)
+            if not page.evaluate("() => window.__MOVIEVERSE_E2E__.state.client"):
+                raise RuntimeError(
+                    "La app no expuso su QueryClient: ¿el servidor sirve una build anterior a "
+                    "window.__MOVIEVERSE_E2E__ en src/App.tsx?"
+                )
+        elif step[0] == "goto":
+            spa_navigate(page, step[1], **ready_kwargs)
+        elif step[0] == BACK:
+            page.go_back()
+            wait_for_app_ready(page, **ready_kwargs)
+        else:
+            page.clock.fast_forward(step[1])
+
+    events = page.evaluate("() => window.__MOVIEVERSE_E2E__.state.events")
+    return CacheReport(
+        journey=list(journey),
+        queries=analyze_cache_events(events),
+        tmdb_requests=page.evaluate("() => window.__movieverse ? window.__movieverse.tmdbRequests : 0"),
+        refetched_on_back=_refetched_on_back(events, steps),
+    )
@@ -0,0 +1,58 @@
+"""
+🗺️ RUTAS DE LA APP - MOVIEVERSE TESTING
+=======================================
+
+Rutas declaradas en src/App.tsx, con una URL de ejemplo para las que
+llevan parámetros. Los ids de ejemplo existen en TMDB (550 = El club de
+la lucha, 1399 = Juego de Tronos) y los sirve cualquier plantilla
+{id} del modo replay.
+"""
+
+SAMPLE_MOVIE_ID = 550
+SAMPLE_TV_ID = 1399
+
+# (patrón de App.tsx, URL de ejemplo)
+APP_ROUTES = [
+    ("/", "/"),
+    ("/movies", "/movies"),
+    ("/tv", "/tv"),
+    ("/movie/:id", f"/movie/{SAMPLE_MOVIE_ID}"),
+    ("/tv/:id", f"/tv/{SAMPLE_TV_ID}"),
+    ("/search", "/search?q=spider"),
+    ("/trending", "/trending"),
+    ("/top-rated", "/top-rated"),
+    ("/upcoming", "/upcoming"),
+    ("/now-playing", "/now-playing"),
+    ("/tv/trending", "/tv/trending"),
+    ("/tv/top-rated", "/tv/top-rated"),
+    ("/tv/on-the-air", "/tv/on-the-air"),
+]
+
+
+def sample_url(route):
+    """URL de ejemplo para un patrón de ruta ("/movie/:id" → "/movie/550")"""
+    for pattern, sample in APP_ROUTES:
+        if pattern == route:
+            return sample
+    raise KeyError(f"Ruta desconocida: {route}")
+
+
+def route_for_path(pathname):
+    """
+    Patrón de App.tsx que atiende un pathname ("/movie/550" → "/movie/:id"), o None.
+
+    Como React Router, los segmentos fijos ganan a los parámetros
+    ("/tv/trending" es "/tv/trending", no "/tv/:id").
+    """
+    segments = pathname.rstrip("/").split("/")
+    best, best_static = None, -1
+    for pattern, _ in APP_ROUTES:
+        pattern_segments = pattern.rstrip("/").split("/")
+        if len(pattern_segments) != len(segments):
+            continue
+        if not all(p.startswith(":") or p == s for p, s in zip(pattern_segments, segments)):
+            continue
+        static = sum(not p.startswith(":") for p in pattern_segments)
+        if static > best_static:
+            best, best_static = pattern, static
+    return best
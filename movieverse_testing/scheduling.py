@@ -0,0 +1,105 @@
+"""
+🗓️ REPARTO DE TESTS ENTRE WORKERS - MOVIEVERSE TESTING
+======================================================
+
+Los tests duran de ~2s (test_pagina_principal_carga_correctamente) a 30s+.
+xdist reparte por orden de colección: si el test más largo sale el último,
+los demás workers terminan y se quedan esperando.
+
+- DurationHistory guarda las últimas duraciones de cada test en
+  .cache/test-durations.json (lo escribe conftest.py al terminar)
+- LongestFirstScheduling es el modo "load" de xdist, pero entrega los
+  tests de más largo a más corto y de uno en uno: el último test que
+  arranca es corto y todos los workers acaban casi a la vez (LPT)
+
+Con el historial el tiempo real se acerca a suma/workers (o al test más
+largo, si dura más que eso). RunTimer muestra los dos en el resumen.
+"""
+
+import json
+import statistics
+from pathlib import Path
+
+try:
+    from xdist.scheduler import LoadScheduling
+except ImportError:  # pytest-xdist es opcional
+    LoadScheduling = object
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_DURATIONS = PROJECT_ROOT / ".cache" / "test-durations.json"
+
+# Ejecuciones que se recuerdan por test
+DURATION_HISTORY_SIZE = 5
+
+
+class DurationHistory:
+    """nodeid → últimas duraciones (segundos); la estimación es la mediana"""
+
+    def __init__(self, durations=None, size=DURATION_HISTORY_SIZE):
+        self.durations = dict(durations or {})
+        self.size = size
+
+    @classmethod
+    def load(cls, path=DEFAULT_DURATIONS):
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        return cls(json.loads(path.read_text(encoding="utf-8")))
+
+    def __len__(self):
+        return len(self.durations)
+
+    def record(self, nodeid, seconds):
+        self.durations[nodeid] = (self.durations.get(nodeid, []) + [round(seconds, 3)])[-self.size:]
+
+    def update(self, test_durations):
+        """Añade las duraciones de una ejecución (RunTimer.test_durations)"""
+        for nodeid, seconds in test_durations.items():
+            self.record(nodeid, seconds)
+        return self
+
+    def estimate(self, nodeid):
+        """Duración esperada; None si el test nunca se ha ejecutado"""
+        durations = self.durations.get(nodeid)
+        return statistics.median(durations) if durations else None
+
+    def save(self, path=DEFAULT_DURATIONS):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.durations, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+
+    def longest_first(self, nodeids):
+        """
+        nodeids ordenados de más largo a más corto.
+
+        Los que no tienen historial van primero (pueden ser largos y es
+        peor descubrirlo al final). Los empates conservan el orden original.
+        """
+        estimates = {nodeid: self.estimate(nodeid) for nodeid in nodeids}
+        unknown = max((value for value in estimates.values() if value is not None), default=0.0) + 1
+        return sorted(nodeids, key=lambda nodeid: -(unknown if estimates[nodeid] is None else estimates[nodeid]))
+
+
+class LongestFirstScheduling(LoadScheduling):
+    """
+    Scheduler "load" de xdist que entrega primero los tests más largos.
+
+    Lo crea pytest_xdist_make_scheduler en conftest.py. Se reparten de uno
+    en uno (maxschedchunk=1): xdist mantiene dos tests en cola por worker
+    y le va dando el siguiente más largo al que termina.
+    """
+
+    def __init__(self, config, log=None, history=None):
+        super().__init__(config, log)
+        self.history = history if history is not None else DurationHistory.load()
+        if config.getoption("maxschedchunk", None) is None:
+            self.maxschedchunk = 1
+
+    def _send_tests(self, node, num):
+        # pending son índices de self.collection; se reordena antes de cada
+        # envío (también cuando un worker se cae y devuelve sus tests)
+        order = {nodeid: position for position, nodeid in
+                 enumerate(self.history.longest_first([self.collection[index] for index in self.pending]))}
+        self.pending.sort(key=lambda index: order[self.collection[index]])
+        super()._send_tests(node, num)
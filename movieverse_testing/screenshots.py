@@ -0,0 +1,180 @@
+"""
+📸 CAPTURAS DE PANTALLA - MOVIEVERSE TESTING
+============================================
+
+Cada test guarda capturas en screenshots/. En paralelo (pytest -n 4) varios
+workers escribirían en las mismas rutas, así que cada worker tiene su
+propia carpeta:
+
+    serie      screenshots/homepage_loaded.png
+    paralelo   screenshots/gw0/homepage_loaded.png
+
+Política de capturas (--screenshot-policy):
+    always       Todas las llamadas a take_screenshot (por defecto)
+    on-failure   Ninguna; solo una captura final si el test falla
+    sampled      Una fracción fija de las capturas (--screenshot-sample=0.25),
+                 elegida por nombre: siempre las mismas en cada ejecución
+
+La escritura a disco (y el re-encode a WebP) va a un pool de hilos: el test
+solo espera a que el navegador devuelva los bytes. Formatos compactos con
+--screenshot-format=jpeg/webp y --screenshot-quality; take_screenshot acepta
+element=locator para capturar solo un componente.
+
+Con --visual=check/update cada captura se hace en PNG, de forma síncrona,
+tapa las zonas dinámicas y se compara con (o se aprueba como) su baseline;
+ver visual.py.
+"""
+
+import io
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from movieverse_testing import visual
+from movieverse_testing.parallel import worker_id
+
+SCREENSHOTS_DIR = Path("screenshots")
+
+SCREENSHOT_POLICIES = ("always", "on-failure", "sampled")
+SCREENSHOT_FORMATS = ("png", "jpeg", "webp")
+
+_EXTENSIONS = {"png": ".png", "jpeg": ".jpg", "webp": ".webp"}
+
+
+@dataclass
+class CaptureSettings:
+    """Cómo y cuándo se guardan las capturas (lo fija conftest.py)"""
+
+    policy: str = "always"
+    sample_rate: float = 0.25
+    format: str = "png"
+    quality: int = 80
+
+    def should_capture(self, name):
+        """True si la política permite guardar esta captura"""
+        if self.policy == "always":
+            return True
+        if self.policy == "on-failure":
+            return False
+        # Muestreo determinista por nombre: se comparan las mismas entre ejecuciones
+        return zlib.crc32(name.encode("utf-8")) % 10_000 < self.sample_rate * 10_000
+
+
+class ScreenshotWriter:
+    """Escribe capturas en segundo plano; flush() espera a que terminen"""
+
+    def __init__(self, max_workers=2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="screenshots")
+        self._pending = {}
+        # Los hilos del pool suman a la vez: += no es atómico
+        self._lock = threading.Lock()
+        self.written = 0
+        self.bytes_written = 0
+
+    def submit(self, path, data, convert=None):
+        """Programa la escritura de data (bytes) en path, con un re-encode opcional"""
+        previous = self._pending.get(path)
+        if previous is not None:
+            # Misma ruta dos veces: la última captura tiene que quedar la última
+            previous.result()
+        self._pending[path] = self._executor.submit(self._write, path, data, convert)
+
+    def _write(self, path, data, convert):
+        if convert is not None:
+            data = convert(data)
+        Path(path).write_bytes(data)
+        with self._lock:
+            self.written += 1
+            self.bytes_written += len(data)
+
+    def flush(self):
+        """Espera a todas las escrituras y devuelve los errores que hubo"""
+        errors = []
+        for path, future in self._pending.items():
+            try:
+                future.result()
+            except Exception as error:
+                errors.append(f"{path}: {error}")
+        self._pending.clear()
+        return errors
+
+
+settings = CaptureSettings()
+writer = ScreenshotWriter()
+
+
+def configure(policy="always", sample_rate=0.25, format="png", quality=80):
+    """Cambia la política y el formato de las capturas"""
+    if policy not in SCREENSHOT_POLICIES:
+        raise ValueError(f"Política de capturas desconocida: {policy} (usa una de {SCREENSHOT_POLICIES})")
+    if format not in SCREENSHOT_FORMATS:
+        raise ValueError(f"Formato de captura desconocido: {format} (usa uno de {SCREENSHOT_FORMATS})")
+    if format == "webp" and visual.Image is None:
+        raise RuntimeError("Las capturas WebP necesitan Pillow: pip install pillow")
+    settings.policy = policy
+    settings.sample_rate = sample_rate
+    settings.format = format
+    settings.quality = quality
+
+
+def screenshot_path(name):
+    """Ruta de una captura dentro del espacio del worker actual"""
+    worker = worker_id()
+    directory = SCREENSHOTS_DIR if worker == "main" else SCREENSHOTS_DIR / worker
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / name
+
+
+def _to_webp(data):
+    with visual.Image.open(io.BytesIO(data)) as image:
+        output = io.BytesIO()
+        image.save(output, "WEBP", quality=settings.quality)
+    return output.getvalue()
+
+
+def take_screenshot(page, name, element=None, **kwargs):
+    """
+    Captura la página (o solo element) según la política y el formato actuales.
+
+    Devuelve la ruta del archivo o None si la política la descarta. La
+    ruta puede no existir aún: la escritura termina en segundo plano.
+    """
+    target = element if element is not None else page
+    mode = visual.current_mode()
+    if mode != "off":
+        # Capturas estables: sin animaciones ni cursor, zonas dinámicas tapadas
+        path = screenshot_path(name)
+        kwargs.setdefault("animations", "disabled")
+        kwargs.setdefault("caret", "hide")
+        kwargs.setdefault("mask", [page.locator(selector) for selector in visual.DYNAMIC_SELECTORS])
+        target.screenshot(path=str(path), **kwargs)
+        namespace = visual.page_namespace(page)
+        if mode == "check":
+            visual.check_screenshot(path, namespace=namespace)
+        else:
+            visual.BaselineStore(namespace=namespace).approve(path)
+        return path
+
+    if not settings.should_capture(name):
+        return None
+    path = screenshot_path(name).with_suffix(_EXTENSIONS[settings.format])
+    convert = None
+    if settings.format == "jpeg":
+        kwargs.setdefault("type", "jpeg")
+        kwargs.setdefault("quality", settings.quality)
+    elif settings.format == "webp":
+        convert = _to_webp
+    writer.submit(path, target.screenshot(**kwargs), convert)
+    return path
+
+
+def capture_failure(page, test_name):
+    """Captura final de un test fallido (política on-failure)"""
+    if page.is_closed():
+        return None
+    safe_name = "".join(char if char.isalnum() or char in "-_" else "_" for char in test_name)
+    path = screenshot_path(f"fallo_{safe_name}.png")
+    writer.submit(path, page.screenshot(full_page=True))
+    return path
@@ -0,0 +1,243 @@
+"""
+🎠 RENDIMIENTO DEL SCROLL - MOVIEVERSE TESTING
+==============================================
+
+Que scrollLeft cambie no dice si el carrusel va fluido. Este módulo hace
+scroll de verdad sobre las filas de la home y mide los frames:
+
+Componentes (SCROLL_COMPONENTS):
+    MovieRow      filas de películas (section.group)
+    TVSeriesRow   filas de series
+    Swiper        carruseles de Swiper, si la página tiene alguno
+
+Formas de hacer scroll (SCROLL_METHODS):
+    wheel         rueda/trackpad: Input.synthesizeScrollGesture con ratón
+    drag          arrastrar con el dedo: el mismo gesto con touch
+    programmatic  scrollBy({behavior: 'smooth'}), lo que hacen las flechas
+
+Durante el gesto se graban dos cosas:
+- cada requestAnimationFrame (FRAME_RECORDER_SCRIPT): FPS, porcentaje de
+  frames perdidos (huecos de más de un vsync) y el peor frame
+- la FrameTimeline de la traza de Chrome: frames presentados/descartados
+  por el compositor (el scroll va en su hilo y puede ir fluido aunque el
+  hilo principal esté ocupado, o al revés)
+
+Condiciones (SCROLL_CONDITIONS): normal y con la CPU del perfil movil-4g.
+Con --device-profile la condición nunca baja la ralentización del perfil:
+"normal" es la CPU del perfil y "cpu-lenta" la más lenta de las dos (ver
+cpu_rate). La tabla muestra la ralentización que se usó de verdad.
+Solo Chromium (CDP y tracing).
+
+Uso:
+    report = ScrollReport()
+    report.add(measure_scroll(page, "MovieRow", "wheel", condition="cpu-lenta"))
+    print("\\n".join(report.lines()))
+"""
+
+from dataclasses import dataclass, field
+
+from movieverse_testing.profiles import DEVICE_PROFILES
+from movieverse_testing.tracing import FRAME_CATEGORIES, TraceRecorder, frame_timeline
+
+# Intervalo entre frames a 60Hz (ms)
+VSYNC_MS = 1000 / 60
+
+# Distancia de cada gesto (px) y velocidad del gesto sintético (px/s)
+SCROLL_DISTANCE = 1200
+GESTURE_SPEED = 1200
+
+SCROLL_METHODS = ("wheel", "drag", "programmatic")
+
+# Ralentización mínima de CPU de cada condición
+SCROLL_CONDITIONS = {
+    "normal": 1,
+    "cpu-lenta": DEVICE_PROFILES["movil-4g"].cpu_slowdown,
+}
+
+
+def cpu_rate(condition, profile=None):
+    """Ralentización efectiva: la de la condición, pero nunca menos que la del perfil"""
+    base_rate = profile.cpu_slowdown if profile is not None else 1
+    return max(base_rate, SCROLL_CONDITIONS[condition])
+
+
+@dataclass(frozen=True)
+class ScrollTarget:
+    """Contenedor scrolleable de un componente"""
+
+    name: str
+    selector: str
+
+
+SCROLL_COMPONENTS = {
+    target.name: target
+    for target in (
+        ScrollTarget("MovieRow", "section.group .overflow-x-auto"),
+        ScrollTarget("TVSeriesRow", "section:not(.group) .overflow-x-auto.pb-4"),
+        ScrollTarget("Swiper", ".swiper"),
+    )
+}
+
+# Graba el instante de cada requestAnimationFrame hasta que se pare
+FRAME_RECORDER_SCRIPT = """
+() => {
+  const recorder = { frames: [], running: true };
+  window.__movieverseFrames = recorder;
+  const tick = (time) => {
+    if (!recorder.running) return;
+    recorder.frames.push(time);
+    requestAnimationFrame(tick);
+  };
+  requestAnimationFrame(tick);
+}
+"""
+
+_STOP_RECORDER = "() => { const r = window.__movieverseFrames; r.running = false; return r.frames; }"
+
+# scrollBy suave y esperar a que termine (scrollend, o 2s como máximo)
+_PROGRAMMATIC_SCROLL = """
+(el, distance) => new Promise((resolve) => {
+  const done = () => resolve(el.scrollLeft);
+  el.addEventListener('scrollend', done, { once: true });
+  setTimeout(done, 2000);
+  el.scrollBy({ left: distance, behavior: 'smooth' });
+})
+"""
+
+
+@dataclass
+class FrameStats:
+    """Frames vistos por requestAnimationFrame durante el gesto"""
+
+    frames: int
+    duration_ms: float
+    dropped: int
+    worst_frame_ms: float
+
+    @property
+    def fps(self):
+        return (self.frames - 1) * 1000 / self.duration_ms if self.duration_ms > 0 else 0.0
+
+    @property
+    def dropped_ratio(self):
+        """Frames perdidos sobre los que debería haber habido"""
+        expected = self.frames - 1 + self.dropped
+        return self.dropped / expected if expected > 0 else 0.0
+
+
+def frame_stats(timestamps, vsync_ms=VSYNC_MS):
+    """
+    FrameStats a partir de los instantes de rAF (ms).
+
+    Un hueco de 50ms a 60Hz son 3 vsyncs: 2 frames perdidos.
+    """
+    intervals = [later - earlier for earlier, later in zip(timestamps, timestamps[1:])]
+    if not intervals:
+        return FrameStats(len(timestamps), 0.0, 0, 0.0)
+    dropped = sum(max(0, round(interval / vsync_ms) - 1) for interval in intervals)
+    return FrameStats(len(timestamps), timestamps[-1] - timestamps[0], dropped, max(intervals))
+
+
+@dataclass
+class ScrollResult:
+    """Un gesto de scroll sobre un componente en una condición"""
+
+    component: str
+    method: str
+    condition: str
+    distance: float
+    frames: FrameStats
+    timeline: object = None  # tracing.FrameTimeline
+    cpu_rate: float = 1
+
+    def line(self):
+        timeline = f"{self.timeline.dropped_ratio:>9.0%}" if self.timeline is not None else f"{'-':>9}"
+        return (f"{self.component:<13}{self.method:<14}{self.condition:<11}{self.cpu_rate:>4g}x"
+                f"{self.frames.fps:>6.0f}"
+                f"{self.frames.dropped_ratio:>9.0%}{self.frames.worst_frame_ms:>8.0f}ms{timeline}"
+                f"{self.distance:>8.0f}px")
+
+
+@dataclass
+class ScrollReport:
+    """Resultados de varios gestos, en una tabla"""
+
+    results: list = field(default_factory=list)
+
+    def add(self, result):
+        if result is not None:
+            self.results.append(result)
+        return result
+
+    def lines(self):
+        header = (f"{'componente':<13}{'gesto':<14}{'condición':<11}{'cpu':>5}{'fps':>6}{'perdidos':>9}"
+                  f"{'peor':>10}{'timeline':>9}{'scroll':>10}")
+        return [header] + [result.line() for result in self.results]
+
+
+def _gesture(session, box, distance, source):
+    session.send("Input.synthesizeScrollGesture", {
+        "x": box["x"] + box["width"] / 2,
+        "y": box["y"] + box["height"] / 2,
+        # distancia negativa = el contenido se mueve hacia la derecha
+        "xDistance": -distance,
+        "yDistance": 0,
+        "speed": GESTURE_SPEED,
+        "gestureSourceType": source,
+    })
+
+
+def measure_scroll(page, component, method, condition="normal", distance=SCROLL_DISTANCE, trace=True,
+                   profile=None):
+    """
+    Hace un gesto de scroll sobre el primer contenedor del componente.
+
+    profile: DeviceProfile activo en la página (--device-profile). El gesto
+    se mide con cpu_rate(condition, profile), al terminar se restaura la
+    ralentización del perfil y, si es táctil, no se toca la emulación
+    táctil del contexto.
+
+    Devuelve un ScrollResult o None si la página no tiene ese componente.
+    """
+    container = page.locator(SCROLL_COMPONENTS[component].selector).first
+    if container.count() == 0:
+        return None
+    container.scroll_into_view_if_needed()
+    container.evaluate("el => { el.scrollLeft = 0; }")
+    box = container.bounding_box()
+
+    base_rate = profile.cpu_slowdown if profile is not None else 1
+    rate = cpu_rate(condition, profile)
+    toggle_touch = method == "drag" and not (profile is not None and profile.is_mobile)
+    session = page.context.new_cdp_session(page)
+    recorder = TraceRecorder(page, FRAME_CATEGORIES) if trace else None
+    try:
+        session.send("Emulation.setCPUThrottlingRate", {"rate": rate})
+        if toggle_touch:
+            session.send("Emulation.setTouchEmulationEnabled", {"enabled": True})
+        if recorder is not None:
+            recorder.start()
+        page.evaluate(FRAME_RECORDER_SCRIPT)
+        if method == "programmatic":
+            container.evaluate(_PROGRAMMATIC_SCROLL, distance)
+        else:
+            _gesture(session, box, distance, "touch" if method == "drag" else "mouse")
+        timestamps = page.evaluate(_STOP_RECORDER)
+        timeline = frame_timeline(recorder.stop()) if recorder is not None else None
+    finally:
+        if recorder is not None and recorder.active:
+            recorder.stop()
+        session.send("Emulation.setCPUThrottlingRate", {"rate": base_rate})
+        if toggle_touch:
+            session.send("Emulation.setTouchEmulationEnabled", {"enabled": False})
+        session.detach()
+
+    return ScrollResult(
+        component=component,
+        method=method,
+        condition=condition,
+        distance=container.evaluate("el => el.scrollLeft"),
+        frames=frame_stats(timestamps),
+        timeline=timeline,
+        cpu_rate=rate,
+    )
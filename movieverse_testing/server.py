@@ -0,0 +1,419 @@
+"""
+🌐 SERVIDOR DE LA APP PARA LOS TESTS - MOVIEVERSE TESTING
+=========================================================
+
+Arranca (una sola vez por ejecución de pytest) el servidor que sirve la app
+y comparte su URL con todos los workers de pytest-xdist.
+
+Modos (--app-server):
+    external   No arranca nada; usa el servidor que ya tengas corriendo
+               (npm run dev en http://localhost:5173). Es el comportamiento
+               de siempre.
+    dev        Arranca Vite (lo mismo que `npm run dev`) en un puerto libre y
+               lo para al final. ESM sin empaquetar: para depurar.
+    dist       Sirve la build de producción (dist/) con un servidor estático
+               de Python con las mismas rewrites que vercel.json (todas las
+               rutas → index.html). Responde mucho más rápido que Vite dev.
+    preview    La misma build servida con `vite preview`.
+
+dist y preview construyen la app si hace falta (`npm run build`). La build
+se guarda con un hash de src/, public/ y la configuración (BUILD_INPUTS)
+en dist/.movieverse-build.json; si nada cambió no se vuelve a construir.
+
+Con --app-server-reuse el servidor queda corriendo al terminar y la
+siguiente ejecución lo reutiliza (si sigue vivo, responde y sirve la build
+actual). El servidor reutilizable se apunta en .cache/app-server.json:
+    python -m movieverse_testing.server status
+    python -m movieverse_testing.server stop
+
+La URL elegida se publica en la variable de entorno MOVIEVERSE_BASE_URL,
+que heredan los workers y lee base_url().
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from movieverse_testing.locks import file_lock
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_DIST = PROJECT_ROOT / "dist"
+
+# Servidor de desarrollo de siempre (npm run dev)
+DEFAULT_BASE_URL = "http://localhost:5173"
+
+# Variable de entorno con la URL compartida entre procesos
+BASE_URL_ENV = "MOVIEVERSE_BASE_URL"
+
+SERVER_MODES = ("external", "dev", "dist", "preview")
+
+# Lo que cambia la build: si su hash no cambia, dist/ sirve tal cual
+BUILD_INPUTS = (
+    "src",
+    "public",
+    "index.html",
+    "package.json",
+    "package-lock.json",
+    "vite.config.ts",
+    "tsconfig.json",
+    "tsconfig.app.json",
+    "tsconfig.node.json",
+    ".env",
+    ".env.production",
+)
+
+# Dentro de dist/ (vite build vacía la carpeta, así que se escribe después)
+BUILD_STAMP = ".movieverse-build.json"
+
+# Servidor que sigue vivo entre ejecuciones (--app-server-reuse)
+DEFAULT_SERVER_STATE = PROJECT_ROOT / ".cache" / "app-server.json"
+
+# Ruta profunda para comprobar las rewrites de la SPA
+HEALTH_CHECK_ROUTE = "/movie/550"
+
+# El contenedor de React de index.html
+_ROOT_ELEMENT = re.compile(rb"""id=["']?root\b""")
+
+
+def base_url():
+    """URL de la app para los tests (la del servidor compartido si lo hay)"""
+    return os.environ.get(BASE_URL_ENV, DEFAULT_BASE_URL).rstrip("/")
+
+
+def free_port():
+    """Pide al sistema un puerto TCP libre"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def is_server_ready(url, timeout=2):
+    """True si la URL responde 200"""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return response.status == 200
+    except (urllib.error.URLError, OSError):
+        return False
+
+
+def health_check(url, timeout=2):
+    """
+    True si el servidor sirve la app: index.html con el <div id="root"> en
+    la raíz y en una ruta profunda (rewrites de SPA).
+    """
+    for path in ("/", HEALTH_CHECK_ROUTE):
+        try:
+            with urllib.request.urlopen(f"{url}{path}", timeout=timeout) as response:
+                if response.status != 200 or not _ROOT_ELEMENT.search(response.read()):
+                    return False
+        except (urllib.error.URLError, OSError):
+            return False
+    return True
+
+
+def wait_until_ready(url, timeout=60, process=None):
+    """Espera a que el servidor sirva la app; falla si el proceso muere o se agota el tiempo"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"El servidor terminó antes de estar listo (código {process.returncode})")
+        if health_check(url):
+            return
+        time.sleep(0.2)
+    raise RuntimeError(f"El servidor no respondió en {timeout}s: {url}")
+
+
+# ============================================================================
+# Build de producción con caché
+# ============================================================================
+
+def source_hash(root=PROJECT_ROOT, inputs=BUILD_INPUTS):
+    """sha256 de las rutas y el contenido de todo lo que entra en la build"""
+    root = Path(root)
+    digest = hashlib.sha256()
+    for name in inputs:
+        path = root / name
+        files = sorted(file for file in path.rglob("*") if file.is_file()) if path.is_dir() else [path]
+        for file in files:
+            if not file.is_file():
+                continue
+            digest.update(file.relative_to(root).as_posix().encode("utf-8") + b"\0")
+            digest.update(file.read_bytes())
+    return digest.hexdigest()
+
+
+def build_hash(dist_dir=DEFAULT_DIST):
+    """Hash de las fuentes con las que se construyó dist/ (None si no hay sello)"""
+    stamp = Path(dist_dir) / BUILD_STAMP
+    if not stamp.exists():
+        return None
+    return json.loads(stamp.read_text(encoding="utf-8")).get("hash")
+
+
+def ensure_build(dist_dir=DEFAULT_DIST, root=PROJECT_ROOT, force=False):
+    """
+    Construye la app si dist/ no corresponde a las fuentes actuales.
+
+    Devuelve (hash, construida): construida es False si se reutilizó dist/.
+    """
+    dist_dir = Path(dist_dir)
+    lock = Path(root) / ".cache" / "build.lock"
+    lock.parent.mkdir(parents=True, exist_ok=True)
+    # Otra ejecución puede estar construyendo a la vez
+    with file_lock(lock, timeout=600):
+        current = source_hash(root)
+        if not force and build_hash(dist_dir) == current and (dist_dir / "index.html").exists():
+            return current, False
+        started = time.monotonic()
+        result = subprocess.run(
+            ["npm", "run", "build", "--", "--outDir", str(dist_dir), "--emptyOutDir"],
+            cwd=root,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            output = (result.stdout + result.stderr).strip().splitlines()
+            raise RuntimeError("npm run build falló:\n" + "\n".join(output[-20:]))
+        (dist_dir / BUILD_STAMP).write_text(
+            json.dumps({"hash": current, "seconds": round(time.monotonic() - started, 1)}) + "\n",
+            encoding="utf-8",
+        )
+        return current, True
+
+
+# ============================================================================
+# Servidores
+# ============================================================================
+
+class SPARequestHandler(SimpleHTTPRequestHandler):
+    """Sirve archivos estáticos y manda cualquier otra ruta a index.html (como vercel.json)"""
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if not os.path.exists(path):
+            self.path = "/index.html"
+        return super().send_head()
+
+    def end_headers(self):
+        self.send_header("Permissions-Policy", "screen-wake-lock=(self)")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_dist(dist_dir, port):
+    """Servidor estático de dist/ con rewrites de SPA (ya escuchando; falta serve_forever)"""
+    handler = partial(SPARequestHandler, directory=str(dist_dir))
+    return ThreadingHTTPServer(("127.0.0.1", port), handler)
+
+
+def _vite(*args):
+    # Llamamos a vite directamente (no a través de npm) para poder pararlo limpio
+    return [str(PROJECT_ROOT / "node_modules" / ".bin" / "vite"), *args]
+
+
+def server_command(mode, port, dist_dir=DEFAULT_DIST):
+    """Comando que arranca el servidor de un modo en un proceso aparte"""
+    listen = ["--port", str(port), "--strictPort", "--host", "127.0.0.1"]
+    if mode == "dev":
+        return _vite(*listen)
+    if mode == "preview":
+        return _vite("preview", "--outDir", str(dist_dir), *listen)
+    return [sys.executable, "-m", "movieverse_testing.server", "serve",
+            "--dist", str(dist_dir), "--port", str(port)]
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except (OSError, TypeError):
+        return False
+    return True
+
+
+def load_server_state(path=DEFAULT_SERVER_STATE):
+    path = Path(path)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def stop_recorded_server(path=DEFAULT_SERVER_STATE):
+    """Para el servidor reutilizable apuntado en path; True si había uno vivo"""
+    state = load_server_state(path)
+    Path(path).unlink(missing_ok=True)
+    if state is None or not _pid_alive(state.get("pid")):
+        return False
+    try:
+        # Se arrancó en su propia sesión: se para el grupo entero (npm/vite y sus hijos)
+        os.killpg(state["pid"], signal.SIGTERM)
+    except OSError:
+        os.kill(state["pid"], signal.SIGTERM)
+    return True
+
+
+class AppServer:
+    """Servidor de la app con ciclo de vida start()/stop()"""
+
+    def __init__(self, mode="external", port=None, dist_dir=DEFAULT_DIST, build=True, reuse=False,
+                 state_path=DEFAULT_SERVER_STATE):
+        if mode not in SERVER_MODES:
+            raise ValueError(f"Modo de servidor desconocido: {mode} (usa uno de {SERVER_MODES})")
+        self.mode = mode
+        self.port = port
+        self.dist_dir = Path(dist_dir)
+        self.build = build
+        self.reuse = reuse
+        self.state_path = Path(state_path)
+        self.url = DEFAULT_BASE_URL
+        self.build_hash = None
+        self.built = False
+        self.reused = False
+        self._process = None
+        self._httpd = None
+
+    def start(self):
+        """Arranca el servidor (si el modo lo requiere) y devuelve su URL"""
+        if self.mode == "external":
+            self.url = base_url()
+            return self.url
+
+        if self.mode in ("dist", "preview"):
+            if self.build:
+                self.build_hash, self.built = ensure_build(self.dist_dir)
+            if not (self.dist_dir / "index.html").exists():
+                raise RuntimeError(f"No existe {self.dist_dir}/index.html. Ejecuta 'npm run build' primero")
+
+        if self.reuse and self._reuse_running():
+            return self.url
+
+        port = self.port or free_port()
+        self.url = f"http://127.0.0.1:{port}"
+        if self.mode == "dist" and not self.reuse:
+            self._httpd = serve_dist(self.dist_dir, port)
+            threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+            wait_until_ready(self.url)
+            return self.url
+
+        self._process = subprocess.Popen(
+            server_command(self.mode, port, self.dist_dir),
+            cwd=PROJECT_ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            # El servidor reutilizable sobrevive a pytest (y a un Ctrl+C)
+            start_new_session=self.reuse,
+        )
+        wait_until_ready(self.url, process=self._process)
+        if self.reuse:
+            self._save_state()
+        return self.url
+
+    def _reuse_running(self):
+        """Usa el servidor de una ejecución anterior si sigue sirviendo lo mismo"""
+        state = load_server_state(self.state_path)
+        if state is not None and (
+            state.get("mode") == self.mode
+            and state.get("dist_dir") == str(self.dist_dir)
+            and state.get("build_hash") == self.build_hash
+            and (self.port is None or state.get("url", "").endswith(f":{self.port}"))
+            and _pid_alive(state.get("pid"))
+            and health_check(state["url"])
+        ):
+            self.url = state["url"]
+            self.reused = True
+            return True
+        # Otro modo, otra build o muerto: se para (si queda algo) y se arranca uno nuevo
+        stop_recorded_server(self.state_path)
+        return False
+
+    def _save_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self.state_path.write_text(json.dumps({
+            "mode": self.mode,
+            "url": self.url,
+            "pid": self._process.pid,
+            "dist_dir": str(self.dist_dir),
+            "build_hash": self.build_hash,
+        }, indent=1) + "\n", encoding="utf-8")
+
+    def describe(self):
+        """Una línea para la cabecera de pytest"""
+        if self.mode == "external":
+            return f"App: {self.url} (servidor externo)"
+        details = []
+        if self.build_hash is not None:
+            details.append(f"build {self.build_hash[:10]} {'nueva' if self.built else 'en caché'}")
+        if self.reused:
+            details.append("servidor reutilizado")
+        elif self.reuse:
+            details.append("queda corriendo al terminar")
+        suffix = f" ({', '.join(details)})" if details else ""
+        return f"App: {self.url} [{self.mode}]{suffix}"
+
+    def stop(self):
+        """Para el servidor si lo arrancamos nosotros (salvo el reutilizable)"""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        if self._process is not None and not self.reuse:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        self._process = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build y servidor de la app para los tests")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    build_parser = subcommands.add_parser("build", help="Construye dist/ si las fuentes cambiaron")
+    build_parser.add_argument("--force", action="store_true", help="Construir aunque el hash coincida")
+    serve_parser = subcommands.add_parser("serve", help="Sirve dist/ con rewrites de SPA (en primer plano)")
+    serve_parser.add_argument("--dist", type=Path, default=DEFAULT_DIST)
+    serve_parser.add_argument("--port", type=int, default=4173)
+    subcommands.add_parser("status", help="Muestra el servidor reutilizable (--app-server-reuse)")
+    subcommands.add_parser("stop", help="Para el servidor reutilizable")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        current, built = ensure_build(force=args.force)
+        print(f"{'Construida' if built else 'Sin cambios'}: dist/ ({current[:10]})")
+    elif args.command == "serve":
+        httpd = serve_dist(args.dist, args.port)
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            httpd.server_close()
+    elif args.command == "status":
+        state = load_server_state()
+        if state is None or not _pid_alive(state.get("pid")):
+            print("No hay servidor reutilizable corriendo")
+            return 1
+        healthy = "responde" if health_check(state["url"]) else "NO responde"
+        print(f"{state['mode']} en {state['url']} (pid {state['pid']}, {healthy})")
+    else:
+        print("Servidor parado" if stop_recorded_server() else "No había servidor corriendo")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
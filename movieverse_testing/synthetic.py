@@ -0,0 +1,594 @@
+"""
+🏗️ CATÁLOGO SINTÉTICO A GRAN ESCALA - MOVIEVERSE TESTING
+=========================================================
+
+Las respuestas reales de TMDB traen 20 resultados por página, repartos de
+unas decenas de personas y series de pocas temporadas, así que nunca vemos
+cómo se portan MovieRow, TVSeriesRow o las páginas de detalle con entradas
+grandes. SyntheticCatalog genera respuestas con el esquema de
+src/types/movie.types.ts del tamaño que se pida:
+
+    catalogo = SyntheticCatalog(CatalogScale(results=5000, cast=500, seasons=50), seed=1)
+    catalogo.install(page)              # responde a TMDB desde el siguiente page.goto
+
+Los datos son deterministas (misma semilla y mismo id → mismo payload) y
+los endpoints que no genera (watch/providers) pasan con route.fallback()
+al siguiente handler (--tmdb=replay o la red).
+
+TypeSchema lee las interfaces de movie.types.ts para comprobar que lo
+generado es válido: validate(payload, "MovieDetail") devuelve los errores.
+
+measure_scaling() carga una vista con tamaños crecientes y mide tiempo de
+render, nodos DOM y heap para ver cómo crecen con la entrada:
+
+    reparto (cast, crew) en /movie/550
+            n    render    nodos     heap
+           20     412ms     1243    9.8MB
+          500     455ms     1251   12.1MB
+      crecimiento: render n^0.03, nodos n^0.00, heap n^0.07
+"""
+
+import json
+import math
+import random
+import re
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+from movieverse_testing.metrics import measure_route
+from movieverse_testing.profiles import supports_throttling
+from movieverse_testing.routes import SAMPLE_MOVIE_ID, SAMPLE_TV_ID
+from movieverse_testing.tmdb_replay import TMDB_URL_PATTERN, normalize_request, path_template
+
+# Tipos de la app contra los que se validan los payloads
+DEFAULT_TYPES = Path(__file__).resolve().parent.parent / "src" / "types" / "movie.types.ts"
+
+MOVIE_GENRES = [
+    (28, "Acción"), (12, "Aventura"), (16, "Animación"), (35, "Comedia"), (80, "Crimen"),
+    (99, "Documental"), (18, "Drama"), (10751, "Familia"), (14, "Fantasía"), (36, "Historia"),
+    (27, "Terror"), (10402, "Música"), (9648, "Misterio"), (10749, "Romance"),
+    (878, "Ciencia ficción"), (53, "Suspense"), (10752, "Bélica"), (37, "Western"),
+]
+TV_GENRES = [
+    (10759, "Action & Adventure"), (16, "Animación"), (35, "Comedia"), (80, "Crimen"),
+    (99, "Documental"), (18, "Drama"), (10751, "Familia"), (9648, "Misterio"),
+    (10765, "Sci-Fi & Fantasy"), (10768, "War & Politics"), (37, "Western"),
+]
+
+_WORDS = [
+    "sombra", "último", "reino", "noche", "ciudad", "viaje", "fuego", "silencio", "estrella", "camino",
+    "guardián", "tormenta", "secreto", "horizonte", "eco", "frontera", "memoria", "lobo", "océano", "cristal",
+]
+_NAMES = ["Ana", "Luis", "Marta", "Jorge", "Elena", "Pablo", "Lucía", "Diego", "Sara", "Hugo", "Irene", "Raúl"]
+_SURNAMES = ["García", "López", "Martín", "Sánchez", "Romero", "Navarro", "Torres", "Ruiz", "Molina", "Vega"]
+_CREW_JOBS = [
+    ("Director", "Directing"), ("Screenplay", "Writing"), ("Producer", "Production"),
+    ("Director of Photography", "Camera"), ("Original Music Composer", "Sound"), ("Editor", "Editing"),
+    ("Casting", "Production"), ("Costume Design", "Costume & Make-Up"), ("Visual Effects", "Visual Effects"),
+]
+
+# Listados que devuelven películas / series
+_MOVIE_LISTS = {
+    "movie/popular", "movie/top_rated", "movie/upcoming", "movie/now_playing", "trending/movie/week",
+    "search/movie", "movie/{id}/recommendations", "movie/{id}/similar",
+}
+_TV_LISTS = {
+    "tv/popular", "tv/top_rated", "tv/on_the_air", "tv/airing_today", "trending/tv/week",
+    "search/tv", "tv/{id}/recommendations", "tv/{id}/similar",
+}
+
+
+@dataclass(frozen=True)
+class CatalogScale:
+    """Tamaño de cada colección generada"""
+
+    results: int = 20       # elementos por listado
+    cast: int = 20
+    crew: int = 20
+    seasons: int = 5
+    episodes: int = 10      # por temporada
+    images: int = 10        # backdrops y posters (logos: la cuarta parte)
+    videos: int = 5
+
+
+class SyntheticCatalog:
+    """Genera respuestas de TMDB con el esquema de movie.types.ts y el tamaño de CatalogScale"""
+
+    def __init__(self, scale=None, seed=0):
+        self.scale = scale or CatalogScale()
+        self.seed = seed
+        self.served = 0
+
+    def _rng(self, *key):
+        # Una semilla por elemento: el mismo id da lo mismo aunque cambie el orden de las peticiones
+        return random.Random(":".join(str(part) for part in (self.seed, *key)))
+
+    @staticmethod
+    def _image(kind, *key):
+        return f"/sintetico-{kind}-{'-'.join(str(part) for part in key)}.jpg"
+
+    def _title(self, rng):
+        words = rng.sample(_WORDS, rng.randint(1, 3))
+        return " ".join(words).capitalize()
+
+    def _person(self, rng):
+        return f"{rng.choice(_NAMES)} {rng.choice(_SURNAMES)}"
+
+    def _date(self, rng, start=1960, end=2026):
+        return f"{rng.randint(start, end)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+    def _genres(self, rng, genres):
+        return [{"id": genre_id, "name": name} for genre_id, name in rng.sample(genres, rng.randint(1, 3))]
+
+    # ------------------------------------------------------------------
+    # 🎬 Películas
+    # ------------------------------------------------------------------
+    def movie(self, movie_id):
+        """Movie (lo que sale en los listados)"""
+        rng = self._rng("movie", movie_id)
+        title = self._title(rng)
+        genres = self._genres(rng, MOVIE_GENRES)
+        return {
+            "id": movie_id,
+            "title": title,
+            "original_title": title,
+            "overview": f"{title}: " + " ".join(rng.choices(_WORDS, k=30)) + ".",
+            "poster_path": self._image("poster", "movie", movie_id),
+            "backdrop_path": self._image("backdrop", "movie", movie_id),
+            "vote_average": round(rng.uniform(4, 9), 1),
+            "vote_count": rng.randint(10, 30000),
+            "release_date": self._date(rng),
+            "genres": genres,
+            "genre_ids": [genre["id"] for genre in genres],
+            "popularity": round(rng.uniform(1, 5000), 3),
+            "adult": False,
+            "original_language": rng.choice(["es", "en", "fr", "ja", "ko"]),
+            "video": False,
+        }
+
+    def movie_detail(self, movie_id):
+        """MovieDetail con todo lo que pide append_to_response"""
+        rng = self._rng("movie-detail", movie_id)
+        detail = self.movie(movie_id)
+        detail.update({
+            "budget": rng.randint(1, 300) * 1_000_000,
+            "revenue": rng.randint(0, 2000) * 1_000_000,
+            "runtime": rng.randint(80, 200),
+            "status": "Released",
+            "tagline": self._title(rng) + ".",
+            "homepage": f"https://example.com/pelicula/{movie_id}",
+            "imdb_id": f"tt{movie_id:07d}",
+            "production_companies": self._companies(rng),
+            "production_countries": [{"iso_3166_1": "ES", "name": "Spain"}],
+            "spoken_languages": [{"iso_639_1": "es", "name": "Español", "english_name": "Spanish"}],
+            "credits": self.credits("movie", movie_id),
+            "videos": self.videos("movie", movie_id),
+            "images": self.images("movie", movie_id),
+            "recommendations": self.listing("movie", f"movie/{movie_id}/recommendations"),
+            "similar": self.listing("movie", f"movie/{movie_id}/similar"),
+        })
+        return detail
+
+    # ------------------------------------------------------------------
+    # 📺 Series
+    # ------------------------------------------------------------------
+    def tv(self, tv_id):
+        """TVSeries (lo que sale en los listados)"""
+        rng = self._rng("tv", tv_id)
+        name = self._title(rng)
+        genres = self._genres(rng, TV_GENRES)
+        seasons = self.scale.seasons
+        return {
+            "id": tv_id,
+            "name": name,
+            "original_name": name,
+            "overview": f"{name}: " + " ".join(rng.choices(_WORDS, k=30)) + ".",
+            "poster_path": self._image("poster", "tv", tv_id),
+            "backdrop_path": self._image("backdrop", "tv", tv_id),
+            "vote_average": round(rng.uniform(4, 9), 1),
+            "vote_count": rng.randint(10, 30000),
+            "first_air_date": self._date(rng, end=2020),
+            "last_air_date": self._date(rng, start=2021),
+            "genres": genres,
+            "genre_ids": [genre["id"] for genre in genres],
+            "popularity": round(rng.uniform(1, 5000), 3),
+            "adult": False,
+            "original_language": rng.choice(["es", "en", "ko"]),
+            "origin_country": ["ES"],
+            "episode_run_time": [rng.randint(20, 60)],
+            "in_production": rng.random() < 0.3,
+            "number_of_episodes": seasons * self.scale.episodes,
+            "number_of_seasons": seasons,
+            "status": "Returning Series",
+            "type": "Scripted",
+        }
+
+    def tv_detail(self, tv_id):
+        """TVSeriesDetail con temporadas, créditos, vídeos e imágenes"""
+        rng = self._rng("tv-detail", tv_id)
+        detail = self.tv(tv_id)
+        detail.update({
+            "created_by": [
+                {"id": 900000 + index, "name": self._person(rng), "profile_path": self._image("profile", "creator", index),
+                 "gender": rng.randint(1, 2), "credit_id": f"c{tv_id}-{index}"}
+                for index in range(rng.randint(1, 3))
+            ],
+            "networks": [{"id": 213, "name": "Netflix", "logo_path": "/sintetico-logo-213.png", "origin_country": "US"}],
+            "production_companies": self._companies(rng),
+            "production_countries": [{"iso_3166_1": "ES", "name": "Spain"}],
+            "spoken_languages": [{"iso_639_1": "es", "name": "Español", "english_name": "Spanish"}],
+            "seasons": [self.season(tv_id, number) for number in range(1, self.scale.seasons + 1)],
+            "homepage": f"https://example.com/serie/{tv_id}",
+            "tagline": self._title(rng) + ".",
+            "credits": self.credits("tv", tv_id),
+            "videos": self.videos("tv", tv_id),
+            "images": self.images("tv", tv_id),
+            "recommendations": self.listing("tv", f"tv/{tv_id}/recommendations"),
+            "similar": self.listing("tv", f"tv/{tv_id}/similar"),
+        })
+        return detail
+
+    def season(self, tv_id, number):
+        """Season (lo que lista el detalle de la serie)"""
+        rng = self._rng("season", tv_id, number)
+        return {
+            "air_date": self._date(rng),
+            "episode_count": self.scale.episodes,
+            "id": tv_id * 1000 + number,
+            "name": f"Temporada {number}",
+            "overview": " ".join(rng.choices(_WORDS, k=20)) + ".",
+            "poster_path": self._image("poster", "season", tv_id, number),
+            "season_number": number,
+        }
+
+    def season_detail(self, tv_id, number):
+        """SeasonDetail con scale.episodes episodios"""
+        detail = self.season(tv_id, number)
+        detail["episodes"] = [self.episode(tv_id, number, episode) for episode in range(1, self.scale.episodes + 1)]
+        return detail
+
+    def episode(self, tv_id, season, number):
+        rng = self._rng("episode", tv_id, season, number)
+        return {
+            "id": (tv_id * 1000 + season) * 1000 + number,
+            "name": self._title(rng),
+            "overview": " ".join(rng.choices(_WORDS, k=25)) + ".",
+            "air_date": self._date(rng),
+            "episode_number": number,
+            "runtime": rng.randint(20, 60),
+            "season_number": season,
+            "show_id": tv_id,
+            "still_path": self._image("still", tv_id, season, number),
+            "vote_average": round(rng.uniform(5, 9.5), 1),
+            "vote_count": rng.randint(0, 500),
+            "crew": [],
+            "guest_stars": [],
+        }
+
+    # ------------------------------------------------------------------
+    # 👥 Créditos, vídeos, imágenes y listados
+    # ------------------------------------------------------------------
+    def credits(self, kind, item_id):
+        """MovieCredits / TVCredits con scale.cast actores y scale.crew técnicos"""
+        rng = self._rng("credits", kind, item_id)
+        cast = [
+            {"id": 100000 + index, "name": self._person(rng), "character": self._title(rng),
+             "profile_path": self._image("profile", kind, item_id, index), "cast_id": index,
+             "credit_id": f"{kind}{item_id}-cast-{index}", "order": index, "gender": rng.randint(0, 2),
+             "known_for_department": "Acting"}
+            for index in range(self.scale.cast)
+        ]
+        crew = []
+        for index in range(self.scale.crew):
+            job, department = rng.choice(_CREW_JOBS)
+            crew.append({
+                "id": 500000 + index, "name": self._person(rng), "job": job, "department": department,
+                "profile_path": self._image("profile", kind, item_id, "crew", index),
+                "credit_id": f"{kind}{item_id}-crew-{index}", "gender": rng.randint(0, 2),
+                "known_for_department": department,
+            })
+        return {"id": item_id, "cast": cast, "crew": crew}
+
+    def videos(self, kind, item_id):
+        """MovieVideos / TVVideos: tráilers y teasers de YouTube en español"""
+        rng = self._rng("videos", kind, item_id)
+        return {"id": item_id, "results": [
+            {"id": f"{kind}{item_id}v{index}", "iso_639_1": "es", "iso_3166_1": "ES",
+             "key": f"sintetico{index:05d}", "name": f"Tráiler {index + 1}", "site": "YouTube",
+             "type": rng.choice(["Trailer", "Teaser", "Featurette"]), "size": 1080, "official": True,
+             "published_at": self._date(rng) + "T10:00:00.000Z"}
+            for index in range(self.scale.videos)
+        ]}
+
+    def images(self, kind, item_id):
+        """images de append_to_response (no está en movie.types.ts, pero viaja en el detalle)"""
+        def image(image_kind, index, aspect):
+            return {"file_path": self._image(image_kind, kind, item_id, index), "aspect_ratio": aspect,
+                    "height": 1080, "width": round(1080 * aspect), "iso_639_1": None,
+                    "vote_average": 5.3, "vote_count": 2}
+
+        count = self.scale.images
+        return {
+            "id": item_id,
+            "backdrops": [image("backdrop", index, 1.778) for index in range(count)],
+            "posters": [image("poster", index, 0.667) for index in range(count)],
+            "logos": [image("logo", index, 3.2) for index in range(count // 4)],
+        }
+
+    def listing(self, kind, path, page=1):
+        """MoviesResponse / TVSeriesResponse con scale.results elementos en la página pedida"""
+        size = self.scale.results
+        # Ids estables por listado y página para que distintas filas no repitan películas
+        offset = (sum(path.encode()) % 997) * 100_000 + (page - 1) * size + 1
+        make = self.movie if kind == "movie" else self.tv
+        return {
+            "page": page,
+            "results": [make(offset + index) for index in range(size)],
+            "total_pages": 500,
+            "total_results": 500 * size,
+        }
+
+    def _companies(self, rng):
+        return [{"id": 1000 + index, "name": f"{rng.choice(_SURNAMES)} Films", "logo_path": None,
+                 "origin_country": "ES"} for index in range(rng.randint(1, 4))]
+
+    def genres(self, kind):
+        return {"genres": [{"id": genre_id, "name": name}
+                           for genre_id, name in (MOVIE_GENRES if kind == "movie" else TV_GENRES)]}
+
+    # ------------------------------------------------------------------
+    # 🔌 Interceptación
+    # ------------------------------------------------------------------
+    def payload(self, url):
+        """Respuesta para una URL de TMDB, o None si el endpoint no se genera"""
+        path, _ = normalize_request(url)
+        template = path_template(path)
+        numbers = [int(segment) for segment in path.split("/") if segment.isdigit()]
+        page = int(dict(parse_qsl(urlsplit(url).query)).get("page", 1))
+        if template in _MOVIE_LISTS:
+            return self.listing("movie", path, page)
+        if template in _TV_LISTS:
+            return self.listing("tv", path, page)
+        generators = {
+            "movie/{id}": lambda: self.movie_detail(numbers[0]),
+            "tv/{id}": lambda: self.tv_detail(numbers[0]),
+            "tv/{id}/season/{n}": lambda: self.season_detail(*numbers),
+            "movie/{id}/credits": lambda: self.credits("movie", numbers[0]),
+            "tv/{id}/credits": lambda: self.credits("tv", numbers[0]),
+            "movie/{id}/videos": lambda: self.videos("movie", numbers[0]),
+            "tv/{id}/videos": lambda: self.videos("tv", numbers[0]),
+            "movie/{id}/images": lambda: self.images("movie", numbers[0]),
+            "tv/{id}/images": lambda: self.images("tv", numbers[0]),
+            "genre/movie/list": lambda: self.genres("movie"),
+            "genre/tv/list": lambda: self.genres("tv"),
+        }
+        generate = generators.get(template)
+        return generate() if generate else None
+
+    def route_handler(self, route):
+        payload = self.payload(route.request.url)
+        if payload is None:
+            return route.fallback()
+        self.served += 1
+        return route.fulfill(
+            status=200,
+            body=json.dumps(payload, ensure_ascii=False),
+            headers={"content-type": "application/json;charset=utf-8", "access-control-allow-origin": "*"},
+        )
+
+    def install(self, target):
+        """Instala el handler en un BrowserContext o Page (gana a --tmdb=replay si va en la Page)"""
+        target.route(TMDB_URL_PATTERN, self.route_handler)
+
+    def uninstall(self, target):
+        target.unroute(TMDB_URL_PATTERN, self.route_handler)
+
+
+# ============================================================================
+# ✅ VALIDACIÓN CONTRA movie.types.ts
+# ============================================================================
+
+_INTERFACE = re.compile(r"export interface (\w+)(?:\s+extends\s+(\w+))?\s*\{(.*?)\n\}", re.S)
+_FIELD = re.compile(r"^\s*(\w+)(\?)?:\s*([^;]+);", re.M)
+
+
+class TypeSchema:
+    """Interfaces de TypeScript (campos, tipos y opcionales) para validar payloads"""
+
+    def __init__(self, interfaces):
+        self.interfaces = interfaces
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_TYPES):
+        source = Path(path).read_text(encoding="utf-8")
+        raw = {name: (parent, body) for name, parent, body in _INTERFACE.findall(source)}
+
+        def fields(name):
+            parent, body = raw[name]
+            result = dict(fields(parent)) if parent else {}
+            for field_name, optional, type_text in _FIELD.findall(body):
+                result[field_name] = (type_text.strip(), bool(optional))
+            return result
+
+        return cls({name: fields(name) for name in raw})
+
+    def validate(self, value, type_text, where="$"):
+        """Lista de errores ("$.credits.cast[3].order: se esperaba number") o [] si es válido"""
+        type_text = type_text.strip()
+        if "|" in type_text:
+            options = [option.strip() for option in type_text.split("|")]
+            if any(not self.validate(value, option, where) for option in options):
+                return []
+            return [f"{where}: se esperaba {type_text}, llegó {_type_name(value)}"]
+        if type_text.endswith("[]"):
+            if not isinstance(value, list):
+                return [f"{where}: se esperaba {type_text}, llegó {_type_name(value)}"]
+            errors = []
+            for index, item in enumerate(value):
+                errors += self.validate(item, type_text[:-2], f"{where}[{index}]")
+            return errors
+        primitives = {
+            "string": lambda v: isinstance(v, str),
+            "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+            "boolean": lambda v: isinstance(v, bool),
+            "null": lambda v: v is None,
+        }
+        if type_text in primitives:
+            return [] if primitives[type_text](value) else [
+                f"{where}: se esperaba {type_text}, llegó {_type_name(value)}"]
+        if type_text not in self.interfaces:
+            # any, Record<...> y tipos que no vienen de este archivo
+            return []
+        if not isinstance(value, dict):
+            return [f"{where}: se esperaba {type_text}, llegó {_type_name(value)}"]
+        errors = []
+        for field_name, (field_type, optional) in self.interfaces[type_text].items():
+            if field_name not in value:
+                if not optional:
+                    errors.append(f"{where}.{field_name}: falta (obligatorio en {type_text})")
+                continue
+            errors += self.validate(value[field_name], field_type, f"{where}.{field_name}")
+        return errors
+
+
+def _type_name(value):
+    if value is None:
+        return "null"
+    return {bool: "boolean", int: "number", float: "number", str: "string", list: "array", dict: "object"}.get(
+        type(value), type(value).__name__)
+
+
+# ============================================================================
+# 📈 BENCHMARK DE ESCALADO
+# ============================================================================
+
+# Nodos DOM y momento de la última mutación (el último render de React)
+SCALE_PROBE_SCRIPT = """
+(() => {
+  if (window.__movieverseScale) return;
+  const state = { lastMutation: 0 };
+  window.__movieverseScale = state;
+  new MutationObserver(() => { state.lastMutation = performance.now(); })
+    .observe(document, { childList: true, subtree: true });
+})();
+"""
+
+
+@dataclass(frozen=True)
+class ScaleTarget:
+    """Una vista y las dimensiones de CatalogScale que se hacen crecer"""
+
+    name: str
+    path: str
+    dimensions: tuple
+    sizes: tuple
+
+    def scale(self, size):
+        return replace(CatalogScale(), **{dimension: size for dimension in self.dimensions})
+
+
+SCALE_TARGETS = {
+    # MoviesPage / TVSeriesPage: cinco filas con todo el listado cada una
+    "filas-peliculas": ScaleTarget("filas-peliculas", "/movies", ("results",), (20, 200, 1000, 5000)),
+    "filas-series": ScaleTarget("filas-series", "/tv", ("results",), (20, 200, 1000, 5000)),
+    "reparto": ScaleTarget("reparto", f"/movie/{SAMPLE_MOVIE_ID}", ("cast", "crew"), (20, 100, 500, 2000)),
+    "temporadas": ScaleTarget("temporadas", f"/tv/{SAMPLE_TV_ID}", ("seasons", "episodes"), (5, 20, 50, 200)),
+    "imagenes": ScaleTarget("imagenes", f"/movie/{SAMPLE_MOVIE_ID}", ("images", "videos"), (10, 100, 1000, 5000)),
+}
+
+
+def growth_exponent(sizes, values):
+    """
+    Pendiente de log(valor) frente a log(n) por mínimos cuadrados: ~0 no
+    crece con la entrada, ~1 crece lineal, >1 peor que lineal. None si no
+    hay al menos dos puntos positivos.
+    """
+    points = [(math.log(size), math.log(value)) for size, value in zip(sizes, values)
+              if size and value is not None and value > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if not spread:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+@dataclass
+class ScalingPoint:
+    """Mediciones de una vista con un tamaño de entrada"""
+
+    size: int
+    render_ms: float           # desde el inicio de la navegación hasta la última mutación del DOM
+    dom_nodes: int
+    heap_bytes: int = None     # heap de JS tras un GC (solo Chromium)
+    tbt: float = 0.0
+
+
+@dataclass
+class ScalingReport:
+    target: ScaleTarget
+    points: list = field(default_factory=list)
+
+    def exponent(self, attribute):
+        return growth_exponent([point.size for point in self.points],
+                               [getattr(point, attribute) for point in self.points])
+
+    def lines(self):
+        def exponent(attribute):
+            value = self.exponent(attribute)
+            return f"n^{value:.2f}" if value is not None else "-"
+
+        lines = [f"{self.target.name} ({', '.join(self.target.dimensions)}) en {self.target.path}",
+                 f"  {'n':>6} {'render':>9} {'nodos':>8} {'heap':>8} {'TBT':>7}"]
+        for point in self.points:
+            heap = f"{point.heap_bytes / 1_048_576:.1f}MB" if point.heap_bytes is not None else "-"
+            lines.append(f"  {point.size:>6} {point.render_ms:>7.0f}ms {point.dom_nodes:>8} {heap:>8} "
+                         f"{point.tbt:>5.0f}ms")
+        lines.append(f"  crecimiento: render {exponent('render_ms')}, nodos {exponent('dom_nodes')}, "
+                     f"heap {exponent('heap_bytes')}")
+        return lines
+
+
+def _heap_after_gc(page):
+    session = page.context.new_cdp_session(page)
+    try:
+        session.send("Performance.enable")
+        session.send("HeapProfiler.collectGarbage")
+        metrics = {item["name"]: item["value"] for item in session.send("Performance.getMetrics")["metrics"]}
+        return int(metrics.get("JSHeapUsedSize", 0)) or None
+    finally:
+        session.detach()
+
+
+def measure_scaling(page, base_url, target, sizes=None, seed=0, timeout=60000):
+    """
+    Carga target.path con cada tamaño (catálogo sintético instalado en la
+    Page) y devuelve un ScalingReport con la curva de crecimiento.
+    """
+    target = SCALE_TARGETS[target] if isinstance(target, str) else target
+    report = ScalingReport(target)
+    page.add_init_script(script=SCALE_PROBE_SCRIPT)
+    chromium = supports_throttling(page)
+    for size in sizes or target.sizes:
+        catalog = SyntheticCatalog(target.scale(size), seed=seed)
+        catalog.install(page)
+        try:
+            metrics = measure_route(page, base_url, target.path, route=target.name,
+                                    heading=None, images=False, timeout=timeout)
+            probe = page.evaluate(
+                "() => ({ render: window.__movieverseScale.lastMutation,"
+                " nodes: document.getElementsByTagName('*').length })"
+            )
+            report.points.append(ScalingPoint(
+                size=size,
+                render_ms=probe["render"],
+                dom_nodes=probe["nodes"],
+                heap_bytes=_heap_after_gc(page) if chromium else metrics.js_heap_bytes,
+                tbt=metrics.tbt,
+            ))
+        finally:
+            catalog.uninstall(page)
+    return report
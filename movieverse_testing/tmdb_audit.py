@@ -0,0 +1,188 @@
+"""
+🔎 AUDITORÍA DE LLAMADAS A TMDB - MOVIEVERSE TESTING
+====================================================
+
+TMDB limita las peticiones por segundo, así que cada llamada de más cuenta.
+TMDBAuditor escucha page.on("request"), reparte las llamadas por page view
+(cada cambio de pathname, también los de la SPA) y detecta:
+
+    duplicate   la misma ruta + query pedida más de una vez en la vista
+    redundant   un sub-recurso (movie/{id}/videos) que ya venía en el
+                append_to_response de movie/{id} pedido en la misma vista
+
+El máximo de llamadas por ruta es "tmdb_requests" en performance_budgets.json.
+
+Uso:
+    auditor = TMDBAuditor()
+    auditor.attach(page)
+    page.goto(BASE_URL)
+    ...
+    print(auditor.report())
+    assert not auditor.findings("duplicate")
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from urllib.parse import parse_qsl, urlsplit
+
+from movieverse_testing.budgets import BudgetViolation
+from movieverse_testing.routes import route_for_path
+from movieverse_testing.tmdb_replay import normalize_request, path_template
+
+TMDB_API_PREFIX = "https://api.themoviedb.org/"
+
+
+@dataclass
+class TMDBCall:
+    """Una petición a TMDB (ruta y query ya normalizadas, sin api_key)"""
+
+    path: str
+    query: str
+    url: str
+
+    @property
+    def endpoint(self):
+        """Ruta con los ids sustituidos: movie/550/videos → movie/{id}/videos"""
+        return path_template(self.path)
+
+    @property
+    def params(self):
+        return dict(parse_qsl(self.query, keep_blank_values=True))
+
+
+@dataclass
+class PageView:
+    """Llamadas hechas mientras la página mostraba un pathname"""
+
+    pathname: str
+    calls: list = field(default_factory=list)
+
+    @property
+    def route(self):
+        return route_for_path(self.pathname)
+
+    def groups(self):
+        """Counter de (endpoint, query) → número de llamadas"""
+        return Counter((call.endpoint, call.query) for call in self.calls)
+
+
+@dataclass
+class AuditFinding:
+    """Llamada duplicada o redundante dentro de una vista"""
+
+    kind: str
+    pathname: str
+    request: str
+    count: int
+    detail: str
+
+    def describe(self):
+        return f"[{self.kind}] {self.pathname}: {self.request} ×{self.count} — {self.detail}"
+
+
+class TMDBAuditor:
+    """Registra las llamadas a TMDB de una página, agrupadas por page view"""
+
+    def __init__(self):
+        self.views = []
+
+    def attach(self, page):
+        """Empieza a escuchar las peticiones y navegaciones de la página"""
+        page.on("framenavigated", lambda frame: self._on_navigated(page, frame))
+        page.on("request", self._on_request)
+
+    def _on_navigated(self, page, frame):
+        if frame != page.main_frame:
+            return
+        self.start_view(urlsplit(frame.url).path)
+
+    def start_view(self, pathname):
+        """Abre una vista nueva si el pathname cambió"""
+        if not self.views or self.views[-1].pathname != pathname:
+            self.views.append(PageView(pathname))
+
+    def _on_request(self, request):
+        self.record(request.url)
+
+    def record(self, url):
+        """Registra una URL (se ignora si no es de la API de TMDB)"""
+        if not url.startswith(TMDB_API_PREFIX):
+            return
+        if not self.views:
+            self.start_view("")
+        path, query = normalize_request(url)
+        self.views[-1].calls.append(TMDBCall(path, query, url))
+
+    @property
+    def calls(self):
+        return [call for view in self.views for call in view.calls]
+
+    def findings(self, kind=None):
+        """Duplicadas y redundantes de todas las vistas (o solo las de un tipo)"""
+        found = []
+        for view in self.views:
+            found.extend(_duplicates(view))
+            found.extend(_redundant(view))
+        if kind is not None:
+            found = [finding for finding in found if finding.kind == kind]
+        return found
+
+    def over_budget(self, budgets):
+        """BudgetViolation por cada vista con más llamadas que su "tmdb_requests" """
+        violations = []
+        for view in self.views:
+            route = view.route
+            if route is None:
+                continue
+            limit = budgets.for_route(route).get("tmdb_requests")
+            if limit is not None and len(view.calls) > limit:
+                violations.append(BudgetViolation(route, "tmdb_requests", limit, len(view.calls)))
+        return violations
+
+    def report(self):
+        """Texto con las llamadas de cada vista agrupadas por endpoint y parámetros"""
+        lines = []
+        for view in self.views:
+            lines.append(f"{view.pathname or '(antes de navegar)'} ({view.route}): {len(view.calls)} llamadas a TMDB")
+            for (endpoint, query), count in sorted(view.groups().items()):
+                request = f"{endpoint}?{query}" if query else endpoint
+                lines.append(f"  {count}× {request}")
+        findings = self.findings()
+        if findings:
+            lines.append("Llamadas de más:")
+            lines.extend(f"  {finding.describe()}" for finding in findings)
+        return "\n".join(lines)
+
+
+def _duplicates(view):
+    counts = Counter((call.path, call.query) for call in view.calls)
+    for (path, query), count in counts.items():
+        if count > 1:
+            request = f"{path}?{query}" if query else path
+            yield AuditFinding("duplicate", view.pathname, request, count, "misma petición repetida")
+
+
+def _redundant(view):
+    """Sub-recursos ya incluidos vía append_to_response en la misma vista"""
+    appended = {}
+    for call in view.calls:
+        extras = call.params.get("append_to_response")
+        if extras:
+            appended.setdefault(call.path, set()).update(extras.split(","))
+
+    reported = set()
+    for call in view.calls:
+        segments = call.path.split("/")
+        if len(segments) < 3 or segments[0] not in ("movie", "tv"):
+            continue
+        parent, sub = "/".join(segments[:2]), "/".join(segments[2:])
+        if sub in appended.get(parent, ()) and call.path not in reported:
+            reported.add(call.path)
+            count = sum(1 for other in view.calls if other.path == call.path)
+            yield AuditFinding(
+                "redundant",
+                view.pathname,
+                call.path,
+                count,
+                f"ya viene en {parent}?append_to_response={sub}",
+            )
@@ -0,0 +1,223 @@
+"""
+📼 TMDB SIN RED (REPLAY) - MOVIEVERSE TESTING
+==============================================
+
+Sustituto local de api.themoviedb.org: intercepta las peticiones de
+TMDBService.fetchFromTMDB con context.route y responde con JSON grabado
+en fixtures/tmdb/replay.json, sin salir a internet. Si existe
+fixtures/tmdb/recorded.json.gz (--tmdb=record), sus respuestas reales se
+superponen a las de replay.json (ver fixture_store.py).
+
+Las respuestas se buscan en un índice en memoria por ruta + query
+normalizada (sin api_key ni language, parámetros ordenados). Se aceptan
+comodines para no tener que grabar cada combinación:
+
+    movie/popular?page=1                 coincidencia exacta
+    movie/popular?*                      cualquier query
+    movie/{id}?append_to_response=...    cualquier id numérico
+    tv/{id}/season/{n}?*                 cualquier serie y temporada
+
+Activación: pytest --tmdb=replay
+"""
+
+import json
+import re
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+# Archivo de respuestas grabadas por defecto
+DEFAULT_FIXTURES = Path(__file__).resolve().parent.parent / "fixtures" / "tmdb" / "replay.json"
+
+# Patrón de URLs de TMDB para page.route / context.route
+TMDB_URL_PATTERN = "https://api.themoviedb.org/**"
+
+# Parámetros que no cambian la respuesta y se ignoran en la clave
+IGNORED_PARAMS = {"api_key", "language"}
+
+# Respuesta de TMDB cuando el recurso no existe
+NOT_FOUND_BODY = {
+    "success": False,
+    "status_code": 34,
+    "status_message": "The resource you requested could not be found.",
+}
+
+_NUMBER = re.compile(r"^\d+$")
+
+
+def normalize_request(url):
+    """
+    Convierte una URL de TMDB en (ruta, query normalizada).
+
+    >>> normalize_request("https://api.themoviedb.org/3/search/movie?api_key=x&query=Spider&page=1")
+    ('search/movie', 'page=1&query=spider')
+    """
+    parts = urlsplit(url)
+    path = parts.path.strip("/")
+    if path.startswith("3/"):
+        path = path[2:]
+
+    params = []
+    for key, value in parse_qsl(parts.query, keep_blank_values=True):
+        if key in IGNORED_PARAMS:
+            continue
+        if key == "query":
+            value = " ".join(value.lower().split())
+        params.append((key, value))
+    query = "&".join(f"{key}={value}" for key, value in sorted(params))
+    return path, query
+
+
+def path_template(path):
+    """
+    Sustituye los números de la ruta por comodines.
+
+    movie/550 → movie/{id}, tv/1399/season/2 → tv/{id}/season/{n}
+    """
+    segments = path.split("/")
+    template = []
+    for index, segment in enumerate(segments):
+        if _NUMBER.match(segment):
+            is_season = index > 0 and segments[index - 1] == "season"
+            template.append("{n}" if is_season else "{id}")
+        else:
+            template.append(segment)
+    return "/".join(template)
+
+
+class TMDBReplayIndex:
+    """
+    Índice en memoria de respuestas TMDB grabadas.
+
+    Las respuestas se serializan una sola vez y se guardan como bytes,
+    así servir una petición es un lookup en un diccionario.
+    """
+
+    def __init__(self, entries=None):
+        self._entries = {}
+        self._encoded = {}
+        self._summaries = {}
+        self._stores = []
+        self.misses = []
+        for key, payload in (entries or {}).items():
+            self.add(key, payload)
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_FIXTURES):
+        """Carga el índice desde un archivo JSON con clave "entries" """
+        with open(path, encoding="utf-8") as fixture_file:
+            data = json.load(fixture_file)
+        return cls(data["entries"])
+
+    def add(self, key, payload):
+        """Registra una respuesta bajo una clave "ruta?query" """
+        path, _, query = key.partition("?")
+        self._entries[(path, query)] = payload
+        self._encoded.clear()
+        kind = "tv" if path.startswith(("tv/", "trending/tv", "search/tv")) else "movie"
+        for item in _results(payload):
+            self._summaries.setdefault((kind, item["id"]), item)
+
+    def add_store(self, store):
+        """
+        Superpone un FixtureStore (respuestas grabadas con --tmdb=record).
+
+        Sus respuestas exactas ganan a las de este índice; lo que no esté
+        grabado sigue saliendo de replay.json.
+        """
+        self._stores.append(store)
+        self._encoded.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def keys(self):
+        """Claves registradas en orden determinista"""
+        return sorted(f"{path}?{query}" for path, query in self._entries)
+
+    def summaries(self, kind="movie"):
+        """Películas ("movie") o series ("tv") que aparecen en los listados, por id"""
+        return [item for (item_kind, _), item in self._summaries.items() if item_kind == kind]
+
+    def lookup(self, url):
+        """
+        Busca la respuesta para una URL. Devuelve el payload o None.
+
+        Orden de búsqueda: grabación exacta (add_store), exacta, ruta con
+        cualquier query, plantilla con query exacta, plantilla con cualquier query.
+        """
+        path, query = normalize_request(url)
+        for store in self._stores:
+            payload = store.get(f"{path}?{query}")
+            if payload is not None:
+                return payload
+        template = path_template(path)
+        for candidate in ((path, query), (path, "*"), (template, query), (template, "*")):
+            if candidate in self._entries:
+                payload = self._entries[candidate]
+                if candidate[0] == template and template != path:
+                    payload = self._fill_template(payload, path)
+                return payload
+        return None
+
+    def encoded(self, url):
+        """Como lookup() pero devuelve los bytes JSON (cacheados por petición)"""
+        key = normalize_request(url)
+        if key not in self._encoded:
+            payload = self.lookup(url)
+            if payload is None:
+                return None
+            self._encoded[key] = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        return self._encoded[key]
+
+    def route_handler(self, route):
+        """
+        Handler para context.route / page.route.
+
+        Devuelve lo que devuelve route.fulfill: con la API async es una
+        corutina que Playwright espera, así el mismo handler sirve para ambas.
+        """
+        body = self.encoded(route.request.url)
+        status = 200
+        if body is None:
+            self.misses.append(route.request.url)
+            body = json.dumps(NOT_FOUND_BODY).encode("utf-8")
+            status = 404
+        return route.fulfill(
+            status=status,
+            body=body,
+            headers={
+                "content-type": "application/json;charset=utf-8",
+                "access-control-allow-origin": "*",
+            },
+        )
+
+    def install(self, target):
+        """Instala el handler en un BrowserContext o Page"""
+        target.route(TMDB_URL_PATTERN, self.route_handler)
+
+    def _fill_template(self, payload, path):
+        """
+        Ajusta una respuesta de plantilla a la ruta pedida: pone el id y,
+        si la película/serie aparece en algún listado grabado, copia sus
+        datos básicos (título, póster...) para que el detalle coincida
+        con la tarjeta en la que se hizo click.
+        """
+        numbers = [int(segment) for segment in path.split("/") if _NUMBER.match(segment)]
+        if not numbers or not isinstance(payload, dict):
+            return payload
+        filled = dict(payload)
+        if len(numbers) == 1 and "id" in filled:
+            filled["id"] = numbers[0]
+            summary = self._summaries.get((path.split("/")[0], numbers[0]))
+            if summary and path_template(path).count("/") == 1:
+                filled.update({k: v for k, v in summary.items() if k in filled})
+        if len(numbers) > 1 and "season_number" in filled:
+            filled["season_number"] = numbers[1]
+        return filled
+
+
+def _results(payload):
+    """Elementos de un listado de TMDB (vacío si no es un listado)"""
+    if isinstance(payload, dict) and isinstance(payload.get("results"), list):
+        return [item for item in payload["results"] if isinstance(item, dict) and "id" in item]
+    return []
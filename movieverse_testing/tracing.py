@@ -0,0 +1,415 @@
+"""
+🎞️ TRAZAS DE CHROME - MOVIEVERSE TESTING
+=========================================
+
+Graba una traza de rendimiento de Chromium (lo mismo que el panel
+Performance de DevTools) alrededor de un test o de un paso y la resume en
+Python, sin abrir DevTools:
+
+- tiempo de scripting, layout, paint y GC en los hilos principales
+- funciones JS con más self time (muestras del profiler de V8)
+- componentes de React con más self time (funciones de src/ con nombre
+  en mayúscula; con la build de dist/ los nombres van minificados)
+
+La traza se guarda comprimida en traces/<nombre>.json.gz (se abre en
+DevTools o en https://ui.perfetto.dev) y el resumen en
+traces/<nombre>.summary.json, que se puede comparar entre ejecuciones.
+El nombre lleva el test y el paso (ver trace_name): el mismo test deja
+la misma ruta en cada ejecución, en serie o en cualquier worker.
+
+Modos (pytest --chrome-trace):
+    off     Nada (por defecto)
+    test    Una traza por test, de principio a fin
+    steps   Solo los bloques `with trace_step(page, "nombre"):` de los tests
+
+Fuera de pytest:
+    python -m movieverse_testing.tracing summary traces/detalle.json.gz
+    python -m movieverse_testing.tracing compare antes.summary.json traces/detalle.summary.json
+
+Usa browser.start_tracing/stop_tracing de Playwright (solo Chromium; un
+navegador no puede grabar dos trazas a la vez).
+"""
+
+import argparse
+import gzip
+import json
+import os
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from movieverse_testing.profiles import supports_throttling
+
+TRACES_DIR = Path("traces")
+
+TRACE_MODES = ("off", "test", "steps")
+
+# Categorías de la traza completa: timeline de DevTools + profiler de V8
+TRACE_CATEGORIES = [
+    "devtools.timeline",
+    "disabled-by-default-devtools.timeline",
+    "disabled-by-default-v8.cpu_profiler",
+    "v8.execute",
+    "blink.user_timing",
+]
+
+# Categorías de la línea de tiempo de frames (FrameTimeline)
+FRAME_CATEGORIES = [
+    "devtools.timeline",
+    "disabled-by-default-devtools.timeline.frame",
+    "benchmark",
+    "cc",
+]
+
+
+class TraceRecorder:
+    """Context manager que graba una traza de la página; events queda con la lista de eventos"""
+
+    def __init__(self, page, categories=FRAME_CATEGORIES):
+        self.page = page
+        self.categories = list(categories)
+        self.events = []
+        self.data = None
+        self.active = False
+
+    def start(self):
+        self.page.context.browser.start_tracing(page=self.page, categories=self.categories)
+        self.active = True
+
+    def stop(self):
+        self.active = False
+        self.data = self.page.context.browser.stop_tracing()
+        self.events = parse_trace(self.data)
+        return self.events
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def parse_trace(data):
+    """Eventos de una traza JSON (bytes o str), tanto {"traceEvents": [...]} como [...]"""
+    trace = json.loads(data)
+    return trace["traceEvents"] if isinstance(trace, dict) else trace
+
+
+@dataclass
+class FrameTimeline:
+    """Frames que el compositor presentó o descartó según la traza"""
+
+    presented: int
+    dropped: int
+    partial: int = 0
+
+    @property
+    def dropped_ratio(self):
+        total = self.presented + self.dropped + self.partial
+        return self.dropped / total if total else 0.0
+
+
+def frame_timeline(events):
+    """
+    Cuenta frames de la traza.
+
+    Chromium reciente emite un PipelineReporter por frame con su estado
+    (STATE_PRESENTED_ALL, STATE_PRESENTED_PARTIAL, STATE_DROPPED); los
+    antiguos, DrawFrame y DroppedFrame.
+    """
+    states = [
+        event.get("args", {}).get("chrome_frame_reporter", {}).get("state")
+        for event in events
+        if event.get("name") == "PipelineReporter" and event.get("ph") in ("b", "X")
+    ]
+    states = [state for state in states if state]
+    if states:
+        return FrameTimeline(
+            presented=states.count("STATE_PRESENTED_ALL"),
+            dropped=states.count("STATE_DROPPED"),
+            partial=states.count("STATE_PRESENTED_PARTIAL"),
+        )
+    names = [event.get("name") for event in events]
+    return FrameTimeline(presented=names.count("DrawFrame"), dropped=names.count("DroppedFrame"))
+
+
+# ============================================================================
+# Resumen: tiempo por categoría y funciones con más self time
+# ============================================================================
+
+# Eventos del timeline → categoría (los hijos sin categoría heredan la del padre)
+EVENT_CATEGORIES = {
+    "scripting": (
+        "EvaluateScript", "v8.compile", "v8.compileModule", "v8.evaluateModule", "FunctionCall",
+        "TimerFire", "EventDispatch", "FireAnimationFrame", "FireIdleCallback", "RunMicrotasks",
+        "v8.execute", "V8.Execute", "XHRReadyStateChange", "XHRLoad",
+    ),
+    "layout": ("Layout", "UpdateLayoutTree", "RecalculateStyles", "HitTest", "PrePaint", "Layerize"),
+    "paint": ("Paint", "PaintImage", "RasterTask", "Decode Image", "CompositeLayers", "UpdateLayer",
+              "UpdateLayerTree", "Commit"),
+    "gc": ("MinorGC", "MajorGC", "V8.GCScavenger", "V8.GCCompactor", "V8.GCFinalizeMC",
+           "V8.GCIncrementalMarking", "V8.GC_MC_BACKGROUND_MARKING", "BlinkGC.AtomicPhase",
+           "CppGC.AtomicMark", "CppGC.AtomicSweep", "GCEvent"),
+}
+
+_CATEGORY_OF = {name: category for category, names in EVENT_CATEGORIES.items() for name in names}
+
+# Nodos del profiler que no son funciones de la app
+_PROFILER_PSEUDO = {"(root)", "(program)", "(idle)", "(garbage collector)"}
+
+
+@dataclass
+class TraceSummary:
+    """Resumen comparable de una traza (tiempos en ms)"""
+
+    name: str
+    duration_ms: float
+    categories: dict = field(default_factory=dict)
+    top_functions: list = field(default_factory=list)   # [nombre, url, ms]
+    top_components: list = field(default_factory=list)  # [nombre, ms]
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def lines(self, top=10):
+        lines = [f"{self.name}: {self.duration_ms:.0f}ms de traza"]
+        lines.append("  " + ", ".join(f"{category} {ms:.0f}ms" for category, ms in self.categories.items()))
+        for name, url, ms in self.top_functions[:top]:
+            lines.append(f"  {ms:>7.1f}ms  {name} {url}")
+        if self.top_components:
+            lines.append("  Componentes: " + ", ".join(f"{name} {ms:.1f}ms" for name, ms in self.top_components[:top]))
+        return lines
+
+
+def _main_threads(events):
+    """(pid, tid) de los hilos principales de los renderers (la app y sus iframes)"""
+    return {
+        (event["pid"], event["tid"])
+        for event in events
+        if event.get("ph") == "M" and event.get("name") == "thread_name"
+        and event.get("args", {}).get("name") == "CrRendererMain"
+    }
+
+
+def category_times(events):
+    """
+    Self time por categoría (ms) en los hilos principales.
+
+    Como DevTools: el tiempo de un evento es el suyo menos el de sus hijos,
+    y un hijo sin categoría propia cuenta para la de su padre.
+    """
+    threads = _main_threads(events)
+    by_thread = defaultdict(list)
+    for event in events:
+        if event.get("ph") == "X" and "dur" in event and (event.get("pid"), event.get("tid")) in threads:
+            by_thread[(event["pid"], event["tid"])].append(event)
+
+    totals = dict.fromkeys(list(EVENT_CATEGORIES) + ["other"], 0.0)
+    for thread_events in by_thread.values():
+        thread_events.sort(key=lambda event: (event["ts"], -event["dur"]))
+        stack = []  # [fin, categoría, self time]
+        for event in thread_events:
+            while stack and stack[-1][0] <= event["ts"]:
+                _, category, self_time = stack.pop()
+                totals[category] += self_time
+            parent_category = stack[-1][1] if stack else "other"
+            if stack:
+                stack[-1][2] -= event["dur"]
+            category = _CATEGORY_OF.get(event["name"], parent_category)
+            stack.append([event["ts"] + event["dur"], category, event["dur"]])
+        for _, category, self_time in stack:
+            totals[category] += self_time
+    return {category: round(max(0.0, total) / 1000, 2) for category, total in totals.items()}
+
+
+def function_self_times(events):
+    """
+    Self time (ms) por función JS a partir de las muestras del profiler.
+
+    Cada perfil (uno por hilo, en varios ProfileChunk con el mismo id) trae
+    nodos (función + url) y muestras con el tiempo desde la anterior; el
+    tiempo hasta la siguiente muestra es de la función en la cima de la pila.
+    """
+    profiles = defaultdict(lambda: ({}, [], []))
+    for event in events:
+        if event.get("name") != "ProfileChunk":
+            continue
+        nodes, samples, deltas = profiles[(event.get("pid"), event.get("id"))]
+        data = event.get("args", {}).get("data", {})
+        profile = data.get("cpuProfile", {})
+        for node in profile.get("nodes", []):
+            nodes[node["id"]] = node["callFrame"]
+        samples += profile.get("samples", [])
+        deltas += data.get("timeDeltas", [])
+
+    totals = defaultdict(float)
+    for nodes, samples, deltas in profiles.values():
+        for index, node_id in enumerate(samples[:-1]):
+            frame = nodes.get(node_id)
+            if frame is None or frame.get("functionName") in _PROFILER_PSEUDO:
+                continue
+            key = (frame.get("functionName") or "(anónima)", frame.get("url", ""))
+            totals[key] += max(0, deltas[index + 1]) / 1000
+    return totals
+
+
+def _is_component(name, url):
+    return "/src/" in url and name[:1].isupper()
+
+
+def summarize_trace(events, name="traza", top=15):
+    """TraceSummary de una lista de eventos"""
+    timed = [event for event in events if event.get("ph") == "X" and "dur" in event]
+    duration = 0.0
+    if timed:
+        duration = (max(event["ts"] + event["dur"] for event in timed) - min(event["ts"] for event in timed)) / 1000
+    functions = function_self_times(events)
+    ranked = sorted(functions.items(), key=lambda item: item[1], reverse=True)
+    components = defaultdict(float)
+    for (function, url), ms in functions.items():
+        if _is_component(function, url):
+            components[function] += ms
+    return TraceSummary(
+        name=name,
+        duration_ms=round(duration, 1),
+        categories=category_times(events),
+        top_functions=[[function, url, round(ms, 2)] for (function, url), ms in ranked[:top]],
+        top_components=[[component, round(ms, 2)] for component, ms in
+                        sorted(components.items(), key=lambda item: item[1], reverse=True)[:top]],
+    )
+
+
+def compare_summaries(before, after, top=10):
+    """Líneas con la diferencia entre dos resúmenes (after - before)"""
+    lines = [f"{before.name} → {after.name}: {before.duration_ms:.0f}ms → {after.duration_ms:.0f}ms"]
+    for category in after.categories:
+        old, new = before.categories.get(category, 0.0), after.categories[category]
+        lines.append(f"  {category:<10}{old:>9.0f}ms{new:>9.0f}ms{new - old:>+9.0f}ms")
+    old_functions = {(name, url): ms for name, url, ms in before.top_functions}
+    new_functions = {(name, url): ms for name, url, ms in after.top_functions}
+    changes = sorted(
+        ((key, new_functions.get(key, 0.0) - old_functions.get(key, 0.0))
+         for key in old_functions.keys() | new_functions.keys()),
+        key=lambda item: abs(item[1]),
+        reverse=True,
+    )
+    for (name, url), delta in changes[:top]:
+        if delta:
+            lines.append(f"  {delta:>+8.1f}ms  {name} {url}")
+    return lines
+
+
+# ============================================================================
+# Guardar trazas (pytest --chrome-trace)
+# ============================================================================
+
+_mode = "off"
+
+
+def set_mode(mode):
+    """Elige qué se traza (lo llama conftest.py con --chrome-trace)"""
+    global _mode
+    if mode not in TRACE_MODES:
+        raise ValueError(f"Modo de traza desconocido: {mode} (usa uno de {TRACE_MODES})")
+    _mode = mode
+
+
+def current_mode():
+    return _mode
+
+
+def trace_path(name):
+    """
+    traces/<nombre>.json.gz
+
+    La carpeta es la misma para todos los workers: un nodeid solo corre en
+    un worker por ejecución, así que los nombres de trace_name no chocan.
+    """
+    safe_name = "".join(char if char.isalnum() or char in "-_." else "_" for char in name)
+    TRACES_DIR.mkdir(parents=True, exist_ok=True)
+    return TRACES_DIR / f"{safe_name}.json.gz"
+
+
+def trace_name(step=None, nodeid=None):
+    """
+    Nombre de la traza de un test o de un paso: "<nodeid>--<paso>".
+
+    Sin nodeid se usa el test en curso (PYTEST_CURRENT_TEST): dos tests con
+    un trace_step del mismo nombre, o con el mismo nombre en archivos
+    distintos, no se pisan la traza.
+    """
+    nodeid = nodeid or os.environ.get("PYTEST_CURRENT_TEST", "").rsplit(" ", 1)[0]
+    return "--".join(part for part in (nodeid, step) if part)
+
+
+def summary_path(path):
+    return Path(str(path).replace(".json.gz", ".summary.json"))
+
+
+def save_trace(name, data):
+    """Guarda la traza comprimida y su resumen; devuelve (ruta, TraceSummary)"""
+    path = trace_path(name)
+    path.write_bytes(gzip.compress(data if isinstance(data, bytes) else data.encode("utf-8"), compresslevel=6))
+    summary = summarize_trace(parse_trace(data), name=name)
+    summary_path(path).write_text(json.dumps(summary.to_dict(), indent=1, ensure_ascii=False) + "\n",
+                                  encoding="utf-8")
+    return path, summary
+
+
+def load_summary(path):
+    """TraceSummary de un .summary.json o de una traza (.json.gz / .json)"""
+    path = Path(path)
+    if path.name.endswith(".summary.json"):
+        return TraceSummary.from_dict(json.loads(path.read_text(encoding="utf-8")))
+    data = gzip.decompress(path.read_bytes()) if path.suffix == ".gz" else path.read_bytes()
+    return summarize_trace(parse_trace(data), name=path.name.removesuffix(".gz").removesuffix(".json"))
+
+
+@contextmanager
+def trace_step(page, name):
+    """
+    Traza un paso de un test con --chrome-trace=steps (si no, no hace nada).
+
+        with trace_step(page, "detalle_pelicula"):
+            primera_pelicula.click()
+            wait_for_app_ready(page)
+    """
+    if _mode != "steps" or not supports_throttling(page):
+        yield None
+        return
+    recorder = TraceRecorder(page, TRACE_CATEGORIES)
+    recorder.start()
+    try:
+        yield recorder
+    finally:
+        recorder.stop()
+        path, summary = save_trace(trace_name(name), recorder.data)
+        print("\n".join(summary.lines(top=5) + [f"  → {path}"]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resumen y comparación de trazas de Chrome")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    summary_parser = subcommands.add_parser("summary", help="Resume una traza o un .summary.json")
+    summary_parser.add_argument("path", type=Path)
+    summary_parser.add_argument("--top", type=int, default=15)
+    compare_parser = subcommands.add_parser("compare", help="Compara dos trazas o resúmenes")
+    compare_parser.add_argument("before", type=Path)
+    compare_parser.add_argument("after", type=Path)
+    args = parser.parse_args(argv)
+
+    if args.command == "summary":
+        print("\n".join(load_summary(args.path).lines(top=args.top)))
+    else:
+        print("\n".join(compare_summaries(load_summary(args.before), load_summary(args.after))))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,382 @@
+"""
+⌨️ BÚSQUEDA MIENTRAS SE ESCRIBE - MOVIEVERSE TESTING
+====================================================
+
+SearchPage busca en TMDB mientras el usuario escribe, con un debounce de
+500ms. Este módulo escribe cientos de búsquedas con cadencias de tecleo
+realistas y mide, por búsqueda:
+
+- llamadas a search/movie (con el debounce bien hecho, una por búsqueda)
+- latencia tecla → resultados: desde la última tecla hasta que se pintan
+  los resultados de la búsqueda final
+- respuestas fuera de orden: la de una búsqueda vieja llega después que la
+  de una más nueva, y si además pisa en pantalla los resultados nuevos
+
+Todo va sin red: SearchResponder contesta search/movie y search/tv con las
+películas y series de fixtures/tmdb/replay.json cuyo título contiene lo
+buscado. La latencia de TMDB (cola larga) la pone faults.py, así que las
+respuestas pueden llegar desordenadas como en la realidad.
+
+El tecleo se hace dentro del navegador (eventos input con el setter nativo,
+como React espera): page.keyboard hace una ida y vuelta por tecla y no
+puede respetar intervalos de 60-200ms con precisión.
+
+Uso:
+    report = run_typeahead(page, BASE_URL, query_corpus(200), cadence="normal")
+    print("\\n".join(report.lines()))
+"""
+
+import json
+import random
+import unicodedata
+from dataclasses import dataclass, field
+from urllib.parse import parse_qsl, urlsplit
+
+from movieverse_testing.faults import FaultInjector, FaultPolicy, Latency
+from movieverse_testing.load import percentile
+from movieverse_testing.tmdb_replay import TMDB_URL_PATTERN, TMDBReplayIndex, normalize_request
+
+# Debounce de SearchPage (ms)
+SEARCH_DEBOUNCE_MS = 500
+
+# Llamadas a search/movie por búsqueda (p90). Con pausas más largas que el
+# debounce es normal alguna intermedia; sin debounce serían una por tecla
+MAX_CALLS_P90 = {"rapida": 1, "normal": 1, "con-pausas": 3}
+
+# Calma necesaria para dar una búsqueda por terminada
+SETTLE_MS = SEARCH_DEBOUNCE_MS + 300
+
+# Máximo por búsqueda antes de darla por perdida (ms)
+QUERY_TIMEOUT_MS = 10000
+
+# Latencia de TMDB en las búsquedas: mediana 150ms y alguna de más de 1s
+DEFAULT_SEARCH_LATENCY = Latency("long-tail", 150, 0.9)
+
+SEARCH_INPUT = 'input[placeholder^="Buscar películas"]'
+
+RESULTS_PER_PAGE = 20
+
+
+@dataclass(frozen=True)
+class Cadence:
+    """Intervalos entre teclas (ms): normal(mean, sd) y, a veces, una pausa"""
+
+    mean: float
+    sd: float
+    pause_rate: float = 0.0
+    pause_ms: tuple = (600, 1200)
+    minimum: float = 30
+
+    def intervals(self, text, rng):
+        """Un intervalo antes de cada tecla salvo la primera"""
+        intervals = []
+        for _ in text[1:]:
+            if rng.random() < self.pause_rate:
+                intervals.append(round(rng.uniform(*self.pause_ms)))
+            else:
+                intervals.append(round(max(self.minimum, rng.gauss(self.mean, self.sd))))
+        return intervals
+
+
+TYPING_CADENCES = {
+    "rapida": Cadence(90, 30),
+    "normal": Cadence(170, 60),
+    # Se para a pensar: pausas más largas que el debounce a media palabra
+    "con-pausas": Cadence(170, 60, pause_rate=0.12),
+}
+
+
+def _fold(text):
+    """Minúsculas y sin tildes, para comparar como lo haría TMDB"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def catalog(index=None):
+    """(películas, series) de los listados grabados en replay.json"""
+    index = index if index is not None else TMDBReplayIndex.from_file()
+    movies = [item for item in index.summaries("movie") if isinstance(item["id"], int) and item.get("title")]
+    series = [item for item in index.summaries("tv") if isinstance(item["id"], int) and item.get("name")
+              and "first_air_date" in item]
+    return movies, series
+
+
+def query_corpus(size=200, seed=0, titles=None):
+    """
+    Búsquedas como las de un usuario: títulos enteros, el principio de un
+    título (lo que se escribe antes de reconocerlo) y palabras sueltas.
+    """
+    rng = random.Random(seed)
+    titles = titles if titles is not None else [movie["title"] for movie in catalog()[0]]
+    queries = []
+    for _ in range(size):
+        title = rng.choice(titles)
+        style = rng.random()
+        if style < 0.4:
+            query = title
+        elif style < 0.8:
+            query = title[:rng.randint(min(3, len(title)), len(title))]
+        else:
+            words = [word for word in title.split() if len(word) > 3] or [title]
+            query = rng.choice(words)
+        if rng.random() < 0.5:
+            query = query.lower()
+        queries.append(query.strip() or title)
+    return queries
+
+
+class SearchResponder:
+    """Responde search/movie y search/tv con el catálogo (el resto, route.fallback())"""
+
+    def __init__(self, movies=None, series=None):
+        if movies is None or series is None:
+            default_movies, default_series = catalog()
+            movies = default_movies if movies is None else movies
+            series = default_series if series is None else series
+        self.catalogs = {"search/movie": (movies, "title"), "search/tv": (series, "name")}
+        self.served = 0
+
+    def search(self, path, query, page=1):
+        items, title_field = self.catalogs[path]
+        words = _fold(query).split()
+        matches = [item for item in items if words and all(word in _fold(item[title_field]) for word in words)]
+        start = (page - 1) * RESULTS_PER_PAGE
+        return {
+            "page": page,
+            "results": matches[start:start + RESULTS_PER_PAGE],
+            "total_pages": max(1, -(-len(matches) // RESULTS_PER_PAGE)),
+            "total_results": len(matches),
+        }
+
+    def route_handler(self, route):
+        path, _ = normalize_request(route.request.url)
+        if path not in self.catalogs:
+            return route.fallback()
+        params = dict(parse_qsl(urlsplit(route.request.url).query))
+        self.served += 1
+        body = self.search(path, params.get("query", ""), int(params.get("page", 1)))
+        return route.fulfill(
+            status=200,
+            body=json.dumps(body, ensure_ascii=False),
+            headers={"content-type": "application/json;charset=utf-8", "access-control-allow-origin": "*"},
+        )
+
+    def install(self, target):
+        target.route(TMDB_URL_PATTERN, self.route_handler)
+
+
+# Graba las llamadas de búsqueda (desde la app, con la latencia incluida) y
+# qué búsqueda hay pintada en cada momento
+TYPEAHEAD_RECORDER_SCRIPT = """
+(() => {
+  if (window.__movieverseTypeahead) return;
+  const state = { calls: [], renders: [] };
+  window.__movieverseTypeahead = state;
+
+  const innerFetch = window.fetch.bind(window);
+  window.fetch = (input, init) => {
+    const url = typeof input === 'string' ? input : (input && input.url) || String(input);
+    if (!/api\\.themoviedb\\.org\\/3\\/search\\//.test(url)) return innerFetch(input, init);
+    const call = { query: new URL(url).searchParams.get('query') || '', start: performance.now(), end: null };
+    state.calls.push(call);
+    const settle = () => { call.end = performance.now(); };
+    return innerFetch(input, init).then(
+      (response) => { settle(); return response; },
+      (error) => { settle(); throw error; }
+    );
+  };
+
+  // La búsqueda pintada sale del h2 de resultados ("Resultados para "x" (n películas)")
+  // o, si no hubo resultados, de la URL
+  let last;
+  const snapshot = () => {
+    const headings = Array.from(document.querySelectorAll('h2'), (h) => h.textContent);
+    const results = headings.map((text) => text.match(/^Resultados para "(.*)" \\(/)).find(Boolean);
+    let shown = null;
+    if (results) {
+      shown = results[1];
+    } else if (headings.some((text) => text.includes('No se encontraron resultados'))) {
+      shown = new URLSearchParams(location.search).get('q') || '';
+    }
+    if (shown !== last) {
+      last = shown;
+      state.renders.push({ t: performance.now(), shown });
+    }
+  };
+  new MutationObserver(snapshot).observe(document, { childList: true, subtree: true, characterData: true });
+})();
+"""
+
+# Vacía el buscador, espera a que la página se calme, escribe la búsqueda con
+# los intervalos dados y espera a que se pinte el resultado final y se calme
+TYPE_QUERY_SCRIPT = """
+async ({ selector, text, intervals, settleMs, timeout }) => {
+  const state = window.__movieverseTypeahead;
+  const input = document.querySelector(selector);
+  const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+  const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+  const type = (value) => {
+    setValue.call(input, value);
+    input.dispatchEvent(new Event('input', { bubbles: true }));
+  };
+  const lastActivity = () => Math.max(0, ...state.calls.map((c) => c.end ?? Infinity),
+                                      ...state.calls.map((c) => c.start), ...state.renders.map((r) => r.t));
+  const waitQuiet = async (done, deadline) => {
+    while (performance.now() < deadline) {
+      const busy = state.calls.some((c) => c.end === null);
+      if (done() && !busy && performance.now() - lastActivity() >= settleMs) return true;
+      await sleep(50);
+    }
+    return false;
+  };
+
+  input.focus();
+  type('');
+  await waitQuiet(() => !new URLSearchParams(location.search).get('q'), performance.now() + timeout);
+
+  const since = performance.now();
+  const keystrokes = [];
+  for (let i = 0; i < text.length; i++) {
+    if (i > 0) await sleep(intervals[i - 1]);
+    type(text.slice(0, i + 1));
+    keystrokes.push(performance.now());
+  }
+  const final = text.trim();
+  const last = keystrokes[keystrokes.length - 1];
+  const settled = await waitQuiet(
+    () => state.renders.some((r) => r.t >= last && r.shown === final), last + timeout);
+  return {
+    keystrokes,
+    settled,
+    calls: state.calls.filter((c) => c.start >= since),
+    renders: state.renders.filter((r) => r.t >= since),
+  };
+}
+"""
+
+
+@dataclass
+class QueryResult:
+    """Una búsqueda escrita tecla a tecla"""
+
+    query: str
+    keystrokes: int
+    calls: int
+    final_calls: int
+    latency_ms: float = None       # última tecla → resultados finales pintados (None si nunca)
+    out_of_order: int = 0          # respuestas viejas que llegaron después que otras más nuevas
+    overwritten: bool = False      # algo viejo se pintó encima de los resultados finales
+
+    @property
+    def wasted_calls(self):
+        return self.calls - self.final_calls
+
+
+def analyze_query(query, record):
+    """QueryResult a partir de lo que devuelve TYPE_QUERY_SCRIPT"""
+    final = query.strip()
+    last_keystroke = record["keystrokes"][-1]
+    calls = sorted(record["calls"], key=lambda call: call["start"])
+
+    shown_final = [render["t"] for render in record["renders"]
+                   if render["t"] >= last_keystroke and render["shown"] == final]
+    latency = shown_final[0] - last_keystroke if shown_final else None
+    overwritten = bool(shown_final) and any(
+        render["t"] > shown_final[0] and render["shown"] not in (final, None) for render in record["renders"]
+    )
+
+    out_of_order = 0
+    for index, call in enumerate(calls):
+        newer = calls[index + 1:]
+        if call["end"] is not None and any(other["end"] is not None and other["end"] < call["end"]
+                                           and other["query"] != call["query"] for other in newer):
+            out_of_order += 1
+
+    return QueryResult(
+        query=query,
+        keystrokes=len(record["keystrokes"]),
+        calls=len(calls),
+        final_calls=sum(1 for call in calls if call["query"].strip() == final),
+        latency_ms=latency,
+        out_of_order=out_of_order,
+        overwritten=overwritten,
+    )
+
+
+@dataclass
+class TypeaheadReport:
+    """Distribuciones sobre todas las búsquedas de una cadencia"""
+
+    cadence: str
+    results: list = field(default_factory=list)
+
+    def _values(self, attribute):
+        return [getattr(result, attribute) for result in self.results if getattr(result, attribute) is not None]
+
+    def calls_per_query(self, p):
+        return percentile(self._values("calls"), p)
+
+    def latency(self, p):
+        return percentile(self._values("latency_ms"), p)
+
+    @property
+    def unresolved(self):
+        """Búsquedas cuyos resultados finales nunca se pintaron"""
+        return [result for result in self.results if result.latency_ms is None]
+
+    @property
+    def overwritten(self):
+        return [result for result in self.results if result.overwritten]
+
+    def lines(self):
+        def ms(value):
+            return f"{value:.0f}ms" if value is not None else "-"
+
+        def count(value):
+            return f"{value:g}" if value is not None else "-"
+
+        total = len(self.results)
+        calls = sum(self._values("calls"))
+        wasted = sum(result.wasted_calls for result in self.results)
+        keystrokes = sum(self._values("keystrokes"))
+        out_of_order = sum(1 for result in self.results if result.out_of_order)
+        lines = [
+            f"Cadencia {self.cadence}: {total} búsquedas, {keystrokes} teclas, {calls} llamadas "
+            f"({wasted} para búsquedas intermedias)",
+            f"  llamadas/búsqueda  p50 {count(self.calls_per_query(50))}  p90 {count(self.calls_per_query(90))}  "
+            f"máx {max(self._values('calls'), default=0)}",
+            f"  tecla → resultados p50 {ms(self.latency(50))}  p90 {ms(self.latency(90))}  p99 {ms(self.latency(99))}",
+            f"  fuera de orden: {out_of_order} búsquedas, pisadas en pantalla: {len(self.overwritten)}, "
+            f"sin resultados finales: {len(self.unresolved)}",
+        ]
+        for result in (self.overwritten + self.unresolved)[:5]:
+            lines.append(f"  ⚠️ {result.query!r}: {result.calls} llamadas, latencia {ms(result.latency_ms)}")
+        return lines
+
+
+def run_typeahead(page, base_url, queries, cadence="normal", seed=0, latency=DEFAULT_SEARCH_LATENCY,
+                  responder=None):
+    """
+    Escribe cada búsqueda en /search y devuelve un TypeaheadReport.
+
+    Instala el responder de búsquedas, la latencia de faults.py y el
+    grabador antes de cargar la página.
+    """
+    rng = random.Random(seed)
+    (responder or SearchResponder()).install(page)
+    FaultInjector([FaultPolicy(endpoint="search/*", latency=latency)], seed=seed).install(page)
+    page.add_init_script(script=TYPEAHEAD_RECORDER_SCRIPT)
+    page.goto(f"{base_url}/search")
+    page.locator(SEARCH_INPUT).wait_for()
+
+    report = TypeaheadReport(cadence)
+    for query in queries:
+        record = page.evaluate(TYPE_QUERY_SCRIPT, {
+            "selector": SEARCH_INPUT,
+            "text": query,
+            "intervals": TYPING_CADENCES[cadence].intervals(query, rng),
+            "settleMs": SETTLE_MS,
+            "timeout": QUERY_TIMEOUT_MS,
+        })
+        report.results.append(analyze_query(query, record))
+    return report
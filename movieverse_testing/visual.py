@@ -0,0 +1,330 @@
+"""
+👁️ REGRESIÓN VISUAL - MOVIEVERSE TESTING
+========================================
+
+Compara las capturas de screenshots/ con las aprobadas en visual_baselines/.
+Por orden de coste, y parando en cuanto hay respuesta:
+
+1. sha256 del PNG igual al de la baseline → idénticas (sin decodificar nada)
+2. dHash (hash perceptual de 256 bits) igual → sin cambios visibles
+3. Diff de píxeles vectorizado con NumPy (en uint8 y solo en la franja de
+   filas que cambió, varias capturas en paralelo): un píxel cuenta como cambiado si
+   algún canal difiere más de `threshold`; falla si los cambiados superan
+   `tolerance` (fracción del total). Las zonas de `masks` no cuentan.
+
+Cada perfil de dispositivo y viewport tiene sus baselines en su carpeta
+(visual_baselines/movil-3g-360x740@2x/, visual_baselines/sin-perfil-1280x720@1x/...):
+la misma captura en móvil y en escritorio no se pisa. Los hashes se guardan
+en visual_baselines/index.json con la clave "carpeta/nombre", así la
+baseline solo se decodifica si hay que hacer el diff. La imagen de
+diferencias (screenshots/diffs/) solo se escribe cuando algo falla.
+
+Las zonas que cambian solas (el hero rotativo, los tráileres) se tapan al
+capturar: take_screenshot les pone una máscara de color sólido.
+
+Modos (pytest --visual):
+    off       Solo guarda capturas (por defecto)
+    check     Compara cada captura con su baseline al tomarla
+    update    Aprueba cada captura como nueva baseline
+
+Fuera de pytest:
+    python -m movieverse_testing.visual compare
+    python -m movieverse_testing.visual approve homepage_loaded.png
+    python -m movieverse_testing.visual compare --namespace movil-3g-360x740@2x
+
+Requiere numpy y Pillow (pip install numpy pillow), solo para este módulo.
+Usa --tmdb=replay y --tmdb-images=placeholder/disk: con la API real las
+películas cambian cada día.
+"""
+
+import argparse
+import hashlib
+import json
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from movieverse_testing.locks import file_lock
+from movieverse_testing.profiles import DEVICE_PROFILES
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:  # dependencias opcionales
+    np = None
+    Image = None
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+BASELINES_DIR = PROJECT_ROOT / "visual_baselines"
+DIFFS_DIRNAME = "diffs"
+
+VISUAL_MODES = ("off", "check", "update")
+
+# Viewport por defecto de Playwright (sin --device-profile)
+DEFAULT_VIEWPORT = (1280, 720)
+
+# Elementos que cambian entre ejecuciones y se tapan al capturar
+DYNAMIC_SELECTORS = (".hero-section", 'iframe[src*="youtube"]', "video")
+
+# Diferencia por canal (0-255) a partir de la cual un píxel cuenta como cambiado
+DEFAULT_THRESHOLD = 24
+
+# Fracción de píxeles cambiados permitida
+DEFAULT_TOLERANCE = 0.001
+
+# Lado del dHash: 16 → 256 bits. Cambios más pequeños que una celda de
+# (ancho/16)×(alto/16) que no alteran su brillo medio pasan el pre-check.
+HASH_SIZE = 16
+
+_mode = "off"
+
+
+def set_mode(mode):
+    """Elige el modo de take_screenshot (lo llama conftest.py con --visual)"""
+    global _mode
+    if mode not in VISUAL_MODES:
+        raise ValueError(f"Modo visual desconocido: {mode} (usa uno de {VISUAL_MODES})")
+    _mode = mode
+
+
+def current_mode():
+    return _mode
+
+
+def _require():
+    if np is None or Image is None:
+        raise RuntimeError("La regresión visual necesita numpy y Pillow: pip install numpy pillow")
+
+
+def baseline_namespace(width, height, device_scale_factor=1, profile=None):
+    """Carpeta de baselines de un perfil y viewport: "movil-3g-360x740@2x" """
+    return f"{profile or 'sin-perfil'}-{width}x{height}@{device_scale_factor:g}x"
+
+
+def page_namespace(page):
+    """
+    baseline_namespace() de una página: su viewport, su devicePixelRatio
+    y el DeviceProfile que los usa (si alguno coincide).
+    """
+    size = page.viewport_size or page.evaluate("() => ({ width: innerWidth, height: innerHeight })")
+    width, height = size["width"], size["height"]
+    scale = page.evaluate("() => window.devicePixelRatio")
+    profile = next(
+        (
+            profile.name for profile in DEVICE_PROFILES.values()
+            if (profile.width, profile.height, profile.device_scale_factor) == (width, height, scale)
+        ),
+        None,
+    )
+    return baseline_namespace(width, height, scale, profile)
+
+
+def file_sha256(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def dhash(image, size=HASH_SIZE):
+    """
+    Hash perceptual por diferencias: escala de grises a (size+1)×size y
+    compara cada píxel con su vecino. Devuelve un entero de size² bits.
+    """
+    _require()
+    small = np.asarray(image.convert("L").resize((size + 1, size), Image.BILINEAR), dtype=np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int("".join("1" if bit else "0" for bit in bits), 2)
+
+
+def _hash_hex(image):
+    return f"{dhash(image):0{HASH_SIZE * HASH_SIZE // 4}x}"
+
+
+@dataclass
+class VisualResult:
+    """Resultado de comparar una captura con su baseline"""
+
+    name: str
+    status: str  # identical | same-hash | within-tolerance | changed | size-mismatch | missing-baseline
+    changed_ratio: float = 0.0
+    diff_path: Path = None
+
+    @property
+    def ok(self):
+        return self.status in ("identical", "same-hash", "within-tolerance")
+
+    def describe(self):
+        if self.status == "missing-baseline":
+            return f"{self.name}: sin baseline (apruébala con --visual=update)"
+        if self.status == "size-mismatch":
+            return f"{self.name}: tamaño distinto al de la baseline"
+        detail = f"{self.changed_ratio:.2%} de píxeles distintos"
+        if self.diff_path is not None:
+            detail += f", diff en {self.diff_path}"
+        return f"{self.name}: {self.status} ({detail})"
+
+
+class BaselineStore:
+    """
+    visual_baselines/: PNG aprobados + index.json con sus hashes.
+
+    namespace (ver baseline_namespace) separa las baselines de cada perfil
+    y viewport; None las deja en la raíz.
+    """
+
+    def __init__(self, directory=BASELINES_DIR, namespace=None):
+        self.directory = Path(directory)
+        self.namespace = namespace
+        self.index_path = self.directory / "index.json"
+        self._index = None
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = json.loads(self.index_path.read_text(encoding="utf-8")) if self.index_path.exists() else {}
+        return self._index
+
+    def key_for(self, name):
+        return f"{self.namespace}/{name}" if self.namespace else name
+
+    def path_for(self, name):
+        return self.directory / self.key_for(name)
+
+    def approve(self, screenshot):
+        """Copia una captura como baseline y guarda sus hashes"""
+        _require()
+        screenshot = Path(screenshot)
+        self.path_for(screenshot.name).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(screenshot, self.path_for(screenshot.name))
+        with Image.open(screenshot) as image:
+            entry = {
+                "sha256": file_sha256(screenshot),
+                "dhash": _hash_hex(image),
+                "size": list(image.size),
+            }
+        # Con varios workers aprobando a la vez, se relee el índice bajo lock
+        with file_lock(self.index_path.with_name("index.json.lock")):
+            self._index = None
+            self.index[self.key_for(screenshot.name)] = entry
+            self.index_path.write_text(json.dumps(self.index, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+    def compare(self, screenshot, threshold=DEFAULT_THRESHOLD, tolerance=DEFAULT_TOLERANCE, masks=()):
+        """
+        Compara una captura con la baseline del mismo nombre.
+
+        masks: rectángulos (x, y, ancho, alto) en píxeles que no cuentan.
+        """
+        _require()
+        screenshot = Path(screenshot)
+        name = screenshot.name
+        entry = self.index.get(self.key_for(name))
+        if entry is None or not self.path_for(name).exists():
+            return VisualResult(name, "missing-baseline")
+        if file_sha256(screenshot) == entry["sha256"]:
+            return VisualResult(name, "identical")
+
+        with Image.open(screenshot) as opened:
+            current = opened.convert("RGB")
+        if list(current.size) != entry["size"]:
+            return VisualResult(name, "size-mismatch")
+        if _hash_hex(current) == entry["dhash"] and not masks:
+            return VisualResult(name, "same-hash")
+
+        with Image.open(self.path_for(name)) as opened:
+            baseline = np.asarray(opened.convert("RGB"))
+        changed = changed_pixels(np.asarray(current), baseline, threshold)
+        for x, y, width, height in masks:
+            changed[y:y + height, x:x + width] = False
+        ratio = float(changed.mean())
+        if ratio <= tolerance:
+            return VisualResult(name, "within-tolerance", ratio)
+        diff_path = write_diff(screenshot, baseline, changed)
+        return VisualResult(name, "changed", ratio, diff_path)
+
+    def compare_all(self, screenshots, threshold=DEFAULT_THRESHOLD, tolerance=DEFAULT_TOLERANCE):
+        """Compara varias capturas en paralelo (PNG y NumPy sueltan el GIL)"""
+        with ThreadPoolExecutor() as pool:
+            return list(pool.map(lambda path: self.compare(path, threshold, tolerance), screenshots))
+
+
+def changed_pixels(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Máscara alto×ancho de píxeles con algún canal que difiere más de threshold.
+
+    Trabaja en uint8 (|a-b| = max-min, sin pasar a int16) y solo sobre la
+    franja de filas que tiene algún byte distinto.
+    """
+    changed = np.zeros(current.shape[:2], dtype=bool)
+    rows = np.flatnonzero((current != baseline).reshape(current.shape[0], -1).any(axis=1))
+    if rows.size == 0:
+        return changed
+    top, bottom = rows[0], rows[-1] + 1
+    a, b = current[top:bottom], baseline[top:bottom]
+    delta = np.maximum(a, b) - np.minimum(a, b)
+    changed[top:bottom] = (delta[..., 0] > threshold) | (delta[..., 1] > threshold) | (delta[..., 2] > threshold)
+    return changed
+
+
+def write_diff(screenshot, baseline, changed):
+    """Baseline atenuada con los píxeles cambiados en rojo, junto a la captura"""
+    directory = Path(screenshot).parent / DIFFS_DIRNAME
+    directory.mkdir(parents=True, exist_ok=True)
+    overlay = baseline >> 2
+    overlay[changed] = (255, 0, 64)
+    path = directory / Path(screenshot).name
+    Image.fromarray(overlay).save(path, compress_level=1)
+    return path
+
+
+def check_screenshot(path, store=None, namespace=None):
+    """Modo check: AssertionError si la captura no coincide con su baseline"""
+    result = (store or BaselineStore(namespace=namespace)).compare(path)
+    if not result.ok:
+        raise AssertionError(f"Regresión visual: {result.describe()}")
+    return result
+
+
+def collect_screenshots(directory):
+    """Capturas PNG de un directorio (incluidas las de workers), sin los diffs"""
+    return sorted(
+        path for path in Path(directory).rglob("*.png")
+        if DIFFS_DIRNAME not in path.parts
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Regresión visual de las capturas de la suite")
+    parser.add_argument("command", choices=("compare", "approve"))
+    parser.add_argument("names", nargs="*", help="Capturas a aprobar (por defecto todas)")
+    parser.add_argument("--dir", type=Path, default=Path("screenshots"))
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--threshold", type=int, default=DEFAULT_THRESHOLD)
+    parser.add_argument(
+        "--namespace",
+        default=baseline_namespace(*DEFAULT_VIEWPORT),
+        help="Carpeta de baselines del perfil y viewport de las capturas (por defecto %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    store = BaselineStore(namespace=args.namespace)
+    screenshots = collect_screenshots(args.dir)
+    if args.command == "approve":
+        for path in screenshots:
+            if not args.names or path.name in args.names:
+                store.approve(path)
+                print(f"✅ {path.name}")
+        return 0
+
+    started = time.perf_counter()
+    results = store.compare_all(screenshots, args.threshold, args.tolerance)
+    elapsed = time.perf_counter() - started
+    failed = [result for result in results if not result.ok]
+    for result in failed:
+        print(f"❌ {result.describe()}")
+    print(f"{len(results)} capturas comparadas en {elapsed * 1000:.0f}ms, {len(failed)} con diferencias")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
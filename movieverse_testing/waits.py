@@ -0,0 +1,219 @@
+"""
+⏱️ ESPERAS POR SEÑALES DE LISTO - MOVIEVERSE TESTING
+====================================================
+
+En lugar de dormir un tiempo fijo (page.wait_for_timeout(3000)), estas
+funciones esperan a que la aplicación esté realmente lista:
+
+- No hay peticiones a TMDB en curso (y llevan un rato sin llegar nuevas)
+- El primer h1 tiene texto (el hero ya pintó la película)
+- Las imágenes visibles terminaron de cargar y decodificarse
+
+Vuelven en cuanto la condición se cumple, con un timeout por llamada.
+
+La instrumentación (READINESS_SCRIPT) se instala con context.add_init_script
+desde conftest.py, así que ya está activa antes de que arranque React.
+"""
+
+import itertools
+
+# Timeout por defecto de cada espera (milisegundos)
+DEFAULT_TIMEOUT = 15000
+
+# Cuánto tiempo sin actividad (TMDB o navegación) consideramos "app asentada"
+DEFAULT_QUIET_MS = 300
+
+# Token de cada espera (ver ready_condition_arg)
+_ready_tokens = itertools.count(1)
+
+# Frames seguidos con el mismo scrollLeft para dar un scroll por terminado
+SCROLL_STABLE_FRAMES = 3
+
+# Script que se inyecta en cada página antes de cargar la app.
+# Envuelve window.fetch para contar peticiones a TMDB en curso y
+# el history del navegador para saber cuándo navegó el router.
+READINESS_SCRIPT = """
+(() => {
+  if (window.__movieverse) return;
+  const state = {
+    pendingTmdb: 0,
+    tmdbRequests: 0,
+    lastTmdbActivity: performance.now(),
+    lastNavigation: performance.now(),
+  };
+  window.__movieverse = state;
+
+  // Las navegaciones del router (pushState) también reinician la ventana de calma,
+  // así una espera justo después de un click no acepta la página anterior
+  for (const method of ['pushState', 'replaceState']) {
+    const original = history[method].bind(history);
+    history[method] = (...args) => {
+      state.lastNavigation = performance.now();
+      return original(...args);
+    };
+  }
+  window.addEventListener('popstate', () => { state.lastNavigation = performance.now(); });
+
+  const originalFetch = window.fetch.bind(window);
+  window.fetch = (input, init) => {
+    const url = typeof input === 'string' ? input : (input && input.url) || '';
+    if (!url.includes('api.themoviedb.org')) {
+      return originalFetch(input, init);
+    }
+    state.pendingTmdb += 1;
+    state.tmdbRequests += 1;
+    state.lastTmdbActivity = performance.now();
+    const settle = () => {
+      state.pendingTmdb -= 1;
+      state.lastTmdbActivity = performance.now();
+    };
+    return originalFetch(input, init).then(
+      (response) => { settle(); return response; },
+      (error) => { settle(); throw error; }
+    );
+  };
+})();
+"""
+
+# Condición evaluada dentro del navegador (page.wait_for_function la
+# re-evalúa en cada frame, sin ida y vuelta a Python).
+#
+# Además anota en window.__movieverseReady.at el momento en que la página
+# quedó lista de verdad: el último movimiento (TMDB o navegación) o, si fue
+# después, el primer frame en que el DOM cumplía la condición sin cortes.
+# La ventana de calma solo sirve para confirmarlo y no cuenta en ese tiempo.
+# Cada espera pasa un token distinto para no heredar el frame de otra:
+# construye el argumento con ready_condition_arg(). Sirve igual para la API
+# async de Playwright (ver load.py).
+READY_CONDITION = """
+({ quietMs, heading, images, token }) => {
+  const now = performance.now();
+  const ready = window.__movieverseReady || (window.__movieverseReady = { since: null, at: null });
+  if (ready.token !== token) {
+    ready.token = token;
+    ready.since = null;
+  }
+
+  const domReady = () => {
+    if (document.readyState === 'loading') return false;
+    if (heading) {
+      const h1 = document.querySelector(heading);
+      if (!h1 || !h1.textContent.trim()) return false;
+    }
+    if (images) {
+      const viewportHeight = window.innerHeight;
+      for (const img of document.images) {
+        const rect = img.getBoundingClientRect();
+        const onScreen = rect.width > 0 && rect.bottom > 0 && rect.top < viewportHeight;
+        if (!onScreen) continue;
+        if (!img.complete) return false;
+      }
+    }
+    return true;
+  };
+
+  const state = window.__movieverse;
+  if ((state && state.pendingTmdb > 0) || !domReady()) {
+    ready.since = null;
+    return false;
+  }
+  if (ready.since === null) ready.since = now;
+
+  const lastActivity = state ? Math.max(state.lastTmdbActivity, state.lastNavigation) : 0;
+  if (now - lastActivity < quietMs) return false;
+  ready.at = Math.max(lastActivity, ready.since);
+  return true;
+}
+"""
+
+# Sondea scrollLeft en cada frame (o cada 50ms si la pestaña no pinta) hasta
+# que se ha movido y no cambia en `frames` frames; null si vence el timeout
+_SCROLL_SETTLED_SCRIPT = """
+async (el, { previous, timeout, frames }) => {
+  const started = performance.now();
+  let last = el.scrollLeft;
+  let stable = 0;
+  while (performance.now() - started < timeout) {
+    await new Promise((resolve) => {
+      requestAnimationFrame(resolve);
+      setTimeout(resolve, 50);
+    });
+    const current = el.scrollLeft;
+    stable = current === last && current !== previous ? stable + 1 : 0;
+    last = current;
+    if (stable >= frames) return current;
+  }
+  return null;
+}
+"""
+
+
+def ready_condition_arg(heading="h1", images=True, quiet_ms=DEFAULT_QUIET_MS):
+    """
+    Argumento de READY_CONDITION para una espera nueva:
+
+        page.wait_for_function(READY_CONDITION, arg=ready_condition_arg(), timeout=...)
+    """
+    return {"quietMs": quiet_ms, "heading": heading, "images": images, "token": next(_ready_tokens)}
+
+
+def wait_for_tmdb_idle(page, quiet_ms=DEFAULT_QUIET_MS, timeout=DEFAULT_TIMEOUT):
+    """Espera a que no haya peticiones a TMDB en curso durante quiet_ms"""
+    page.wait_for_function(
+        READY_CONDITION,
+        arg=ready_condition_arg(heading=None, images=False, quiet_ms=quiet_ms),
+        timeout=timeout,
+    )
+
+
+def wait_for_app_ready(page, heading="h1", images=True, quiet_ms=DEFAULT_QUIET_MS,
+                       timeout=DEFAULT_TIMEOUT):
+    """
+    Espera a que la página esté lista para verificarse.
+
+    - heading: selector que debe tener texto (None para no exigirlo)
+    - images: exigir que las imágenes visibles estén cargadas
+    - timeout: máximo de milisegundos antes de fallar
+
+    Después de que la condición se cumple, espera a que las imágenes
+    visibles estén decodificadas (img.decode()) para que las capturas
+    no salgan a medio pintar.
+    """
+    page.wait_for_function(
+        READY_CONDITION,
+        arg=ready_condition_arg(heading=heading, images=images, quiet_ms=quiet_ms),
+        timeout=timeout,
+    )
+    if images:
+        page.evaluate(
+            """() => Promise.all(
+                Array.from(document.images)
+                    .filter((img) => img.complete && img.naturalWidth > 0)
+                    .map((img) => img.decode().catch(() => null))
+            )"""
+        )
+
+
+def wait_for_url_change(page, previous_url, timeout=DEFAULT_TIMEOUT):
+    """Espera a que la URL deje de ser previous_url (navegación del router)"""
+    page.wait_for_function(
+        "previous => window.location.href !== previous",
+        arg=previous_url,
+        timeout=timeout,
+    )
+
+
+def wait_for_scroll_settled(locator, previous_left, timeout=DEFAULT_TIMEOUT):
+    """
+    Espera a que un elemento scrolleable se mueva desde previous_left y se
+    quede quieto SCROLL_STABLE_FRAMES frames seguidos (fin del smooth scroll).
+
+    Devuelve el scrollLeft final.
+    """
+    final = locator.evaluate(
+        _SCROLL_SETTLED_SCRIPT,
+        {"previous": previous_left, "timeout": timeout, "frames": SCROLL_STABLE_FRAMES},
+    )
+    if final is None:
+        raise TimeoutError(f"El scroll no se asentó en {timeout}ms (scrollLeft inicial {previous_left})")
+    return final
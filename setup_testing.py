@@ -29,13 +29,9 @@ def run_command(command, description):
         return False
 
 def check_node_server():
-    """Verifica si el servidor de desarrollo está corriendo"""
-    try:
-        import requests
-        response = requests.get("http://localhost:5173", timeout=5)
-        return response.status_code == 200
-    except:
-        return False
+    """Verifica si hay un servidor sirviendo la app (raíz y rutas de la SPA)"""
+    from movieverse_testing.server import base_url, health_check
+    return health_check(base_url(), timeout=5)
 
 def create_screenshots_dir():
     """Crea el directorio para screenshots"""
@@ -62,7 +58,9 @@ def main():
     python_deps = [
         "pip install playwright",
         "pip install pytest", 
-        "pip install requests"  # Para verificar servidor
+        "pip install pytest-playwright",  # Fixtures page/context/browser
+        "pip install pytest-xdist",  # Para ejecutar en paralelo (pytest -n 4)
+        "pip install numpy pillow",  # Regresión visual de capturas (--visual=check)
     ]
     
     for dep in python_deps:
@@ -71,30 +69,33 @@ def main():
     # Instalar navegadores de Playwright
     run_command("playwright install", "Instalando navegadores de Playwright")
     
-    # Verificar servidor de desarrollo
-    print("\n🌐 Verificando servidor de desarrollo...")
+    # Verificar servidor: si no hay uno corriendo, pytest construye y sirve la app
+    print("\n🌐 Verificando servidor de la app...")
     if check_node_server():
-        print("✅ Servidor de desarrollo corriendo en http://localhost:5173")
+        app_server = "external"
+        print("✅ Servidor corriendo en http://localhost:5173")
     else:
-        print("⚠️  Servidor de desarrollo no detectado")
-        print("   Ejecuta 'npm run dev' en otra terminal antes de correr tests")
+        app_server = "dist"
+        print("ℹ️  No hay servidor corriendo: los tests usarán --app-server=dist")
+        print("   (construye la app con npm run build si cambió src/ y sirve dist/)")
     
     # Ejecutar test de prueba
     print("\n🧪 Ejecutando test de verificación...")
     if run_command(
-        "pytest test_movieverse_ejercicios.py::test_pagina_principal_carga_correctamente -v", 
+        "pytest test_movieverse_ejercicios.py::test_pagina_principal_carga_correctamente -v "
+        f"--app-server={app_server}",
         "Test de verificación"
     ):
         print("\n🎉 ¡CONFIGURACIÓN COMPLETADA!")
         print("\nPróximos pasos:")
-        print("1. Si el servidor no está corriendo: npm run dev")
-        print("2. Ejecutar tests básicos: pytest -k 'pagina_principal or hero_section' -v")
+        print("1. Sin servidor propio: pytest --app-server=dist (o dev para depurar con Vite)")
+        print("2. Ejecutar tests básicos: pytest -k 'pagina_principal or hero_section' -v --app-server=dist")
         print("3. Ver capturas generadas en: screenshots/")
         print("4. Leer la guía completa: README_TESTING.md")
     else:
         print("\n⚠️  El test de verificación falló")
         print("Posibles causas:")
-        print("- El servidor de desarrollo no está corriendo")
+        print("- La build falló (prueba 'python -m movieverse_testing.server build')")
         print("- Hay algún error en la configuración")
         print("- Revisa README_TESTING.md para troubleshooting")
 
@@ -34,6 +34,16 @@ const queryClient = new QueryClient({
   },
 });
 
+declare global {
+  interface Window {
+    // Set by an e2e init script (movieverse_testing/query_cache.py) to observe the query cache
+    __MOVIEVERSE_E2E__?: { onQueryClient?: (client: QueryClient) => void };
+  }
+}
+
+// E2E instrumentation: a no-op unless a test defined window.__MOVIEVERSE_E2E__ before the app loaded
+window.__MOVIEVERSE_E2E__?.onQueryClient?.(queryClient);
+
 const AppContent: React.FC = () => {
   const handleSearch = (query: string) => {
     window.location.href = `/search?q=${encodeURIComponent(query)}`;
@@ -4,7 +4,7 @@ import MovieCard from '../components/movie/MovieCard';
 import LoadingSpinner from '../components/ui/LoadingSpinner';
 import ErrorDisplay from '../components/ui/ErrorDisplay';
 import { useSearchMovies } from '../hooks/useMovies';
-import { debounce } from '../utils/helpers';
+import { useDebounce } from '../hooks/usePerformance';
 
 const SearchPage: React.FC = () => {
   const [searchParams, setSearchParams] = useSearchParams();
@@ -16,7 +16,7 @@ const SearchPage: React.FC = () => {
     page: 1 
   });
 
-  const debouncedSearch = debounce((searchQuery: string) => {
+  const debouncedSearch = useDebounce((searchQuery: string) => {
     if (searchQuery.trim()) {
       setSearchParams({ q: searchQuery.trim() });
     } else {
@@ -0,0 +1,43 @@
+"""
+🗃️ CACHÉ DE REACT QUERY EN LA NAVEGACIÓN - MOVIEVERSE
+======================================================
+
+Repite los recorridos de JOURNEYS (home → trending → atrás → detalle →
+atrás, series, vuelta tras 11 minutos) observando la QueryCache de la app
+y reporta por queryKey hits, misses, refetches y peticiones redundantes:
+
+    Recorrido: / → /trending → back → /movie/550 → back
+      hit ratio 58%, 9 fetch de React Query (1 redundantes), 14 peticiones a TMDB
+      queryKey                                     staleTime  hits viejos compart.  miss refetch fetch redund.
+      ["movie","detail",550]                           15min     0      0        0     1       0     1       1
+        ↳ mismo dato que ["movieDetails",550]
+
+Con eso se puede ajustar staleTime con datos: una key con muchos hits
+viejos aguanta un staleTime más corto sin coste; una con refetches o
+redundantes está pidiendo a TMDB lo que ya tenía.
+
+Falla si volver atrás a una vista ya cargada vuelve a pedir sus datos.
+
+Ejecuta (mejor sin red, con respuestas grabadas):
+    pytest test_cache_navegacion.py -s --tmdb=replay --tmdb-images=placeholder
+"""
+
+import pytest
+from playwright.sync_api import Page
+
+from movieverse_testing import base_url
+from movieverse_testing.query_cache import JOURNEYS, replay_journey
+
+BASE_URL = base_url()
+
+
+@pytest.mark.parametrize("journey", list(JOURNEYS))
+def test_volver_atras_sale_de_la_cache(page: Page, journey):
+    report = replay_journey(page, BASE_URL, JOURNEYS[journey])
+    print("\n".join(report.lines()))
+
+    assert report.fetches, "El recorrido debería pedir algo a TMDB (¿se registró el QueryClient?)"
+    assert not report.refetched_on_back, (
+        "Volver atrás pidió otra vez datos ya cargados: "
+        + ", ".join(f"{key} (paso {step})" for step, key in report.refetched_on_back)
+    )
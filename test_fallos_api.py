@@ -0,0 +1,52 @@
+"""
+💥 LATENCIA Y FALLOS DE TMDB - MOVIEVERSE
+==========================================
+
+Carga la app con cada escenario de FAULT_SCENARIOS (latencia normal y de
+cola larga, 50% de errores, 429 con Retry-After, cuerpos a goteo, hero
+caído, timeouts en el detalle) y reporta cuánto tarda en aparecer contenido
+o un ErrorDisplay y cuántas peticiones hace la app:
+
+    rate-limit en /: contenido 412ms, error 1630ms (2 ErrorDisplay)
+      14 peticiones, máx. 2 intentos por petición, pico 11/s, 3 reintentos antes de Retry-After
+
+Falla si la app no muestra nada (ni contenido ni error) o si los reintentos
+de React Query forman una tormenta (más intentos de los configurados o
+demasiadas peticiones por segundo).
+
+Ejecuta (mejor sin red, con respuestas grabadas):
+    pytest test_fallos_api.py -s --tmdb=replay --tmdb-images=placeholder
+"""
+
+import pytest
+from playwright.sync_api import Page
+
+from movieverse_testing import base_url, sample_url
+from movieverse_testing.faults import FAULT_SCENARIOS, measure_faults
+
+BASE_URL = base_url()
+
+# Ruta en la que se nota cada escenario (por defecto la home)
+SCENARIO_PATHS = {
+    "timeout-detalle": sample_url("/movie/:id"),
+}
+
+
+@pytest.mark.parametrize("scenario", list(FAULT_SCENARIOS))
+def test_app_resiste_fallos_de_tmdb(page: Page, scenario):
+    result = measure_faults(page, BASE_URL, scenario, path=SCENARIO_PATHS.get(scenario, "/"), seed=1)
+    print("\n".join(result.lines()))
+
+    assert result.time_to_content_ms is not None or result.time_to_error_ms is not None, \
+        "La app debería mostrar contenido o un ErrorDisplay"
+    assert not result.requests.storm, (
+        f"Tormenta de reintentos: {result.requests.max_attempts} intentos por petición, "
+        f"pico de {result.requests.peak_per_second} peticiones/s"
+    )
+
+
+def test_hero_caido_muestra_el_resto(page: Page):
+    # Sin movie/popular no hay hero, pero las demás filas deberían pintarse igual
+    result = measure_faults(page, BASE_URL, "hero-caido", seed=1)
+    print("\n".join(result.lines()))
+    assert result.time_to_content_ms is not None, "Las filas deberían cargarse aunque falle el hero"
@@ -0,0 +1,70 @@
+"""
+🧠 FUGAS DE MEMORIA EN LA NAVEGACIÓN SPA - MOVIEVERSE
+=====================================================
+
+Recorre rutas de src/App.tsx varias veces sin recargar la página y falla
+si la memoria, los nodos DOM, los iframes o los listeners crecen en cada
+ciclo más de lo permitido en performance_budgets.json (sección "leaks").
+
+Falla con una línea por métrica, p. ej.:
+    /movie/:id       listener_growth 6 > 2 presupuesto, +4 (+200%)
+
+y el reporte impreso muestra los constructores que más crecen (Swiper,
+Timeline de GSAP, HTMLIFrameElement...).
+
+Son lentos y necesitan Chromium, así que solo corren con --leaks:
+    pytest test_fugas_memoria.py --leaks -s
+    pytest test_fugas_memoria.py --leaks --leak-cycles=10 --tmdb=replay --tmdb-images=placeholder
+"""
+
+import pytest
+from playwright.sync_api import Page
+
+from movieverse_testing import APP_ROUTES, base_url
+from movieverse_testing.budgets import check_budget, format_violations
+from movieverse_testing.leaks import JOURNEY, detect_leaks, load_leak_budgets
+from movieverse_testing.profiles import supports_throttling
+
+BASE_URL = base_url()
+
+
+@pytest.fixture
+def leak_cycles(pytestconfig):
+    if not pytestconfig.getoption("leaks"):
+        pytest.skip("Tests de fugas desactivados (actívalos con --leaks)")
+    return pytestconfig.getoption("leak_cycles")
+
+
+@pytest.fixture
+def leak_page(leak_cycles, page: Page):
+    if not supports_throttling(page):
+        pytest.skip("La detección de fugas necesita Chromium (CDP)")
+    return page
+
+
+@pytest.fixture(scope="session")
+def leak_budgets():
+    return load_leak_budgets()
+
+
+def _assert_sin_fugas(report, leak_budgets):
+    print("\n".join(report.lines()))
+    violations = check_budget(report, leak_budgets.for_route(report.route))
+    assert not violations, format_violations(violations)
+
+
+def test_recorrido_sin_fugas(leak_page, leak_cycles, leak_budgets):
+    # home → película → serie → búsqueda → home, leak_cycles veces
+    report = detect_leaks(leak_page, BASE_URL, JOURNEY, route="recorrido", cycles=leak_cycles)
+    _assert_sin_fugas(report, leak_budgets)
+
+
+@pytest.mark.parametrize(
+    "route, url",
+    [(route, url) for route, url in APP_ROUTES if route != "/"],
+    ids=[route for route, _ in APP_ROUTES if route != "/"],
+)
+def test_ruta_sin_fugas(leak_page, leak_cycles, leak_budgets, route, url):
+    # home → ruta → home: lo que crezca es de la ruta
+    report = detect_leaks(leak_page, BASE_URL, ["/", url, "/"], route=route, cycles=leak_cycles)
+    _assert_sin_fugas(report, leak_budgets)
@@ -0,0 +1,1703 @@
+"""
+🧰 TESTS DE LAS HERRAMIENTAS DE TESTING - MOVIEVERSE
+====================================================
+
+Tests unitarios de movieverse_testing. No abren navegador ni necesitan
+el servidor de desarrollo: se ejecutan en milisegundos.
+
+Ejecuta: pytest test_herramientas.py -v
+"""
+
+import json
+import os
+import random
+import re
+import struct
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from movieverse_testing import (
+    APP_ROUTES,
+    AppServer,
+    ContextPool,
+    ImageStubber,
+    PageMetrics,
+    RunTimer,
+    TMDBReplayIndex,
+    collect_metrics,
+    normalize_request,
+    ready_condition_arg,
+    sample_url,
+    screenshot_path,
+    wait_for_scroll_settled,
+)
+from movieverse_testing.batch import any_of, expect_all, not_empty, url_matches, visible
+from movieverse_testing.budgets import BaselineHistory, Budgets, check_budget, load_budgets
+from movieverse_testing.faults import FAULT_SCENARIOS, FaultInjector, FaultPolicy, Latency, RequestStats
+from movieverse_testing.fixture_store import FixtureStore, refresh, replay_index
+from movieverse_testing.image_audit import ImageAuditReport, ImageRecord, component_label, load_image_budgets
+from movieverse_testing.images import SIZE_DIMENSIONS
+from movieverse_testing.impact import ChangeSet, ImpactMap, ImpactTracker, changed_endpoints, route_pages, source_file
+from movieverse_testing.leaks import detect_leaks, load_leak_budgets, summarize_snapshot
+from movieverse_testing.load import LoadReport, percentile
+from movieverse_testing.locks import file_lock
+from movieverse_testing.profiles import DEVICE_PROFILES
+from movieverse_testing.query_cache import BACK, CacheReport, analyze_cache_events, parse_step
+from movieverse_testing.routes import route_for_path
+from movieverse_testing.scheduling import DurationHistory
+from movieverse_testing.scroll import VSYNC_MS, frame_stats, measure_scroll
+from movieverse_testing.server import (
+    BUILD_STAMP,
+    build_hash,
+    ensure_build,
+    health_check,
+    source_hash,
+    stop_recorded_server,
+)
+from movieverse_testing.synthetic import CatalogScale, SyntheticCatalog, TypeSchema, growth_exponent
+from movieverse_testing.tmdb_audit import TMDBAuditor
+from movieverse_testing.tmdb_replay import path_template
+from movieverse_testing.tracing import (
+    compare_summaries,
+    frame_timeline,
+    load_summary,
+    parse_trace,
+    save_trace,
+    summarize_trace,
+    trace_name,
+)
+from movieverse_testing.typeahead import (
+    MAX_CALLS_P90,
+    SEARCH_DEBOUNCE_MS,
+    TYPING_CADENCES,
+    SearchResponder,
+    TypeaheadReport,
+    analyze_query,
+    query_corpus,
+)
+
+TMDB = "https://api.themoviedb.org/3"
+
+
+# ============================================================================
+# 📼 TMDB REPLAY
+# ============================================================================
+
+def test_normalize_request_ignora_api_key_y_ordena_parametros():
+    path, query = normalize_request(f"{TMDB}/search/movie?api_key=abc&language=es-ES&query=Spider%20Man&page=1")
+    assert path == "search/movie"
+    assert query == "page=1&query=spider man"
+
+
+def test_path_template_sustituye_ids_y_temporadas():
+    assert path_template("movie/550") == "movie/{id}"
+    assert path_template("tv/1399/season/2") == "tv/{id}/season/{n}"
+    assert path_template("trending/movie/week") == "trending/movie/week"
+
+
+def test_replay_busca_exacto_antes_que_comodin():
+    index = TMDBReplayIndex({
+        "search/movie?page=1&query=spider": {"results": [{"id": 1}]},
+        "search/movie?*": {"results": []},
+    })
+    assert index.lookup(f"{TMDB}/search/movie?query=SPIDER&page=1")["results"] == [{"id": 1}]
+    assert index.lookup(f"{TMDB}/search/movie?query=otra&page=1")["results"] == []
+
+
+def test_replay_plantilla_usa_id_pedido_y_datos_del_listado():
+    index = TMDBReplayIndex({
+        "movie/popular?*": {"results": [{"id": 7, "title": "Siete", "genre_ids": [1]}]},
+        "movie/{id}?*": {"id": 0, "title": "Plantilla", "runtime": 90},
+    })
+    detail = index.lookup(f"{TMDB}/movie/7?append_to_response=credits")
+    assert detail == {"id": 7, "title": "Siete", "runtime": 90}
+    assert index.lookup(f"{TMDB}/movie/8")["title"] == "Plantilla"
+
+
+def test_replay_registra_peticiones_sin_fixture():
+    index = TMDBReplayIndex({})
+    assert index.lookup(f"{TMDB}/person/1") is None
+    assert index.encoded(f"{TMDB}/person/1") is None
+
+
+def test_fixtures_grabadas_cubren_todos_los_endpoints_del_servicio():
+    index = TMDBReplayIndex.from_file()
+    endpoints = [
+        "movie/popular?page=1", "movie/top_rated?page=1", "movie/upcoming?page=1",
+        "movie/now_playing?page=1", "trending/movie/week?page=1",
+        "search/movie?page=1&query=spider",
+        "movie/550?append_to_response=credits,videos,images,recommendations,similar",
+        "movie/550/videos", "movie/550/watch/providers", "genre/movie/list",
+        "tv/popular?page=1", "tv/top_rated?page=1", "tv/on_the_air?page=1",
+        "tv/airing_today?page=1", "trending/tv/week?page=1", "search/tv?page=1&query=casa",
+        "tv/1399?append_to_response=credits,videos,images,recommendations,similar",
+        "tv/1399/videos", "tv/1399/season/1", "tv/1399/watch/providers",
+        "genre/tv/list", "search/multi?page=1&query=spider",
+    ]
+    for endpoint in endpoints:
+        assert index.lookup(f"{TMDB}/{endpoint}") is not None, endpoint
+
+
+# ============================================================================
+# 🖼️ IMÁGENES
+# ============================================================================
+
+def test_placeholder_es_png_valido_con_dimensiones_del_bucket():
+    stubber = ImageStubber("placeholder")
+    png = stubber.placeholder_for("https://image.tmdb.org/t/p/w185/abc.jpg")
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    width, height = struct.unpack(">II", png[16:24])
+    assert (width, height) == SIZE_DIMENSIONS["w185"]
+    assert len(png) < 2000
+
+
+def test_placeholder_se_genera_una_vez_por_tamano():
+    stubber = ImageStubber("placeholder")
+    first = stubber.placeholder_for("https://image.tmdb.org/t/p/original/a.jpg")
+    second = stubber.placeholder_for("https://image.tmdb.org/t/p/original/b.jpg")
+    assert first is second
+
+
+def test_cache_path_organiza_por_bucket(tmp_path):
+    stubber = ImageStubber("disk", cache_dir=tmp_path)
+    assert stubber.cache_path("https://image.tmdb.org/t/p/w500/poster.jpg") == tmp_path / "w500" / "poster.jpg"
+    assert stubber.cache_path("https://placehold.co/500x750") is None
+
+
+class _ImageRoute:
+    def __init__(self, url, body):
+        self.request = type("Request", (), {"url": url})()
+        self.body = body
+        self.fulfilled = []
+
+    def fetch(self):
+        return type("Response", (), {"ok": True, "body": lambda _: self.body})()
+
+    def fulfill(self, **kwargs):
+        self.fulfilled.append(kwargs)
+
+
+def test_modo_disk_guarda_la_descarga_sin_temporales(tmp_path):
+    stubber = ImageStubber("disk", cache_dir=tmp_path)
+    route = _ImageRoute("https://image.tmdb.org/t/p/w185/poster.jpg", b"\xff\xd8jpeg")
+    stubber.route_handler(route)
+    assert (tmp_path / "w185" / "poster.jpg").read_bytes() == b"\xff\xd8jpeg"
+    assert [path.name for path in (tmp_path / "w185").iterdir()] == ["poster.jpg"]
+    assert stubber.served["network"] == 1 and route.fulfilled[0]["body"] == b"\xff\xd8jpeg"
+
+
+def test_modo_de_imagenes_desconocido_falla():
+    with pytest.raises(ValueError):
+        ImageStubber("pixelado")
+
+
+# ============================================================================
+# ⚡ PARALELO Y SERVIDOR
+# ============================================================================
+
+class _FakeReport:
+    def __init__(self, nodeid, duration, when="call"):
+        self.nodeid = nodeid
+        self.duration = duration
+        self.when = when
+
+
+def test_run_timer_suma_fases_por_test():
+    timer = RunTimer()
+    timer.add_report(_FakeReport("a", 0.5, when="setup"))
+    timer.add_report(_FakeReport("a", 1.5))
+    timer.add_report(_FakeReport("b", 0.1, when="setup"))
+    timer.add_report(_FakeReport("b", 1.9))
+    assert timer.test_durations == {"a": 2.0, "b": 2.0}
+    assert timer.serial_estimate == 4.0
+    assert timer.mean_setup == pytest.approx(0.3)
+
+
+def _makespan(orden, duraciones, workers):
+    # Reparto dinámico: cada test va al primer worker que queda libre
+    libres = [0.0] * workers
+    for nodeid in orden:
+        libres[libres.index(min(libres))] += duraciones[nodeid]
+    return max(libres)
+
+
+def test_historial_de_duraciones_ordena_los_largos_primero(tmp_path):
+    history = DurationHistory(size=3)
+    for _ in range(4):
+        history.update({"corto": 2.0, "largo": 30.0, "medio": 8.0})
+    history.record("largo", 90.0)  # un pico no mueve la mediana
+    history.save(tmp_path / "durations.json")
+
+    history = DurationHistory.load(tmp_path / "durations.json")
+    assert history.durations["largo"] == [30.0, 30.0, 90.0]
+    assert history.estimate("largo") == 30.0
+    assert history.longest_first(["corto", "nuevo", "medio", "largo"]) == ["nuevo", "largo", "medio", "corto"]
+
+
+def test_largos_primero_se_acerca_al_ideal():
+    duraciones = {f"t{i}": 2.0 for i in range(12)}
+    duraciones.update({"secciones": 12.0, "dispositivos": 14.0})
+    history = DurationHistory({nodeid: [segundos] for nodeid, segundos in duraciones.items()})
+    timer = RunTimer()
+    timer.test_durations = dict(duraciones)
+
+    # suma/workers = 12.5s, pero no se puede bajar del test más largo (14s)
+    assert timer.ideal_wall_clock(4) == 14.0
+    assert _makespan(list(duraciones), duraciones, 4) == 20.0
+    assert _makespan(history.longest_first(list(duraciones)), duraciones, 4) == 14.0
+
+
+def test_screenshot_path_separa_por_worker(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    assert screenshot_path("home.png") == Path("screenshots/home.png")
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+    assert screenshot_path("home.png") == Path("screenshots/gw3/home.png")
+    assert (tmp_path / "screenshots" / "gw3").is_dir()
+
+
+def test_servidor_dist_reescribe_rutas_de_la_spa(tmp_path):
+    (tmp_path / "index.html").write_text("<div id=root></div>")
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets" / "app.js").write_text("console.log(1)")
+    server = AppServer("dist", dist_dir=tmp_path, build=False)
+    url = server.start()
+    try:
+        with urllib.request.urlopen(f"{url}/movie/550?autoplay=trailer") as response:
+            assert response.read() == b"<div id=root></div>"
+            assert response.headers["Permissions-Policy"] == "screen-wake-lock=(self)"
+        with urllib.request.urlopen(f"{url}/assets/app.js") as response:
+            assert response.read() == b"console.log(1)"
+    finally:
+        server.stop()
+
+
+
+def test_build_en_cache_mientras_no_cambien_las_fuentes(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "App.tsx").write_text("export default 1")
+    (tmp_path / "index.html").write_text('<div id="root"></div>')
+    dist = tmp_path / "dist"
+    dist.mkdir()
+    (dist / "index.html").write_text('<div id="root"></div>')
+    antes = source_hash(tmp_path)
+    (dist / BUILD_STAMP).write_text(json.dumps({"hash": antes}))
+
+    # Mismo hash: no llama a npm (en tmp_path fallaría)
+    assert ensure_build(dist, root=tmp_path) == (antes, False)
+    (tmp_path / "src" / "App.tsx").write_text("export default 2")
+    assert source_hash(tmp_path) != antes
+    (tmp_path / "src" / "Nuevo.tsx").touch()
+    assert build_hash(dist) == antes
+
+
+def test_servidor_reutilizable_entre_ejecuciones(tmp_path):
+    (tmp_path / "index.html").write_text('<div id="root"></div>')
+    state = tmp_path / "app-server.json"
+    primero = AppServer("dist", dist_dir=tmp_path, build=False, reuse=True, state_path=state)
+    url = primero.start()
+    try:
+        primero.stop()  # el reutilizable sigue vivo
+        assert health_check(url)
+        segundo = AppServer("dist", dist_dir=tmp_path, build=False, reuse=True, state_path=state)
+        assert segundo.start() == url
+        assert segundo.reused and "servidor reutilizado" in segundo.describe()
+    finally:
+        assert stop_recorded_server(state)
+    assert not state.exists()
+
+# ============================================================================
+# ♨️ POOL DE CONTEXTOS
+# ============================================================================
+
+class _FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.url = "about:blank"
+        self.closed = False
+        context.pages.append(self)
+
+    def is_closed(self):
+        return self.closed
+
+    def goto(self, url):
+        self.url = url
+
+    def wait_for_function(self, *args, **kwargs):
+        pass
+
+    def evaluate(self, script, *args):
+        self.context.cleared_storage = True
+
+    def close(self):
+        self.closed = True
+        self.context.pages.remove(self)
+
+
+class _FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.cleared_storage = False
+        self.cookies_cleared = 0
+        self.closed = False
+
+    def new_page(self):
+        return _FakePage(self)
+
+    def clear_cookies(self):
+        if self.closed:
+            raise RuntimeError("Target closed")
+        self.cookies_cleared += 1
+
+    def clear_permissions(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    def new_context(self, **kwargs):
+        context = _FakeContext()
+        self.contexts.append(context)
+        return context
+
+
+def test_pool_reutiliza_contextos_y_limpia_estado():
+    prepared = []
+    pool = ContextPool(_FakeBrowser(), 1, prepare=prepared.append, warm_url="http://app")
+    pool.warm_up()
+    context, page = pool.acquire()
+    page.goto("http://app/trending")
+    pool.release(context, page)
+    assert page.closed and context.cleared_storage and context.cookies_cleared == 1
+
+    again, _ = pool.acquire()
+    assert again is context
+    assert pool.created == 1 and prepared == [context]
+
+
+def test_pool_descarta_contextos_rotos():
+    pool = ContextPool(_FakeBrowser(), 2)
+    context, page = pool.acquire()
+    context.closed = True
+    pool.release(context, page)
+    assert pool.acquire()[0] is not context
+
+
+# ============================================================================
+# 📊 MÉTRICAS
+# ============================================================================
+
+def test_app_routes_coinciden_con_app_tsx():
+    app = (Path(__file__).parent / "src" / "App.tsx").read_text(encoding="utf-8")
+    declaradas = [path for path in re.findall(r'<Route path="([^"]+)"', app) if path != "*"]
+    assert [pattern for pattern, _ in APP_ROUTES] == declaradas
+    assert sample_url("/movie/:id") == "/movie/550"
+    with pytest.raises(KeyError):
+        sample_url("/no-existe")
+
+
+class _MetricsPage:
+    def __init__(self, data):
+        self.data = data
+
+    def evaluate(self, script, *args):
+        return dict(self.data)
+
+
+def test_collect_metrics_construye_page_metrics():
+    datos = {
+        "url": "/trending", "ttfb": 40.0, "dom_content_loaded": 300.0, "load_event": 900.0,
+        "fcp": 350.0, "lcp": 1200.0, "cls": 0.02, "inp": None, "tbt": 120.0, "long_tasks": 3,
+        "request_count": 42, "tmdb_requests": 2, "transfer_bytes": 512_000,
+        "js_heap_bytes": None, "app_ready": 1500.0,
+    }
+    metricas = collect_metrics(_MetricsPage(datos), route="/trending")
+
+    assert isinstance(metricas, PageMetrics)
+    assert metricas.lcp == 1200.0
+    assert metricas.to_dict()["request_count"] == 42
+    resumen = metricas.summary()
+    assert "LCP 1200ms" in resumen and "heap n/a" in resumen and "500KB" in resumen
+
+
+# ============================================================================
+# 💰 PRESUPUESTOS
+# ============================================================================
+
+def test_presupuesto_exacto_gana_al_patron_y_hereda_default():
+    budgets = Budgets(
+        {"lcp": 2500, "app_ready": 5000},
+        {"/tv/:id": {"lcp": 3000}, "/tv/*": {"app_ready": 4000}},
+    )
+    assert budgets.for_route("/tv/:id") == {"lcp": 3000, "app_ready": 5000}
+    assert budgets.for_route("/tv/trending") == {"lcp": 2500, "app_ready": 4000}
+    assert budgets.for_route("/upcoming") == {"lcp": 2500, "app_ready": 5000}
+
+
+def test_archivo_de_presupuestos_cubre_todas_las_rutas():
+    budgets = load_budgets()
+    rutas = {pattern for pattern, _ in APP_ROUTES}
+    for clave in budgets.routes:
+        assert clave in rutas or "*" in clave, f"Presupuesto para una ruta que no existe: {clave}"
+    for ruta in rutas:
+        limites = budgets.for_route(ruta)
+        assert {"app_ready", "lcp", "request_count", "transfer_bytes", "js_heap_bytes"} <= set(limites)
+
+
+def test_check_budget_ignora_metricas_sin_dato():
+    metricas = PageMetrics(route="/trending", url="/trending", lcp=3100.0, js_heap_bytes=None)
+    violations = check_budget(metricas, {"lcp": 2500, "js_heap_bytes": 1})
+
+    assert [v.metric for v in violations] == ["lcp"]
+    assert "+600ms (+24%)" in violations[0].describe()
+
+
+def test_historial_detecta_regresion_frente_a_otros_commits(tmp_path):
+    history = BaselineHistory(tmp_path, size=3)
+    for commit, lcp in [("a", 1000.0), ("b", 1100.0), ("c", 1050.0), ("d", 1000.0)]:
+        history.record(PageMetrics(route="/movie/:id", url="/movie/550", lcp=lcp), commit)
+
+    assert len(history.entries("/movie/:id")) == 3
+    assert history.baseline("/movie/:id")["lcp"] == 1050.0
+
+    lenta = PageMetrics(route="/movie/:id", url="/movie/550", lcp=1600.0)
+    assert [v.metric for v in history.regressions(lenta, commit="e")] == ["lcp"]
+    # Por debajo del ruido no cuenta aunque supere la tolerancia relativa
+    history.record(PageMetrics(route="/", url="/", cls=0.01), "a")
+    assert history.regressions(PageMetrics(route="/", url="/", cls=0.025), commit="e") == []
+
+
+def test_historial_separado_por_tmdb_y_servidor(tmp_path):
+    replay = BaselineHistory.for_run(tmdb_mode="replay", server_mode="dist", directory=tmp_path)
+    live = BaselineHistory.for_run(tmdb_mode="live", server_mode="dev", directory=tmp_path)
+    movil = BaselineHistory.for_run("movil-3g", "replay", "dist", directory=tmp_path)
+    assert replay.directory == tmp_path / "sin-perfil-replay-dist"
+    assert movil.directory == tmp_path / "movil-3g-replay-dist"
+
+    replay.record(PageMetrics(route="/", url="/", lcp=800.0), "a")
+    assert live.baseline("/") == {}
+    assert replay.baseline("/")["lcp"] == 800.0
+
+
+# ============================================================================
+# 🔎 AUDITORÍA DE TMDB
+# ============================================================================
+
+def test_route_for_path_prefiere_segmentos_fijos():
+    assert route_for_path("/movie/550") == "/movie/:id"
+    assert route_for_path("/tv/trending") == "/tv/trending"
+    assert route_for_path("/tv/1399") == "/tv/:id"
+    assert route_for_path("/no-existe") is None
+
+
+def test_auditor_detecta_videos_ya_incluidos_en_append_to_response():
+    auditor = TMDBAuditor()
+    auditor.start_view("/")
+    auditor.record(f"{TMDB}/trending/movie/week?api_key=x&language=es-ES")
+    auditor.record(f"{TMDB}/movie/550?api_key=x&append_to_response=credits,videos,images")
+    auditor.record(f"{TMDB}/movie/550/videos?api_key=x")
+    auditor.record("https://image.tmdb.org/t/p/w500/poster.jpg")
+
+    assert len(auditor.calls) == 3
+    [finding] = auditor.findings()
+    assert finding.kind == "redundant"
+    assert finding.request == "movie/550/videos"
+    assert "append_to_response=videos" in finding.detail
+
+
+def test_auditor_separa_vistas_y_aplica_presupuesto_por_ruta():
+    auditor = TMDBAuditor()
+    auditor.start_view("/movie/550")
+    for _ in range(2):
+        auditor.record(f"{TMDB}/movie/550/watch/providers?api_key=x")
+    auditor.start_view("/movie/550")
+    auditor.start_view("/trending")
+    auditor.record(f"{TMDB}/movie/550/watch/providers?api_key=x")
+
+    assert [len(view.calls) for view in auditor.views] == [2, 1]
+    assert [f.kind for f in auditor.findings()] == ["duplicate"]
+
+    budgets = Budgets({"tmdb_requests": 1}, {})
+    [exceso] = auditor.over_budget(budgets)
+    assert (exceso.route, exceso.actual) == ("/movie/:id", 2)
+    assert "2× movie/{id}/watch/providers" in auditor.report()
+
+
+# ============================================================================
+# 📱 PERFILES DE DISPOSITIVO
+# ============================================================================
+
+class _FakeCDPSession:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, method, params=None):
+        self.sent.append((method, params))
+
+    def detach(self):
+        pass
+
+
+class _FakeBrowserType:
+    def __init__(self, name):
+        self.name = name
+
+
+class _ThrottledPage:
+    def __init__(self, browser_name):
+        self.session = _FakeCDPSession()
+        self.context = self
+        self.browser = self
+        self.browser_type = _FakeBrowserType(browser_name)
+
+    def new_cdp_session(self, page):
+        return self.session
+
+
+def test_perfil_convierte_kbps_a_bytes_por_segundo():
+    perfil = DEVICE_PROFILES["movil-3g"]
+    condiciones = perfil.network_conditions()
+
+    assert condiciones["latency"] == 300
+    assert condiciones["downloadThroughput"] == 750 * 1024 / 8
+    assert perfil.context_args()["viewport"] == {"width": 360, "height": 740}
+    assert perfil.context_args()["is_mobile"] is True
+
+
+def test_perfiles_cubren_movil_tablet_y_escritorio():
+    anchos = sorted(perfil.width for perfil in DEVICE_PROFILES.values())
+    assert 768 in anchos
+    assert anchos[0] < 768 < anchos[-1]
+
+
+def test_perfil_aplica_red_y_cpu_solo_en_chromium():
+    chromium = _ThrottledPage("chromium")
+    assert DEVICE_PROFILES["movil-4g"].throttle(chromium) is chromium.session
+    assert [method for method, _ in chromium.session.sent] == [
+        "Network.enable",
+        "Network.emulateNetworkConditions",
+        "Emulation.setCPUThrottlingRate",
+    ]
+    assert chromium.session.sent[-1][1] == {"rate": 4}
+
+    firefox = _ThrottledPage("firefox")
+    assert DEVICE_PROFILES["movil-4g"].throttle(firefox) is None
+    assert firefox.session.sent == []
+
+
+# ============================================================================
+# 👥 CARGA CON VARIOS USUARIOS
+# ============================================================================
+
+def test_percentil_interpola_como_numpy():
+    valores = [10, 20, 30, 40]
+    assert percentile(valores, 50) == 25
+    assert percentile(valores, 95) == pytest.approx(38.5)
+    assert percentile([7], 99) == 7
+    assert percentile([], 50) is None
+
+
+def test_load_report_resume_pasos_y_throughput():
+    report = LoadReport(users=2)
+    for duracion in (100, 200, 300):
+        report.add("home", duracion)
+    report.add_error("detalle", TimeoutError("Timeout 15000ms exceeded.\nCall log: ..."))
+    report.journeys = 2
+    report.wall_clock = 4.0
+
+    assert report.throughput() == (0.5, 0.75)
+    lineas = report.lines()
+    assert lineas[1].split()[:3] == ["home", "3", "200ms"]
+    assert "Primer error en detalle: TimeoutError: Timeout 15000ms exceeded." in lineas
+
+
+class _AsyncRoute:
+    """Route de la API async: fulfill/abort devuelven algo que hay que esperar"""
+
+    def __init__(self, url):
+        self.request = type("Request", (), {"url": url})()
+
+    def fulfill(self, **kwargs):
+        return ("fulfill", kwargs.get("status"))
+
+    def abort(self, error_code=None):
+        return ("abort", error_code)
+
+
+def test_handlers_devuelven_la_llamada_para_la_api_async():
+    index = TMDBReplayIndex({"movie/popular?*": {"results": []}})
+    assert index.route_handler(_AsyncRoute(f"{TMDB}/movie/popular?page=1")) == ("fulfill", 200)
+    assert ImageStubber("block").route_handler(_AsyncRoute("https://image.tmdb.org/t/p/w500/a.jpg")) == (
+        "abort",
+        "blockedbyclient",
+    )
+
+
+# ============================================================================
+# 🗄️ ALMACÉN DE GRABACIONES
+# ============================================================================
+
+REPARTO = {"cast": [{"id": 1, "name": "Actriz"}], "crew": []}
+GENEROS = {"genres": [{"id": 28, "name": "Acción"}]}
+
+
+def test_almacen_guarda_una_vez_los_subdocumentos_repetidos():
+    store = FixtureStore()
+    for movie_id in (550, 551):
+        store.put(
+            f"{TMDB}/movie/{movie_id}?api_key=x&language=es-ES&append_to_response=credits,videos",
+            {"id": movie_id, "title": f"Peli {movie_id}", "credits": REPARTO, "videos": {"results": []}},
+        )
+    store.put(f"{TMDB}/genre/movie/list?api_key=x", GENEROS)
+    store.put(f"{TMDB}/genre/tv/list?api_key=x", GENEROS)
+
+    # 2 películas + reparto y vídeos compartidos + géneros (lista y documento) compartidos
+    assert len(store.objects) == 6
+    detalle = store.lookup(f"{TMDB}/movie/551?append_to_response=credits,videos&api_key=y")
+    assert detalle["credits"] == REPARTO and detalle["title"] == "Peli 551"
+    assert store.index["genre/tv/list?"]["url"] == f"{TMDB}/genre/tv/list"
+
+
+def test_almacen_se_guarda_comprimido_y_mezcla_grabaciones(tmp_path):
+    path = tmp_path / "recorded.json.gz"
+    primero = FixtureStore()
+    primero.put(f"{TMDB}/movie/popular?page=1", {"results": [{"id": 1}]}, recorded_at=100)
+    primero.save(path)
+    segundo = FixtureStore()
+    segundo.put(f"{TMDB}/movie/popular?page=1", {"results": [{"id": 2}]}, recorded_at=200)
+    segundo.put(f"{TMDB}/movie/top_rated?page=1", {"results": []}, recorded_at=50)
+    segundo.save(path)
+
+    cargado = FixtureStore.load(path)
+    assert path.read_bytes()[:2] == b"\x1f\x8b"
+    assert cargado.get("movie/popular?page=1") == {"results": [{"id": 2}]}
+    assert len(cargado) == 2
+    # El objeto de la grabación sustituida ya no se guarda
+    assert len(cargado.objects) == 2
+
+
+def test_refresh_solo_descarga_lo_viejo_y_lo_que_falta():
+    store = FixtureStore()
+    store.put(f"{TMDB}/movie/popular", {"results": []}, recorded_at=0)
+    store.put(f"{TMDB}/movie/upcoming", {"results": []})
+    pedidas = []
+
+    def fetch(url):
+        pedidas.append(url)
+        return {"results": [{"id": len(pedidas)}]}
+
+    actualizadas, nuevas, fallidas = refresh(
+        store,
+        max_age_seconds=3600,
+        missing_urls=[f"{TMDB}/movie/now_playing?api_key=x&page=1", f"{TMDB}/movie/upcoming?api_key=x"],
+        fetch=fetch,
+    )
+    assert actualizadas == ["movie/popular?"]
+    assert nuevas == ["movie/now_playing?page=1"]
+    assert fallidas == []
+    assert pedidas == [f"{TMDB}/movie/popular", f"{TMDB}/movie/now_playing?page=1"]
+
+
+def test_replay_prefiere_la_grabacion_exacta():
+    index = TMDBReplayIndex({"movie/popular?*": {"results": [{"id": 1}]}})
+    store = FixtureStore()
+    store.put(f"{TMDB}/movie/popular?page=2", {"results": [{"id": 2}]})
+    index.add_store(store)
+
+    assert index.lookup(f"{TMDB}/movie/popular?page=2&api_key=x") == {"results": [{"id": 2}]}
+    assert index.lookup(f"{TMDB}/movie/popular?page=3") == {"results": [{"id": 1}]}
+
+
+def test_replay_index_superpone_las_grabaciones(tmp_path):
+    fixtures = tmp_path / "replay.json"
+    fixtures.write_text(json.dumps({"entries": {"movie/popular?*": {"results": [{"id": 1}]}}}))
+    store = FixtureStore()
+    store.put(f"{TMDB}/movie/popular?page=2", {"results": [{"id": 2}]})
+    store.save(tmp_path / "recorded.json.gz")
+
+    index = replay_index(fixtures, tmp_path / "recorded.json.gz")
+    assert index.lookup(f"{TMDB}/movie/popular?page=2") == {"results": [{"id": 2}]}
+    assert index.lookup(f"{TMDB}/movie/popular?page=3") == {"results": [{"id": 1}]}
+    # Sin almacén grabado queda solo replay.json
+    assert replay_index(fixtures, tmp_path / "no-existe.json.gz").lookup(f"{TMDB}/movie/popular?page=2") == {
+        "results": [{"id": 1}]}
+
+
+def test_bloqueo_rompe_el_de_un_proceso_muerto_o_caducado(tmp_path):
+    lock = tmp_path / "recorded.json.gz.lock"
+    muerto = subprocess.Popen([sys.executable, "-c", "pass"])
+    muerto.wait()
+    lock.write_text(f"{muerto.pid} {time.time()}")
+    with file_lock(lock, timeout=5):
+        assert lock.read_text().split()[0] == str(os.getpid())
+    assert not lock.exists()
+
+    # Dueño vivo pero con un bloqueo más viejo que el timeout
+    lock.write_text(f"{os.getpid()} {time.time() - 60}")
+    with file_lock(lock, timeout=1):
+        pass
+    assert not lock.exists()
+
+
+def test_bloqueo_espera_al_dueno_vivo(tmp_path):
+    lock = tmp_path / "index.json.lock"
+    lock.write_text(f"{os.getpid()} {time.time()}")
+    with pytest.raises(TimeoutError):
+        with file_lock(lock, timeout=0.2, stale_after=60):
+            pass
+    assert lock.exists()
+
+
+# ============================================================================
+# 👁️ REGRESIÓN VISUAL
+# ============================================================================
+
+def _captura(path, color=(20, 20, 40), rect=None, rect_color=(250, 250, 250), size=(320, 180)):
+    Image = pytest.importorskip("PIL.Image")
+    image = Image.new("RGB", size, color)
+    if rect is not None:
+        x, y, width, height = rect
+        image.paste(rect_color, (x, y, x + width, y + height))
+    image.save(path)
+    return path
+
+
+def test_visual_aprueba_y_reconoce_capturas_identicas(tmp_path):
+    pytest.importorskip("numpy")
+    from movieverse_testing.visual import BaselineStore
+
+    store = BaselineStore(tmp_path / "baselines")
+    captura = _captura(tmp_path / "home.png", rect=(10, 10, 100, 40))
+    store.approve(captura)
+
+    assert store.compare(captura).status == "identical"
+    # Otra instancia lee los hashes de index.json
+    assert BaselineStore(tmp_path / "baselines").compare(captura).ok
+
+
+def test_visual_detecta_cambios_y_escribe_diff_solo_al_fallar(tmp_path):
+    pytest.importorskip("numpy")
+    from movieverse_testing.visual import BaselineStore
+
+    store = BaselineStore(tmp_path / "baselines")
+    store.approve(_captura(tmp_path / "home.png", rect=(10, 10, 100, 40)))
+    (tmp_path / "actual").mkdir()
+    movida = _captura(tmp_path / "actual" / "home.png", rect=(150, 100, 100, 40))
+
+    resultado = store.compare(movida)
+    assert resultado.status == "changed"
+    assert resultado.diff_path == tmp_path / "actual" / "diffs" / "home.png"
+    assert resultado.diff_path.exists()
+
+    # Con las zonas que cambian tapadas ya no hay diferencias
+    tapada = store.compare(movida, masks=[(0, 0, 320, 180)])
+    assert tapada.status == "within-tolerance"
+    assert not (tmp_path / "diffs").exists()
+
+    assert store.compare(_captura(tmp_path / "otra.png")).status == "missing-baseline"
+
+
+def test_visual_compara_40_capturas_en_menos_de_un_segundo(tmp_path):
+    pytest.importorskip("numpy")
+    import time
+
+    from movieverse_testing.visual import BaselineStore, collect_screenshots
+
+    store = BaselineStore(tmp_path / "baselines")
+    capturas = tmp_path / "screenshots"
+    capturas.mkdir()
+    for i in range(40):
+        store.approve(_captura(capturas / f"c{i}.png", rect=(i, i, 50, 50), size=(1280, 720)))
+    # Unas pocas cambian de verdad y obligan a hacer el diff de píxeles
+    for i in range(0, 40, 10):
+        _captura(capturas / f"c{i}.png", rect=(i + 300, i, 50, 50), size=(1280, 720))
+
+    inicio = time.perf_counter()
+    resultados = store.compare_all(collect_screenshots(capturas))
+    duracion = time.perf_counter() - inicio
+
+    assert sum(not r.ok for r in resultados) == 4
+    assert duracion < 1.0, f"Comparar 40 capturas tardó {duracion:.2f}s"
+
+
+class _VisualPage:
+    def __init__(self, width, height, scale):
+        self.viewport_size = {"width": width, "height": height}
+        self.scale = scale
+
+    def evaluate(self, script):
+        return self.scale
+
+
+def test_visual_separa_baselines_por_perfil_y_viewport(tmp_path):
+    pytest.importorskip("numpy")
+    from movieverse_testing.visual import BaselineStore, page_namespace
+
+    movil = page_namespace(_VisualPage(360, 740, 2))
+    escritorio = page_namespace(_VisualPage(1280, 720, 1))
+    assert (movil, escritorio) == ("movil-3g-360x740@2x", "sin-perfil-1280x720@1x")
+
+    BaselineStore(tmp_path / "baselines", movil).approve(_captura(tmp_path / "home.png", size=(180, 370)))
+    store = BaselineStore(tmp_path / "baselines", escritorio)
+    assert store.compare(_captura(tmp_path / "home.png")).status == "missing-baseline"
+    store.approve(tmp_path / "home.png")
+
+    assert (tmp_path / "baselines" / movil / "home.png").exists()
+    indice = json.loads((tmp_path / "baselines" / "index.json").read_text())
+    assert sorted(indice) == [f"{movil}/home.png", f"{escritorio}/home.png"]
+    assert indice[f"{movil}/home.png"]["size"] == [180, 370]
+
+
+# ============================================================================
+# 📸 POLÍTICA DE CAPTURAS
+# ============================================================================
+
+class _ScreenshotPage:
+    def __init__(self):
+        self.calls = []
+
+    def screenshot(self, **kwargs):
+        self.calls.append(kwargs)
+        return b"bytes-de-la-captura"
+
+
+@pytest.fixture
+def capturas(monkeypatch, tmp_path):
+    from movieverse_testing import screenshots
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    yield screenshots
+    screenshots.writer.flush()
+    screenshots.configure()
+
+
+def test_muestreo_es_determinista_por_nombre(capturas):
+    capturas.configure(policy="sampled", sample_rate=0.25)
+    nombres = [f"captura_{i}.png" for i in range(400)]
+    elegidas = [nombre for nombre in nombres if capturas.settings.should_capture(nombre)]
+
+    assert 60 < len(elegidas) < 140
+    assert elegidas == [nombre for nombre in nombres if capturas.settings.should_capture(nombre)]
+
+
+def test_jpeg_se_pide_al_navegador_y_se_escribe_en_segundo_plano(capturas, tmp_path):
+    capturas.configure(format="jpeg", quality=60)
+    page = _ScreenshotPage()
+
+    path = capturas.take_screenshot(page, "home.png", full_page=True)
+    assert capturas.writer.flush() == []
+
+    assert path == Path("screenshots/home.jpg")
+    assert (tmp_path / path).read_bytes() == b"bytes-de-la-captura"
+    assert page.calls == [{"full_page": True, "type": "jpeg", "quality": 60}]
+
+
+def test_on_failure_no_captura_durante_el_test(capturas):
+    capturas.configure(policy="on-failure")
+    page = _ScreenshotPage()
+
+    assert capturas.take_screenshot(page, "home.png") is None
+    assert page.calls == []
+
+
+def test_element_captura_solo_el_componente(capturas):
+    page, hero = _ScreenshotPage(), _ScreenshotPage()
+    capturas.take_screenshot(page, "hero.png", element=hero)
+
+    assert page.calls == [] and len(hero.calls) == 1
+
+
+def test_contadores_del_writer_cuadran_con_varios_hilos(tmp_path):
+    from movieverse_testing.screenshots import ScreenshotWriter
+
+    writer = ScreenshotWriter(max_workers=8)
+    for i in range(200):
+        writer.submit(tmp_path / f"c{i}.png", b"x" * (i + 1))
+    assert writer.flush() == []
+
+    assert writer.written == 200
+    assert writer.bytes_written == sum(range(1, 201))
+
+
+# ============================================================================
+# 🎯 ANÁLISIS DE IMPACTO
+# ============================================================================
+
+def _mapa_de_impacto():
+    detalle_serie = ImpactTracker()
+    detalle_serie.add_coverage([
+        {"url": "http://localhost:5173/src/pages/TVSeriesDetailPage.tsx?t=1", "functions": [{"ranges": [{"count": 1}]}]},
+        {"url": "http://localhost:5173/src/components/tv/TVSeriesCard.tsx", "functions": [{"ranges": [{"count": 1}]}]},
+        {"url": "http://localhost:5173/src/pages/HomePage.tsx", "functions": [{"ranges": [{"count": 0}]}]},
+        {"url": "http://localhost:5173/node_modules/.vite/deps/react.js", "functions": [{"ranges": [{"count": 1}]}]},
+    ])
+    detalle_serie.record_navigation("http://localhost:5173/tv/1399")
+    detalle_serie.record_request(f"{TMDB}/tv/1399?api_key=x&append_to_response=credits")
+
+    home_dist = ImpactTracker()
+    home_dist.add_coverage([
+        {"url": "http://localhost:4173/assets/index-9f8e7d.js", "functions": [{"ranges": [{"count": 1}]}]},
+        {"url": "http://localhost:4173/assets/HomePage-a1b2c3.js", "functions": [{"ranges": [{"count": 1}]}]},
+    ])
+    home_dist.record_request(f"{TMDB}/movie/popular?page=1")
+
+    return ImpactMap({
+        "test_movieverse_ejercicios.py::test_serie": detalle_serie.entry(),
+        "test_movieverse_ejercicios.py::test_home": home_dist.entry(),
+        "test_herramientas.py::test_unitario": ImpactTracker().entry(),
+    })
+
+
+def _seleccion(mapa, *files, endpoints=()):
+    selected, _ = mapa.select(sorted(mapa.tests), ChangeSet("main", list(files), set(endpoints)))
+    return [nodeid.split("::")[1] for nodeid in selected]
+
+
+def test_impacto_mapea_rutas_de_app_tsx_a_paginas():
+    assert route_pages()["/tv/:id"] == "src/pages/TVSeriesDetailPage.tsx"
+    assert source_file("http://localhost:4173/assets/TVSeriesDetailPage-x1y2.js") == "src/pages/TVSeriesDetailPage.tsx"
+    assert source_file("http://localhost:5173/@vite/client") is None
+
+
+def test_impacto_cambio_en_una_pagina_solo_ejecuta_quien_la_usa():
+    mapa = _mapa_de_impacto()
+    entry = mapa.tests["test_movieverse_ejercicios.py::test_serie"]
+    assert entry["routes"] == ["/tv/:id"] and entry["endpoints"] == ["tv/{id}"]
+
+    assert _seleccion(mapa, "src/pages/TVSeriesDetailPage.tsx") == ["test_serie"]
+    assert _seleccion(mapa, "src/pages/HomePage.tsx") == ["test_home"]
+    # Un componente fuera de las páginas puede ir en el bundle de dist/
+    assert _seleccion(mapa, "src/components/tv/TVSeriesCard.tsx") == ["test_home", "test_serie"]
+
+
+def test_impacto_cambios_globales_desconocidos_y_de_tipos():
+    mapa = _mapa_de_impacto()
+
+    assert len(_seleccion(mapa, "vite.config.ts")) == 3
+    assert len(_seleccion(mapa, "src/components/ui/NuevoComponente.tsx")) == 3
+    assert _seleccion(mapa, "src/types/movie.types.ts", "README_TESTING.md") == []
+    assert _seleccion(mapa, "test_herramientas.py") == ["test_unitario"]
+
+
+def test_impacto_por_respuestas_de_tmdb_cambiadas():
+    antes = {"movie/popular?*": {"page": 1}, "tv/{id}?*": {"id": 1}}
+    despues = {"movie/popular?*": {"page": 2}, "tv/{id}?*": {"id": 1}}
+    endpoints = changed_endpoints(antes, despues)
+
+    assert endpoints == {"movie/popular"}
+    assert _seleccion(_mapa_de_impacto(), "fixtures/tmdb/replay.json", endpoints=endpoints) == ["test_home"]
+
+
+# ============================================================================
+# 🧠 FUGAS DE MEMORIA
+# ============================================================================
+
+def _heap_snapshot(objetos, detachedness=True):
+    # objetos: (tipo, nombre, bytes, detached)
+    fields = ["type", "name", "id", "self_size", "edge_count"] + (["detachedness"] if detachedness else [])
+    strings, nodes = [], []
+    for index, (tipo, nombre, size, detached) in enumerate(objetos):
+        if not detachedness and detached:
+            nombre = f"Detached {nombre}"
+        strings.append(nombre)
+        nodes += [["hidden", "object", "closure", "native"].index(tipo), index, index, size, 0]
+        if detachedness:
+            nodes.append(2 if detached else 1)
+    meta = {"node_fields": fields, "node_types": [["hidden", "object", "closure", "native"]]}
+    return {"snapshot": {"meta": meta}, "nodes": nodes, "strings": strings}
+
+
+class _LeakySession:
+    """Sesión CDP de una página que pierde 3 listeners, un iframe y un Swiper por ciclo"""
+
+    def __init__(self):
+        self.measures = 0
+        self.listeners = {}
+
+    def on(self, event, handler):
+        self.listeners[event] = handler
+
+    def remove_listener(self, event, handler):
+        del self.listeners[event]
+
+    def detach(self):
+        pass
+
+    def send(self, method, params=None):
+        if method == "Performance.getMetrics":
+            self.measures += 1
+            cycle = self.measures
+            return {"metrics": [
+                {"name": "JSHeapUsedSize", "value": 20e6 + cycle * 400_000},
+                {"name": "JSEventListeners", "value": 100 + 3 * cycle},
+                {"name": "Nodes", "value": 1500},
+                {"name": "Documents", "value": 1 + cycle},
+            ]}
+        if method == "HeapProfiler.takeHeapSnapshot":
+            objetos = [("object", "Object", 1000, False)]
+            objetos += [("object", "Swiper", 5000, False)] * self.measures
+            objetos += [("native", "HTMLDivElement", 100, True)] * (2 * self.measures)
+            chunk = json.dumps(_heap_snapshot(objetos))
+            self.listeners["HeapProfiler.addHeapSnapshotChunk"]({"chunk": chunk[:10]})
+            self.listeners["HeapProfiler.addHeapSnapshotChunk"]({"chunk": chunk[10:]})
+        return {}
+
+
+class _LeakyPage(_ThrottledPage):
+    def __init__(self):
+        super().__init__("chromium")
+        self.session = _LeakySession()
+        self.visited = []
+
+    def goto(self, url, timeout=None):
+        self.visited.append(url)
+
+    def evaluate(self, script, arg=None):
+        if arg is not None:
+            self.visited.append(arg)
+
+    def wait_for_function(self, *args, **kwargs):
+        pass
+
+
+def test_snapshot_cuenta_detached_con_y_sin_campo_detachedness():
+    objetos = [("object", "Swiper", 500, False), ("native", "HTMLDivElement", 80, True),
+               ("native", "HTMLDivElement", 80, False), ("hidden", "system", 10, False)]
+    for detachedness in (True, False):
+        resumen = summarize_snapshot(_heap_snapshot(objetos, detachedness))
+        assert resumen.total_size == 670
+        assert resumen.detached_nodes == 1
+        assert resumen.constructors["Swiper"] == [1, 500]
+
+
+def test_detector_de_fugas_mide_crecimiento_por_ciclo_y_aplica_presupuesto():
+    page = _LeakyPage()
+    report = detect_leaks(page, "http://app", ["/", "/movie/550", "/"], route="/movie/:id", cycles=4)
+
+    # calentamiento + 4 ciclos medidos, todo dentro de la SPA
+    assert page.visited == ["http://app/"] + ["/movie/550", "/"] * 5
+    assert len(report.samples) == 4
+    assert [sample.heap is not None for sample in report.samples] == [True, False, False, True]
+    assert report.listener_growth == pytest.approx(3)
+    assert report.document_growth == pytest.approx(1)
+    assert report.detached_node_growth == pytest.approx(2)
+    assert report.top_constructors(1) == [("Swiper", 1.0, 5000.0)]
+
+    limites = load_leak_budgets().for_route("/movie/:id")
+    fuera = {violation.metric for violation in check_budget(report, limites)}
+    assert fuera == {"heap_growth_bytes", "listener_growth", "document_growth"}
+    assert "Swiper" in "\n".join(report.lines())
+
+
+# ============================================================================
+# 🎠 RENDIMIENTO DEL SCROLL
+# ============================================================================
+
+def test_frames_perdidos_se_cuentan_en_vsyncs():
+    # 10 frames a 60Hz, un hueco de 50ms (2 perdidos) y otros 5 frames
+    instantes = [i * VSYNC_MS for i in range(10)]
+    instantes += [instantes[-1] + 50 + i * VSYNC_MS for i in range(5)]
+    stats = frame_stats(instantes)
+
+    assert stats.frames == 15
+    assert stats.dropped == 2
+    assert stats.worst_frame_ms == pytest.approx(50)
+    assert stats.dropped_ratio == pytest.approx(2 / 16)
+    assert stats.fps == pytest.approx(14 * 1000 / stats.duration_ms)
+
+
+class _ScrollContainer:
+    first = property(lambda self: self)
+
+    def count(self):
+        return 1
+
+    def scroll_into_view_if_needed(self):
+        pass
+
+    def evaluate(self, script, arg=None):
+        return 1200
+
+    def bounding_box(self):
+        return {"x": 0, "y": 0, "width": 800, "height": 300}
+
+
+class _ScrollPage:
+    def __init__(self):
+        self.session = _FakeCDPSession()
+        self.context = self
+
+    def new_cdp_session(self, page):
+        return self.session
+
+    def locator(self, selector):
+        return _ScrollContainer()
+
+    def evaluate(self, script):
+        return [i * VSYNC_MS for i in range(5)]
+
+
+def test_scroll_combina_la_condicion_con_la_cpu_del_perfil():
+    movil_3g = DEVICE_PROFILES["movil-3g"]
+    tasas = {}
+    for condicion in ("normal", "cpu-lenta"):
+        page = _ScrollPage()
+        resultado = measure_scroll(page, "MovieRow", "drag", condition=condicion, trace=False, profile=movil_3g)
+        tasas[condicion] = [params["rate"] for method, params in page.session.sent
+                            if method == "Emulation.setCPUThrottlingRate"]
+        assert f"{resultado.cpu_rate:g}x" in resultado.line()
+        # El perfil móvil ya es táctil: no se apaga la emulación táctil del contexto
+        assert all(method != "Emulation.setTouchEmulationEnabled" for method, _ in page.session.sent)
+
+    # Durante el gesto nunca menos que el perfil (6x) y al terminar se restaura
+    assert tasas == {"normal": [6, 6], "cpu-lenta": [6, 6]}
+
+    sin_perfil = _ScrollPage()
+    assert measure_scroll(sin_perfil, "MovieRow", "wheel", condition="cpu-lenta", trace=False).cpu_rate == 4
+    assert [params["rate"] for method, params in sin_perfil.session.sent
+            if method == "Emulation.setCPUThrottlingRate"] == [4, 1]
+
+
+def test_frame_timeline_lee_pipeline_reporter_y_formato_antiguo():
+    def reporter(state):
+        return {"name": "PipelineReporter", "ph": "b", "args": {"chrome_frame_reporter": {"state": state}}}
+
+    nuevos = [reporter("STATE_PRESENTED_ALL")] * 8 + [reporter("STATE_DROPPED")] * 2
+    nuevos += [{"name": "PipelineReporter", "ph": "e", "args": {}}] * 10
+    assert frame_timeline(nuevos).dropped_ratio == pytest.approx(0.2)
+
+    antiguos = [{"name": "DrawFrame"}] * 9 + [{"name": "DroppedFrame"}]
+    timeline = frame_timeline(parse_trace(json.dumps({"traceEvents": antiguos})))
+    assert (timeline.presented, timeline.dropped) == (9, 1)
+
+
+# ============================================================================
+# 🎞️ TRAZAS DE CHROME
+# ============================================================================
+
+def _traza_sintetica():
+    """Un hilo principal con una tarea (script → layout) y un perfil de V8"""
+    main = {"pid": 1, "tid": 7}
+    return [
+        {**main, "ph": "M", "name": "thread_name", "args": {"name": "CrRendererMain"}},
+        {"pid": 1, "tid": 9, "ph": "M", "name": "thread_name", "args": {"name": "Compositor"}},
+        {**main, "ph": "X", "name": "RunTask", "ts": 0, "dur": 100_000},
+        {**main, "ph": "X", "name": "FunctionCall", "ts": 10_000, "dur": 50_000},
+        {**main, "ph": "X", "name": "v8.run", "ts": 12_000, "dur": 20_000},  # hereda scripting
+        {**main, "ph": "X", "name": "Layout", "ts": 40_000, "dur": 15_000},  # dentro del script
+        {**main, "ph": "X", "name": "Paint", "ts": 70_000, "dur": 10_000},
+        {**main, "ph": "X", "name": "MinorGC", "ts": 85_000, "dur": 5_000},
+        {"pid": 1, "tid": 9, "ph": "X", "name": "Paint", "ts": 0, "dur": 90_000},  # otro hilo
+        {"pid": 1, "tid": 7, "ph": "P", "name": "ProfileChunk", "id": "0x1", "args": {"data": {
+            "cpuProfile": {
+                "nodes": [
+                    {"id": 1, "callFrame": {"functionName": "(root)", "url": ""}},
+                    {"id": 2, "callFrame": {"functionName": "MovieRow", "url": "http://localhost:5173/src/components/MovieRow.tsx"}},
+                    {"id": 3, "callFrame": {"functionName": "formatDate", "url": "http://localhost:5173/src/utils/date.ts"}},
+                    {"id": 4, "callFrame": {"functionName": "(idle)", "url": ""}},
+                ],
+                "samples": [2, 2, 3],
+            },
+            "timeDeltas": [0, 4_000, 3_000],
+        }}},
+        {"pid": 1, "tid": 7, "ph": "P", "name": "ProfileChunk", "id": "0x1", "args": {"data": {
+            "cpuProfile": {"samples": [4, 2]},
+            "timeDeltas": [2_000, 9_000],
+        }}},
+    ]
+
+
+def test_resumen_de_traza_reparte_self_time_por_categoria():
+    resumen = summarize_trace(_traza_sintetica(), name="detalle")
+
+    assert resumen.duration_ms == 100
+    # FunctionCall: 50 - 15 de Layout (el hijo v8.run también es scripting)
+    assert resumen.categories == {"scripting": 35.0, "layout": 15.0, "paint": 10.0, "gc": 5.0, "other": 35.0}
+    # Cada muestra se queda con el tiempo hasta la siguiente; (idle) no cuenta
+    assert resumen.top_functions[0] == ["MovieRow", "http://localhost:5173/src/components/MovieRow.tsx", 7.0]
+    assert resumen.top_functions[1][:2] == ["formatDate", "http://localhost:5173/src/utils/date.ts"]
+    assert resumen.top_functions[1][2] == pytest.approx(2.0)
+    assert resumen.top_components == [["MovieRow", 7.0]]
+
+
+def test_comparar_trazas_muestra_las_diferencias(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    eventos = _traza_sintetica()
+    ruta, antes = save_trace("detalle pelicula", json.dumps({"traceEvents": eventos}))
+
+    assert ruta == Path("traces/detalle_pelicula.json.gz")
+    assert load_summary(Path("traces/detalle_pelicula.summary.json")) == antes
+    assert load_summary(ruta).categories == antes.categories
+    assert load_summary(ruta).name == "detalle_pelicula"
+
+    eventos[3]["dur"] = 60_000  # FunctionCall 10ms más lenta
+    despues = summarize_trace(eventos, name="despues")
+    lineas = compare_summaries(antes, despues)
+    assert any(linea.split()[0] == "scripting" and linea.endswith("+10ms") for linea in lineas)
+
+
+def test_nombre_de_traza_es_el_mismo_en_cualquier_worker(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PYTEST_CURRENT_TEST", "test_a.py::test_detalle[550] (call)")
+    rutas = []
+    for worker in ("gw1", "gw3"):
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", worker)
+        assert trace_name("detalle") == "test_a.py::test_detalle[550]--detalle"
+        rutas.append(save_trace(trace_name("detalle"), json.dumps({"traceEvents": _traza_sintetica()}))[0])
+    monkeypatch.delenv("PYTEST_XDIST_WORKER")
+    assert trace_name(nodeid="test_b.py::test_detalle[550]") == "test_b.py::test_detalle[550]"
+
+    assert rutas == [Path("traces/test_a.py__test_detalle_550_--detalle.json.gz")] * 2
+
+
+# ============================================================================
+# ✅ EXPECTATIVAS EN LOTE
+# ============================================================================
+
+class _BatchPage:
+    """Página falsa: devuelve el resultado que daría EXPECT_ALL_SCRIPT"""
+
+    def __init__(self, results):
+        self.results = results
+        self.calls = []
+
+    def evaluate(self, script, arg):
+        self.calls.append(arg)
+        return {"results": self.results, "attempts": 12, "elapsed": 40.0}
+
+
+def _elemento(**overrides):
+    return {"text": "", "display": "block", "visibility": "visible", "width": 0, "height": 0,
+            "html": "<p></p>", **overrides}
+
+
+def test_expect_all_manda_todo_en_una_llamada():
+    page = _BatchPage([{"pass": True}] * 3)
+    elapsed = expect_all(page, [
+        visible("h1"),
+        url_matches(re.compile(r"/movie/\d+", re.IGNORECASE)),
+        any_of(visible(text="Ver tráiler"), visible('button[title*="trailer"]')),
+    ], timeout=2000)
+
+    assert elapsed == 40.0
+    assert len(page.calls) == 1
+    checks = page.calls[0]["checks"]
+    assert page.calls[0]["timeout"] == 2000
+    assert checks[1]["expected"] == {"regex": r"/movie/\d+", "flags": "i"}
+    assert [alternative["text"] for alternative in checks[2]["alternatives"]] == ["Ver tráiler", None]
+    with pytest.raises(ValueError):
+        visible("h1", text="Título")
+
+
+def test_expect_all_explica_cada_fallo():
+    page = _BatchPage([
+        {"pass": True, "count": 1, "element": _elemento()},
+        {"pass": False, "count": 2, "element": _elemento(html="<h1></h1>", width=800, height=40)},
+        {"pass": False, "alternatives": [
+            {"pass": False, "count": 0, "element": None},
+            {"pass": False, "count": 1, "element": _elemento(display="none", html="<button>")},
+        ]},
+    ])
+    with pytest.raises(AssertionError) as error:
+        expect_all(page, [
+            visible("h1"),
+            not_empty("h1"),
+            any_of(visible(text="Ver tráiler"), visible("button")),
+        ])
+
+    mensaje = str(error.value)
+    assert mensaje.startswith("expect_all: fallaron 2 de 3 comprobaciones tras 5000ms (12 intentos)")
+    assert "✗ h1 con texto" in mensaje
+    assert "2 coincidencias; la primera: texto '', display=block, visibility=visible, 800x40px" in mensaje
+    assert "<no se encontró ningún elemento>" in mensaje
+    assert "display=none" in mensaje
+    assert "✗ h1 visible" not in mensaje
+
+
+# ============================================================================
+# 💥 LATENCIA Y FALLOS DE TMDB
+# ============================================================================
+
+def test_plan_de_fallos_es_reproducible_y_respeta_las_tasas():
+    policy = FaultPolicy(latency=Latency("long-tail", 100, 1.0), error_rate=0.2, rate_limit_rate=0.1,
+                         retry_after=3, timeout_rate=0.05, timeout_ms=4000)
+    plan = policy.plan(random.Random(7), size=4000)
+    assert plan == policy.plan(random.Random(7), size=4000)
+
+    faults = [step["fault"] for step in plan]
+    assert faults.count("timeout") / 4000 == pytest.approx(0.05, abs=0.015)
+    assert faults.count("429:3") / 4000 == pytest.approx(0.1, abs=0.02)
+    assert faults.count("error:500") / 4000 == pytest.approx(0.2, abs=0.02)
+    assert all(step["latency"] == 4000 for step in plan if step["fault"] == "timeout")
+    # Cola larga: la mediana se queda en ~100ms pero el p99 se dispara
+    latencies = sorted(step["latency"] for step in plan if step["fault"] != "timeout")
+    assert latencies[len(latencies) // 2] == pytest.approx(100, rel=0.15)
+    assert latencies[int(len(latencies) * 0.99)] > 800
+
+    assert FaultPolicy(endpoint="movie/{id}").matches("movie/{id}")
+    assert not FaultPolicy(endpoint="movie/{id}").matches("movie/{id}/videos")
+    assert FaultPolicy(endpoint="trending/*").matches("trending/tv/week")
+    with pytest.raises(ValueError):
+        Latency("uniforme", 10)
+
+
+class _FaultRoute:
+    def __init__(self, url):
+        self.request = type("Request", (), {"url": url})()
+        self.calls = []
+
+    def fallback(self):
+        self.calls.append(("fallback",))
+
+    def abort(self, error_code):
+        self.calls.append(("abort", error_code))
+
+    def fulfill(self, status, headers, body):
+        self.calls.append(("fulfill", status, headers.get("retry-after"), json.loads(body)["status_code"]))
+
+
+def test_inyector_responde_los_fallos_marcados():
+    injector = FaultInjector("rate-limit")
+    base = "https://api.themoviedb.org/3/movie/popular?api_key=x&page=1"
+    rutas = [_FaultRoute(base), _FaultRoute(base + "&movieverse_fault=429%3A2"),
+             _FaultRoute(base + "&movieverse_fault=error:503"), _FaultRoute(base + "&movieverse_fault=timeout")]
+    for route in rutas:
+        injector.route_handler(route)
+
+    assert [route.calls[0] for route in rutas] == [
+        ("fallback",), ("fulfill", 429, "2", 25), ("fulfill", 503, None, 9), ("abort", "timedout"),
+    ]
+    assert injector.injected == {"429": 1, "error": 1, "timeout": 1}
+    assert set(FAULT_SCENARIOS) >= {"lenta", "cola-larga", "errores-50", "rate-limit", "goteo"}
+
+
+def test_estadisticas_detectan_tormentas_y_retry_after():
+    def entry(path, start, end, fault=None):
+        return {"url": f"https://api.themoviedb.org/3/{path}?api_key=x&language=es-ES", "endpoint": path,
+                "start": start, "end": end, "fault": fault, "status": 429 if fault else 200}
+
+    # movie/popular: 429 con Retry-After 2s y reintento a los 1000ms (demasiado pronto)
+    log = [entry("movie/popular", 0, 50, "429:2"), entry("movie/popular", 1050, 1100),
+           entry("movie/top_rated", 10, 60)]
+    stats = RequestStats(log)
+    assert stats.total == 3
+    assert stats.max_attempts == 2
+    assert stats.retry_after_violations == 1
+    assert stats.by_endpoint() == {"movie/popular": (2, 1), "movie/top_rated": (1, 0)}
+    assert not stats.storm
+
+    # Tres intentos de la misma petición con retry: 1 ya es una tormenta
+    stats = RequestStats(log + [entry("movie/popular", 2000, 2050)])
+    assert stats.max_attempts == 3 and stats.storm
+    rafaga = RequestStats([entry(f"movie/{i}", i * 10, i * 10 + 5) for i in range(40)])
+    assert rafaga.peak_per_second == 40 and rafaga.storm
+
+
+# ============================================================================
+# ⌨️ BÚSQUEDA MIENTRAS SE ESCRIBE
+# ============================================================================
+
+def test_corpus_y_cadencias_son_reproducibles():
+    titles = ["El Padrino", "Pulp Fiction", "Amélie"]
+    corpus = query_corpus(50, seed=3, titles=titles)
+    assert corpus == query_corpus(50, seed=3, titles=titles)
+    assert len(corpus) == 50 and all(corpus)
+    assert all(any(query.lower() in title.lower() for title in titles) for query in corpus)
+
+    intervals = TYPING_CADENCES["con-pausas"].intervals("x" * 2001, random.Random(1))
+    assert len(intervals) == 2000
+    assert min(intervals) >= 30
+    pausas = [interval for interval in intervals if interval >= 600]
+    assert len(pausas) / 2000 == pytest.approx(0.12, abs=0.03)
+
+
+class _SearchRoute:
+    def __init__(self, url):
+        self.request = type("Request", (), {"url": url})()
+        self.calls = []
+
+    def fallback(self):
+        self.calls.append(("fallback",))
+
+    def fulfill(self, status, headers, body):
+        self.calls.append(("fulfill", status, json.loads(body)))
+
+
+def test_responder_busca_sin_tildes_ni_mayusculas():
+    movies = [{"id": 1, "title": "Amélie"}, {"id": 2, "title": "El Padrino"}, {"id": 3, "title": "El Padrino II"}]
+    responder = SearchResponder(movies=movies, series=[{"id": 9, "name": "Los Soprano"}])
+    base = "https://api.themoviedb.org/3/"
+
+    rutas = [_SearchRoute(base + "search/movie?api_key=x&query=amelie&page=1"),
+             _SearchRoute(base + "search/movie?api_key=x&query=padrino%20ii"),
+             _SearchRoute(base + "search/tv?query=SOPRANO"),
+             _SearchRoute(base + "movie/popular?page=1")]
+    for route in rutas:
+        responder.route_handler(route)
+
+    assert [item["id"] for item in rutas[0].calls[0][2]["results"]] == [1]
+    assert [item["id"] for item in rutas[1].calls[0][2]["results"]] == [3]
+    assert rutas[2].calls[0][2]["total_results"] == 1
+    assert rutas[3].calls == [("fallback",)]
+    assert responder.served == 3
+    assert responder.search("search/movie", "")["results"] == []
+
+
+def test_analisis_detecta_llamadas_de_mas_y_respuestas_viejas():
+    # "pad" se pidió antes que "padrino" pero llegó después y se pintó encima
+    record = {
+        "keystrokes": [0, 100, 200, 900, 1000, 1100, 1200],
+        "calls": [{"query": "pad", "start": 700, "end": 2100},
+                  {"query": "padrino", "start": 1700, "end": 1800}],
+        "renders": [{"t": 1850, "shown": "padrino"}, {"t": 2150, "shown": "pad"}],
+    }
+    result = analyze_query("padrino", record)
+    assert (result.calls, result.final_calls, result.wasted_calls) == (2, 1, 1)
+    assert result.latency_ms == 650
+    assert result.out_of_order == 1
+    assert result.overwritten
+
+    record["renders"] = [{"t": 1850, "shown": "padrino"}]
+    record["calls"][0]["end"] = 1750
+    result = analyze_query("padrino", record)
+    assert result.out_of_order == 0 and not result.overwritten
+
+    assert analyze_query("padrino", {**record, "renders": []}).latency_ms is None
+
+
+def _tecleo_simulado(query, cadence, rng, debounce):
+    """
+    Registro de TYPE_QUERY_SCRIPT para una búsqueda, con respuestas de 150ms.
+
+    debounce=True: un solo useDebounce de SEARCH_DEBOUNCE_MS (la versión
+    actual de SearchPage). debounce=False: la versión anterior, que creaba
+    un debounce nuevo en cada render y acababa pidiendo una vez por tecla.
+    """
+    keystrokes = [0]
+    for interval in cadence.intervals(query, rng):
+        keystrokes.append(keystrokes[-1] + interval)
+    if debounce:
+        fired = [(index, t) for index, t in enumerate(keystrokes)
+                 if index == len(keystrokes) - 1 or keystrokes[index + 1] - t >= SEARCH_DEBOUNCE_MS]
+    else:
+        fired = list(enumerate(keystrokes))
+    calls = [{"query": query[:index + 1], "start": t + SEARCH_DEBOUNCE_MS, "end": t + SEARCH_DEBOUNCE_MS + 150}
+             for index, t in fired]
+    return {"keystrokes": keystrokes, "calls": calls,
+            "renders": [{"t": calls[-1]["end"] + 16, "shown": query.strip()}]}
+
+
+@pytest.mark.parametrize("cadencia", list(TYPING_CADENCES))
+def test_limite_de_llamadas_distingue_con_y_sin_debounce(cadencia):
+    titulos = ["El padrino", "Amélie", "Origen", "La comunidad del anillo", "Parásitos", "Interstellar"]
+    consultas = query_corpus(100, seed=7, titles=titulos)
+    informes = {}
+    for debounce in (True, False):
+        rng = random.Random(3)
+        informes[debounce] = TypeaheadReport(cadencia, [
+            analyze_query(consulta, _tecleo_simulado(consulta, TYPING_CADENCES[cadencia], rng, debounce))
+            for consulta in consultas
+        ])
+
+    # Una llamada por tecla (el bug de SearchPage) supera el límite del benchmark
+    assert informes[False].calls_per_query(90) > MAX_CALLS_P90[cadencia]
+    assert informes[True].calls_per_query(90) <= MAX_CALLS_P90[cadencia]
+
+
+# ============================================================================
+# 🏗️ CATÁLOGO SINTÉTICO
+# ============================================================================
+
+@pytest.fixture(scope="module")
+def tipos_app():
+    return TypeSchema.from_file()
+
+
+def test_catalogo_sintetico_cumple_los_tipos_de_la_app(tipos_app):
+    catalogo = SyntheticCatalog(CatalogScale(results=300, cast=500, crew=200, seasons=50, episodes=30), seed=4)
+    respuestas = {
+        "movie/popular?page=2": "MoviesResponse",
+        "search/movie?query=x&page=1": "MoviesResponse",
+        "trending/tv/week?page=1": "TVSeriesResponse",
+        "movie/550?append_to_response=credits,videos,images,recommendations,similar": "MovieDetail",
+        "tv/1399?append_to_response=credits,videos,images,recommendations,similar": "TVSeriesDetail",
+        "tv/1399/season/50": "SeasonDetail",
+        "tv/1399/videos": "TVVideos",
+    }
+    for url, tipo in respuestas.items():
+        payload = catalogo.payload(f"{TMDB}/{url}&api_key=x" if "?" in url else f"{TMDB}/{url}?api_key=x")
+        assert tipos_app.validate(payload, tipo) == [], url
+
+    detalle = catalogo.payload(f"{TMDB}/movie/550")
+    assert len(detalle["credits"]["cast"]) == 500 and len(detalle["credits"]["crew"]) == 200
+    assert len(catalogo.payload(f"{TMDB}/tv/1399")["seasons"]) == 50
+    assert len(catalogo.payload(f"{TMDB}/movie/popular?page=1")["results"]) == 300
+    assert catalogo.payload(f"{TMDB}/movie/550/watch/providers") is None
+
+    # Determinista: misma semilla, mismo payload; otra semilla, otro
+    assert detalle == SyntheticCatalog(catalogo.scale, seed=4).payload(f"{TMDB}/movie/550")
+    assert detalle != SyntheticCatalog(catalogo.scale, seed=5).payload(f"{TMDB}/movie/550")
+
+
+def test_validacion_de_tipos_detecta_errores(tipos_app):
+    errores = tipos_app.validate({"page": 1, "results": [{"id": "550", "title": None}], "total_pages": 1},
+                                 "MoviesResponse")
+    assert "$.results[0].id: se esperaba number, llegó string" in errores
+    assert "$.results[0].title: se esperaba string, llegó null" in errores
+    assert "$.total_results: falta (obligatorio en MoviesResponse)" in errores
+    # Opcionales y uniones con null
+    assert tipos_app.validate({"id": 1, "name": "X", "logo_path": None, "origin_country": "ES"},
+                              "ProductionCompany") == []
+    assert "credits" not in " ".join(tipos_app.validate({}, "MovieDetail"))
+
+
+def test_exponente_de_crecimiento():
+    assert growth_exponent([10, 100, 1000], [3, 30, 300]) == pytest.approx(1.0)
+    assert growth_exponent([10, 100, 1000], [5, 500, 50000]) == pytest.approx(2.0)
+    assert growth_exponent([10, 100], [7, 7]) == pytest.approx(0.0)
+    assert growth_exponent([10], [7]) is None
+    assert growth_exponent([10, 100], [None, 7]) is None
+
+
+# ============================================================================
+# 🗃️ CACHÉ DE REACT QUERY
+# ============================================================================
+
+def test_pasos_de_recorrido():
+    assert parse_step("/trending") == ("goto", "/trending")
+    assert parse_step(BACK) == ("back",)
+    assert parse_step("+11m") == ("advance", 660_000)
+    assert parse_step("+500ms") == ("advance", 500)
+    with pytest.raises(ValueError):
+        parse_step("trending")
+
+
+def test_analisis_de_cache_por_query_key():
+    def event(t, kind, key, step=0, **extra):
+        return {"t": t, "type": kind, "key": key, "step": step, **extra}
+
+    def mount(t, key, had_data, fetched, fetching=False, age=None, step=0):
+        return event(t, "mount", key, step, hadData=had_data, fetched=fetched, fetching=fetching,
+                     age=age, staleTime=300_000)
+
+    popular, hero, detalle, busqueda = '["movies","popular",1]', '["movieDetails",550]', \
+        '["movie","detail",550]', '["movies","search",{}]'
+    events = [
+        mount(1, popular, False, True), event(2, "fetch", popular), mount(3, popular, False, False, fetching=True),
+        event(10, "success", popular, fingerprint="a"),
+        mount(11, hero, False, True), event(12, "fetch", hero), event(20, "success", hero, fingerprint="d"),
+        mount(21, busqueda, False, False),                                   # enabled: false
+        mount(30, popular, True, False, age=1000, step=2),                   # atrás: hit
+        mount(40, detalle, False, True, step=3), event(41, "fetch", detalle, step=3),
+        event(50, "success", detalle, fingerprint="d", step=3),             # mismo dato que el hero
+        mount(60, popular, True, False, age=700_000, step=5),                # hit con datos viejos
+        mount(70, popular, True, True, step=6), event(71, "fetch", popular, step=6),
+        event(80, "success", popular, fingerprint="a", step=6),              # refetch sin cambios
+    ]
+    stats = analyze_cache_events(events)
+
+    assert (stats[popular].misses, stats[popular].shared, stats[popular].hits) == (1, 1, 2)
+    assert (stats[popular].stale_hits, stats[popular].refetches, stats[popular].redundant) == (1, 1, 1)
+    assert stats[popular].hit_ratio == pytest.approx(3 / 5)
+    assert stats[detalle].redundant == 1 and stats[detalle].duplicate_of == {hero}
+    assert stats[busqueda].lookups == 0 and stats[busqueda].hit_ratio is None
+
+    report = CacheReport(["/", "/trending", BACK], stats, tmdb_requests=6, refetched_on_back=[(2, popular)])
+    assert report.fetches == 4 and report.redundant == 2
+    texto = "\n".join(report.lines())
+    assert f"mismo dato que {hero}" in texto
+    assert "paso 2 (atrás) volvió a pedir" in texto
+
+
+# ============================================================================
+# 🔍 IMÁGENES SOBREDIMENSIONADAS
+# ============================================================================
+
+def _imagen(url, natural, pintada, dpr=3, top=0, fit="cover", component="MovieCard", route="/", kind="img",
+            measured=0):
+    return ImageRecord(url=url, route=route, profile="movil-4g", component=component, kind=kind,
+                       natural_width=natural[0], natural_height=natural[1], width=pintada[0], height=pintada[1],
+                       dpr=dpr, viewport=(390, 844), top=top, fit=fit, measured_bytes=measured)
+
+
+def test_bytes_desperdiciados_segun_tamano_pintado():
+    # Backdrop original en un hero de 390x844 @3x: con cover la escala es 844/1080 → 2.34 px por píxel, nada sobra
+    hero = _imagen("https://image.tmdb.org/t/p/original/a.jpg", (1920, 1080), (390, 844), measured=400_000)
+    assert hero.needed_ratio == 1.0 and hero.wasted_bytes == 0
+    # w1280 en una tarjeta de 160x90 @2x: hacen falta 320x180 de 1280x720
+    tarjeta = _imagen("https://image.tmdb.org/t/p/w1280/b.jpg", (1280, 720), (160, 90), dpr=2, measured=200_000)
+    assert tarjeta.needed_ratio == pytest.approx(0.0625)
+    assert tarjeta.wasted_bytes == 187_500
+    # Oculta: todo sobra; placeholder de 300 bytes → se estima por píxeles
+    oculta = _imagen("https://image.tmdb.org/t/p/w342/c.jpg", (342, 513), (0, 0), measured=300)
+    assert oculta.bytes == round(342 * 513 * 0.2) and oculta.wasted_bytes == oculta.bytes
+    assert tarjeta.bucket == "w1280" and _imagen("https://placehold.co/x", (1, 1), (1, 1)).bucket is None
+
+
+def test_imagenes_fuera_de_pantalla_y_ranking_por_componente():
+    arriba = _imagen("https://image.tmdb.org/t/p/w342/a.jpg", (342, 513), (150, 225), top=100)
+    abajo = _imagen("https://image.tmdb.org/t/p/w342/b.jpg", (342, 513), (150, 225), top=1200)
+    fondo = _imagen("https://placehold.co/1280x720", (1280, 720), (150, 225), top=1200, kind="css",
+                    component="OptimizedHeroSection", route="/movie/:id")
+    assert not arriba.offscreen and abajo.offscreen
+    assert not fondo.offscreen, "Los fondos CSS (placeholder borroso) no cuentan como carga anticipada"
+
+    report = ImageAuditReport("movil-4g", [arriba, abajo, fondo])
+    ranking = report.by_component()
+    assert [group.component for group in ranking] == ["OptimizedHeroSection", "MovieCard"]
+    assert ranking[1].images == 2 and ranking[1].offscreen == 1 and ranking[1].buckets == {"w342"}
+    resumen = report.summary("/")
+    assert (resumen.images, resumen.offscreen_eager_images) == (2, 1)
+    assert resumen.wasted_image_bytes == arriba.wasted_bytes + abajo.wasted_bytes
+    assert "OptimizedHeroSection" in "\n".join(report.lines())
+
+    limites = load_image_budgets().for_route("/")
+    assert {"wasted_image_bytes", "offscreen_eager_images"} <= set(limites)
+
+
+def test_componente_que_decide_el_tamano():
+    assert component_label(["LazyLoadImage", "OptimizedImage", "MovieCard", "MovieRow"]) == "MovieCard"
+    assert component_label(["LazyLoadImage", "a", "b"], section="Populares") == "sección «Populares»"
+    assert component_label([]) == "desconocido"
+
+
+# ============================================================================
+# ⏱️ ESPERAS
+# ============================================================================
+
+class _ScrollLocator:
+    def __init__(self, final):
+        self.final = final
+        self.calls = []
+
+    def evaluate(self, script, arg):
+        self.calls.append(arg)
+        return self.final
+
+
+def test_espera_de_scroll_devuelve_la_posicion_final():
+    locator = _ScrollLocator(300)
+    assert wait_for_scroll_settled(locator, 0, timeout=2000) == 300
+    assert locator.calls == [{"previous": 0, "timeout": 2000, "frames": 3}]
+    with pytest.raises(TimeoutError):
+        wait_for_scroll_settled(_ScrollLocator(None), 0)
+
+
+def test_cada_espera_usa_un_token_nuevo():
+    primera = ready_condition_arg()
+    segunda = ready_condition_arg(heading=None, images=False, quiet_ms=500)
+    assert {k: v for k, v in primera.items() if k != "token"} == {"quietMs": 300, "heading": "h1", "images": True}
+    assert segunda["quietMs"] == 500 and segunda["heading"] is None and not segunda["images"]
+    assert primera["token"] != segunda["token"]
@@ -0,0 +1,53 @@
+"""
+🔍 IMÁGENES A SU TAMAÑO POR DISPOSITIVO - MOVIEVERSE
+====================================================
+
+Carga la home y los detalles de película y serie con cada perfil de
+DEVICE_PROFILES (móviles con DPR 2-3, tablet y escritorio) y compara cada imagen
+descargada con lo que ocupa en pantalla × devicePixelRatio. Reporta los
+bytes que sobran por ruta y un ranking por componente:
+
+    movil-4g: 2.8MB de 3.6MB en imágenes sobran (78%), 6 cargadas fuera de pantalla
+      /                24 imágenes    2.1MB, sobran    1.6MB, fuera de pantalla 6
+      componente                    imgs    bytes   sobran  tamaños            fuera
+      OptimizedHeroSection             3    1.2MB    1.1MB  original               0
+
+Falla si una ruta supera la sección "images" de performance_budgets.json:
+bytes desperdiciados o <img> cargados fuera de pantalla sin scroll (que
+LazyLoadImage debería haber aplazado).
+
+Ejecuta:
+    pytest test_imagenes_tamano.py -s --tmdb=replay --tmdb-images=placeholder
+    pytest test_imagenes_tamano.py -s -k movil          # solo los perfiles móviles
+"""
+
+import pytest
+
+from movieverse_testing import base_url, sample_url
+from movieverse_testing.budgets import check_budget, format_violations
+from movieverse_testing.image_audit import ImageAuditReport, audit_route, load_image_budgets
+from movieverse_testing.profiles import DEVICE_PROFILES, THROTTLED_TIMEOUT
+
+BASE_URL = base_url()
+
+AUDIT_ROUTES = ["/", "/movie/:id", "/tv/:id"]
+
+
+@pytest.fixture(scope="session")
+def image_budgets():
+    return load_image_budgets()
+
+
+@pytest.mark.parametrize("profile", list(DEVICE_PROFILES))
+def test_imagenes_a_su_tamano(device_page, image_budgets, profile):
+    page = device_page(DEVICE_PROFILES[profile])
+    report = ImageAuditReport(profile)
+    for pattern in AUDIT_ROUTES:
+        report.records += audit_route(page, BASE_URL, sample_url(pattern), profile, route=pattern,
+                                      timeout=THROTTLED_TIMEOUT)
+    print("\n".join(report.lines()))
+
+    violations = []
+    for pattern in AUDIT_ROUTES:
+        violations += check_budget(report.summary(pattern), image_budgets.for_route(pattern))
+    assert not violations, format_violations(violations)
@@ -0,0 +1,53 @@
+"""
+⌨️ RENDIMIENTO DE LA BÚSQUEDA MIENTRAS SE ESCRIBE - MOVIEVERSE
+==============================================================
+
+Escribe N búsquedas en /search con cada cadencia de TYPING_CADENCES
+(rápida, normal y con pausas a media palabra) contra el catálogo grabado,
+con latencia de cola larga en search/movie, y reporta distribuciones:
+
+    Cadencia normal: 200 búsquedas, 1864 teclas, 214 llamadas (14 para búsquedas intermedias)
+      llamadas/búsqueda  p50 1  p90 1  máx 3
+      tecla → resultados p50 702ms  p90 1010ms  p99 1840ms
+      fuera de orden: 2 búsquedas, pisadas en pantalla: 0, sin resultados finales: 0
+
+Falla si el debounce deja pasar más de MAX_CALLS_P90 llamadas por búsqueda,
+si alguna respuesta vieja pisa en pantalla los resultados de la búsqueda
+final o si la búsqueda final nunca llega a pintarse.
+
+Son lentos (~1-2s por búsqueda), así que solo corren con --typeahead:
+    pytest test_rendimiento_busqueda.py --typeahead=200 -s --tmdb=replay --tmdb-images=placeholder
+"""
+
+import pytest
+from playwright.sync_api import Page
+
+from movieverse_testing import base_url
+from movieverse_testing.typeahead import MAX_CALLS_P90, TYPING_CADENCES, query_corpus, run_typeahead
+
+BASE_URL = base_url()
+
+@pytest.fixture
+def typeahead_queries(pytestconfig):
+    size = pytestconfig.getoption("typeahead")
+    if not size:
+        pytest.skip("Benchmark de búsqueda desactivado (actívalo con --typeahead=N)")
+    return query_corpus(size, seed=7)
+
+
+@pytest.mark.parametrize("cadence", list(TYPING_CADENCES))
+def test_busqueda_mientras_se_escribe(page: Page, typeahead_queries, cadence):
+    report = run_typeahead(page, BASE_URL, typeahead_queries, cadence=cadence, seed=7)
+    print("\n".join(report.lines()))
+
+    assert not report.overwritten, (
+        f"Respuestas viejas pisaron los resultados finales en {len(report.overwritten)} búsquedas, "
+        f"p. ej. {report.overwritten[0].query!r}"
+    )
+    assert not report.unresolved, (
+        f"{len(report.unresolved)} búsquedas nunca mostraron sus resultados, p. ej. {report.unresolved[0].query!r}"
+    )
+    assert report.calls_per_query(90) <= MAX_CALLS_P90[cadence], (
+        f"El debounce deja pasar {report.calls_per_query(90)} llamadas por búsqueda (p90), "
+        f"máximo {MAX_CALLS_P90[cadence]}"
+    )
@@ -0,0 +1,63 @@
+"""
+🏗️ RENDIMIENTO CON CATÁLOGOS GRANDES - MOVIEVERSE
+==================================================
+
+Carga cada vista de SCALE_TARGETS con el catálogo sintético a tamaños
+crecientes (miles de resultados por fila, repartos de 2000 personas, series
+de 200 temporadas, miles de imágenes) y reporta la curva de crecimiento del
+tiempo de render, los nodos DOM y el heap:
+
+    filas-peliculas (results) en /movies
+           n    render    nodos     heap     TBT
+          20      388ms      912    8.4MB      0ms
+        5000     4210ms   150402   96.0MB   3120ms
+      crecimiento: render n^0.42, nodos n^0.97, heap n^0.45
+
+Falla si los nodos o el render crecen peor que lineal, o si una vista que
+solo pinta una parte (los 12 primeros del reparto, ninguna imagen de la
+galería) crece con la entrada.
+
+Son lentos, así que solo corren con --scaling:
+    pytest test_rendimiento_escala.py --scaling -s --tmdb=replay --tmdb-images=placeholder
+"""
+
+import pytest
+from playwright.sync_api import Page
+
+from movieverse_testing import base_url
+from movieverse_testing.synthetic import SCALE_TARGETS, measure_scaling
+
+BASE_URL = base_url()
+
+# Exponente máximo de crecimiento de los nodos DOM por vista (n^x)
+MAX_NODE_GROWTH = {
+    "filas-peliculas": 1.1,
+    "filas-series": 1.1,
+    "reparto": 0.1,        # MovieDetailPage pinta cast.slice(0, 12)
+    "temporadas": 1.1,
+    "imagenes": 0.1,       # las imágenes de append_to_response no se pintan
+}
+
+# El render no debería crecer peor que lineal con la entrada
+MAX_RENDER_GROWTH = 1.2
+
+
+@pytest.fixture
+def scaling(pytestconfig):
+    if not pytestconfig.getoption("scaling"):
+        pytest.skip("Benchmark de escalado desactivado (actívalo con --scaling)")
+
+
+@pytest.mark.parametrize("target", list(SCALE_TARGETS))
+def test_vista_escala_con_la_entrada(scaling, page: Page, target):
+    report = measure_scaling(page, BASE_URL, target, seed=1)
+    print("\n".join(report.lines()))
+
+    nodes = report.exponent("dom_nodes")
+    assert nodes is not None and nodes <= MAX_NODE_GROWTH[target], (
+        f"Los nodos DOM de {target} crecen como n^{nodes:.2f} (máximo n^{MAX_NODE_GROWTH[target]})"
+    )
+    render = report.exponent("render_ms")
+    assert render is None or render <= MAX_RENDER_GROWTH, (
+        f"El render de {target} crece como n^{render:.2f} (máximo n^{MAX_RENDER_GROWTH})"
+    )
@@ -0,0 +1,65 @@
+"""
+💰 PRESUPUESTOS DE RENDIMIENTO POR RUTA - MOVIEVERSE
+====================================================
+
+Carga cada ruta de src/App.tsx desde cero y compara sus métricas con
+performance_budgets.json y con el historial de ejecuciones anteriores
+(.cache/perf-history/).
+
+Falla con una línea por métrica fuera de límite, p. ej.:
+    /trending        lcp             3120ms > 2500ms presupuesto, +620ms (+25%)
+
+Ejecuta:
+    pytest test_rendimiento_presupuestos.py -v
+    pytest test_rendimiento_presupuestos.py --app-server=dist --tmdb=replay   # resultados estables
+    pytest test_rendimiento_presupuestos.py --device-profile=movil-3g
+
+Los presupuestos son para escritorio sin throttling. Cada combinación de
+--device-profile, --tmdb y --app-server guarda su propio historial; con
+--device-profile solo se comparan regresiones.
+"""
+
+import pytest
+from playwright.sync_api import Page
+
+from movieverse_testing import APP_ROUTES, DEFAULT_TIMEOUT, base_url, measure_route
+from movieverse_testing.budgets import (
+    BaselineHistory,
+    check_budget,
+    current_commit,
+    format_violations,
+    load_budgets,
+)
+from movieverse_testing.profiles import THROTTLED_TIMEOUT
+
+BASE_URL = base_url()
+
+
+@pytest.fixture(scope="session")
+def budgets():
+    return load_budgets()
+
+
+@pytest.fixture(scope="session")
+def perf_history(pytestconfig, device_profile):
+    return BaselineHistory.for_run(
+        profile=device_profile.name if device_profile is not None else None,
+        tmdb_mode=pytestconfig.getoption("tmdb"),
+        server_mode=pytestconfig.getoption("app_server"),
+    )
+
+
+@pytest.mark.parametrize("route, url", APP_ROUTES, ids=[route for route, _ in APP_ROUTES])
+def test_ruta_dentro_de_presupuesto(page: Page, budgets, perf_history, device_profile, route, url):
+    timeout = THROTTLED_TIMEOUT if device_profile is not None else DEFAULT_TIMEOUT
+    metricas = measure_route(page, BASE_URL, url, route=route, timeout=timeout)
+    print(metricas.summary())
+
+    commit = current_commit()
+    violations = []
+    if device_profile is None:
+        violations += check_budget(metricas, budgets.for_route(route))
+    violations += perf_history.regressions(metricas, commit=commit)
+    perf_history.record(metricas, commit)
+
+    assert not violations, format_violations(violations)
@@ -0,0 +1,65 @@
+"""
+🎠 RENDIMIENTO DEL SCROLL EN LAS FILAS - MOVIEVERSE
+===================================================
+
+Hace scroll con rueda, arrastre táctil y scrollBy suave sobre MovieRow,
+TVSeriesRow y los carruseles de Swiper de la home, con la CPU normal y
+ralentizada, y reporta FPS, frames perdidos y el peor frame de cada gesto
+(requestAnimationFrame + FrameTimeline de la traza de Chrome):
+
+    componente   gesto         condición    cpu   fps perdidos    peor timeline    scroll
+    MovieRow     wheel         normal        1x    59       2%     33ms       1%    1200px
+
+Falla si el gesto no mueve el contenedor; si se pierden muchos frames sin
+throttling solo avisa (warning): depende de la máquina.
+
+Ejecuta (solo Chromium):
+    pytest test_rendimiento_scroll.py -s
+    pytest test_rendimiento_scroll.py -s --tmdb=replay --tmdb-images=placeholder
+"""
+
+import warnings
+
+import pytest
+from playwright.sync_api import Page
+
+from movieverse_testing import base_url, wait_for_app_ready
+from movieverse_testing.profiles import supports_throttling
+from movieverse_testing.scroll import (
+    SCROLL_COMPONENTS,
+    SCROLL_CONDITIONS,
+    SCROLL_METHODS,
+    ScrollReport,
+    measure_scroll,
+)
+from movieverse_testing.tracing import current_mode
+
+BASE_URL = base_url()
+
+# Frames perdidos sin throttling a partir de los que se avisa
+DROPPED_WARNING = 0.2
+
+
+@pytest.mark.parametrize("condition", list(SCROLL_CONDITIONS))
+@pytest.mark.parametrize("component", list(SCROLL_COMPONENTS))
+def test_scroll_fluido(page: Page, device_profile, component, condition):
+    if not supports_throttling(page):
+        pytest.skip("Las métricas de frames necesitan Chromium (CDP y tracing)")
+    page.goto(BASE_URL)
+    wait_for_app_ready(page)
+
+    # Con --chrome-trace=test el navegador ya está grabando la traza del test
+    trace = current_mode() != "test"
+    report = ScrollReport()
+    for method in SCROLL_METHODS:
+        result = report.add(measure_scroll(page, component, method, condition, trace=trace,
+                                           profile=device_profile))
+        if result is None:
+            pytest.skip(f"La home no tiene ningún {component}")
+    print("\n".join(report.lines()))
+
+    for result in report.results:
+        assert result.distance > 0, f"{component} no se movió con {result.method}"
+        assert result.frames.frames > 1, f"No se grabaron frames con {result.method}"
+        if result.cpu_rate == 1 and result.frames.dropped_ratio > DROPPED_WARNING:
+            warnings.warn(f"{component}/{result.method}: {result.frames.dropped_ratio:.0%} de frames perdidos")